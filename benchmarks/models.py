@@ -0,0 +1,15 @@
+from django.db import models
+from byrdie.models import Model, expose
+
+class Item(Model):
+    name = models.CharField(max_length=100)
+    value = models.IntegerField()
+    description = models.TextField(default="")
+    exposed_fields = ["name", "value"]
+
+    class Meta:
+        app_label = 'benchmarks'
+
+    @expose
+    def bump(self, amount=1):
+        return {"value": self.value + amount}
@@ -0,0 +1,23 @@
+from typing import List
+from byrdie.api import route
+from byrdie.schemas import ModelSchema
+from .models import Item
+
+class ItemSchema(ModelSchema):
+    class Meta:
+        model = Item
+        fields = ['id', 'name', 'value', 'description']
+
+@route("/ping", api=True, wove=False)
+def bench__ping(request):
+    return {"ok": True}
+
+@route("/ping/wove", api=True)
+def bench__ping__wove(request, w):
+    @w.do
+    def payload():
+        return {"ok": True}
+
+@route("/items", api=True, wove=False)
+def bench__items(request) -> List[ItemSchema]:
+    return Item.objects.all()[:int(request.GET.get('limit', 100))]
@@ -0,0 +1,211 @@
+"""
+Benchmarks for Byrdie's hot paths.
+
+    python -m benchmarks.run                       # run and save results/<commit>.json
+    python -m benchmarks.run --quick               # smaller row counts
+    python -m benchmarks.run --compare results/a.json results/b.json
+
+Each benchmark runs against the Django test client and an SQLite fixture database.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "benchmarks.settings")
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+def measure(fn, min_time=0.5, min_runs=3, max_runs=2000):
+    """
+    Calls fn repeatedly (after one warm-up call) and returns timing statistics in milliseconds.
+    """
+    fn()
+    timings = []
+    deadline = time.perf_counter() + min_time
+    while len(timings) < min_runs or (time.perf_counter() < deadline and len(timings) < max_runs):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    mean = statistics.fmean(timings)
+    return {
+        "runs": len(timings),
+        "mean_ms": mean,
+        "median_ms": statistics.median(timings),
+        "min_ms": timings[0],
+        "p95_ms": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "ops_per_sec": 1000 / mean if mean else None,
+    }
+
+def setup_database():
+    import django
+    from django.core.management import call_command
+    django.setup()
+    db_name = django.conf.settings.DATABASES["default"]["NAME"]
+    if os.path.exists(db_name):
+        os.remove(db_name)
+    call_command("migrate", run_syncdb=True, verbosity=0)
+
+def seed(rows):
+    from benchmarks.models import Item
+    Item.objects.all().delete()
+    Item.objects.bulk_create(
+        (Item(name=f"item {i}", value=i, description="x" * 40) for i in range(rows)),
+        batch_size=5000,
+    )
+
+def peak_memory(fn):
+    """
+    Returns the peak number of bytes allocated while fn runs, and keeps its result alive until then.
+    """
+    tracemalloc.start()
+    try:
+        result = fn()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    del result
+    return peak
+
+def run_batch(rows, min_time):
+    """
+    Per-row ModelSchema validation vs the columnar ModelSchema.batch path over plain rows.
+    """
+    from benchmarks.routes import ItemSchema
+    data = [{"id": i, "name": f"item {i}", "value": i, "description": "x" * 40} for i in range(rows)]
+    cases = {
+        "per_row": lambda: [ItemSchema.model_validate(row) for row in data],
+        "columnar": lambda: ItemSchema.batch(data),
+    }
+    results = {}
+    for case, fn in cases.items():
+        name = f"batch.{case}.{rows}"
+        results[name] = measure(fn, min_time=min_time, min_runs=1, max_runs=5)
+        results[name]["peak_bytes"] = peak_memory(fn)
+        print(f"{name:<40} {results[name]['median_ms']:>10.3f} ms  {results[name]['peak_bytes'] / 2**20:>8.1f} MiB")
+    return results
+
+def run(sizes, min_time):
+    from django.template import Context, Template
+    from django.test import Client
+    from byrdie.rendering import render_component
+    from benchmarks import routes  # noqa: F401  registers the benchmark routes
+    from benchmarks.models import Item
+
+    client = Client()
+    results = {}
+
+    def record(name, fn, **kwargs):
+        results[name] = measure(fn, min_time=min_time, **kwargs)
+        print(f"{name:<40} {results[name]['median_ms']:>10.3f} ms  ({results[name]['runs']} runs)")
+
+    # Route dispatch: a plain Django view vs Byrdie routes with and without wove
+    record("dispatch.django_view", lambda: client.get("/raw/ping"))
+    record("dispatch.byrdie_route", lambda: client.get("/api/ping"))
+    record("dispatch.byrdie_route_wove", lambda: client.get("/api/ping/wove"))
+
+    # List[Schema] serialization
+    seed(max(sizes))
+    for size in sizes:
+        record(f"serialize.list_schema.{size}", lambda: client.get(f"/api/items?limit={size}"), max_runs=200)
+
+    # Wire formats: payload size and encode/decode time of List[Schema] responses, JSON vs MessagePack
+    from byrdie import negotiation
+    for size in sizes:
+        response = client.get(f"/api/items?limit={size}")
+        data = json.loads(response.content)
+        encoded = {"json": response.content}
+        if negotiation.msgpack is not None:
+            encoded["msgpack"] = client.get(f"/api/items?limit={size}", HTTP_ACCEPT="application/msgpack").content
+        for fmt, content in encoded.items():
+            encode = (lambda: json.dumps(data).encode()) if fmt == "json" else (lambda: negotiation.packb(data))
+            decode = (lambda: json.loads(content)) if fmt == "json" else (lambda: negotiation.msgpack.unpackb(content))
+            record(f"wire.{fmt}.encode.{size}", encode, max_runs=200)
+            record(f"wire.{fmt}.decode.{size}", decode, max_runs=200)
+            results[f"wire.{fmt}.encode.{size}"]["bytes"] = len(content)
+            print(f"{'wire.' + fmt + '.bytes.' + str(size):<40} {len(content):>10} bytes")
+
+    # Component rendering
+    items = list(Item.objects.all()[:200])
+    record("render.render_component", lambda: render_component(items[0]))
+    page = Template(
+        "{% load byrdie_tags %}{% byrdie %}"
+        "{% for item in items %}{% component 'item' %}{% endfor %}"
+        "{% endbyrdie %}"
+    )
+    context = Context({"items": items})
+    record("render.byrdie_page.200_components", lambda: page.render(context), max_runs=200)
+
+    # Exposed method calls through the frontend bridge endpoint
+    url = f"/byrdie/call/benchmarks/item/{items[0].pk}/bump/"
+    record("bridge.call_exposed_method", lambda: client.post(url, data='{"amount": 2}', content_type="application/json"))
+    return results
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+def compare(baseline_path, current_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    regressions = []
+    print(f"{'benchmark':<40} {baseline['commit']:>12} {current['commit']:>12} {'change':>9}")
+    for name, stats in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<40} {'-':>12} {stats['median_ms']:>12.3f}")
+            continue
+        change = stats["median_ms"] / before["median_ms"] - 1
+        flag = " !" if change > threshold else ""
+        if flag:
+            regressions.append(name)
+        print(f"{name:<40} {before['median_ms']:>12.3f} {stats['median_ms']:>12.3f} {change:>+8.1%}{flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run Byrdie's benchmark suite.")
+    parser.add_argument("--sizes", default="100,10000,100000", help="Row counts for the List[Schema] benchmarks.")
+    parser.add_argument("--batch-rows", type=int, default=1_000_000, help="Row count for the columnar batch benchmarks.")
+    parser.add_argument("--quick", action="store_true", help="Use small row counts and short runs.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds spent per benchmark.")
+    parser.add_argument("--output", help="Where to write the JSON results (default: results/<commit>.json).")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CURRENT"), help="Compare two result files.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative slowdown reported as a regression.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        regressions = compare(*args.compare, threshold=args.threshold)
+        return 1 if regressions else 0
+
+    sizes = [100, 1000] if args.quick else [int(size) for size in args.sizes.split(",")]
+    min_time = 0.1 if args.quick else args.min_time
+    setup_database()
+    results = run(sizes, min_time)
+    results.update(run_batch(10_000 if args.quick else args.batch_rows, min_time))
+    commit = git_commit()
+    payload = {
+        "commit": commit,
+        "created": time.time(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,39 @@
+import os
+import sys
+import tempfile
+
+# Add the project root and src/ to the Python path
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BASE_DIR)
+sys.path.insert(0, os.path.join(BASE_DIR, "src"))
+
+SECRET_KEY = "dummy-key-for-benchmarks"
+DEBUG = False
+ALLOWED_HOSTS = ["*"]
+ROOT_URLCONF = "benchmarks.urls"
+
+DATABASES = {
+    "default": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": os.environ.get("BYRDIE_BENCH_DB", os.path.join(tempfile.gettempdir(), "byrdie-bench.sqlite3")),
+    }
+}
+
+INSTALLED_APPS = [
+    "django.contrib.contenttypes",
+    "django.contrib.auth",
+    "byrdie.apps.ByrdieConfig",
+    "benchmarks",
+]
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [os.path.join(BASE_DIR, "benchmarks", "templates"), BASE_DIR],
+        "APP_DIRS": True,
+    },
+]
+
+# Keep the measurements about Byrdie itself
+BYRDIE_SERVER_TIMING = False
+BYRDIE_QUERY_TRACKING = False
@@ -0,0 +1,12 @@
+from django.http import JsonResponse
+from django.urls import include, path
+from byrdie.api import get_urls
+from byrdie.urls import urlpatterns as byrdie_urlpatterns
+
+def raw_ping(request):
+    return JsonResponse({"ok": True})
+
+urlpatterns = byrdie_urlpatterns + [
+    path('raw/ping', raw_ping),
+    path('', include(get_urls())),
+]
@@ -45,5 +45,8 @@ setup(
         "console_scripts": [
             "byrdie=byrdie.cli:main",
         ],
+        "pytest11": [
+            "byrdie=byrdie.pytest_plugin",
+        ],
     },
 )
@@ -1,28 +1,91 @@
+import hashlib
 import inspect
+import json
+import logging
+from collections import namedtuple
 from functools import wraps
 from typing import Callable, Dict, Optional, List, get_origin, get_args, Any
-from django.http import HttpResponse, JsonResponse, HttpResponseForbidden
+from django.db import IntegrityError
+from django.http import HttpResponse, JsonResponse, HttpResponseForbidden, HttpResponseBadRequest, HttpResponseNotAllowed
 from django.shortcuts import get_object_or_404, redirect
 from django.template import engines, TemplateDoesNotExist
 from django.template.loader import get_template
-from django.urls import path as url_path
+from django.urls import path as url_path, clear_url_caches
+from pydantic import TypeAdapter
 from wove import weave
-from .schemas import BaseModel, ModelSchema
+from django.db.models import QuerySet
+from .schemas import BaseModel, ModelSchema, project_schema
+from .pagination import KeysetPagination, InvalidCursor
+from .bulk import bulk_create_rows, bulk_update_rows
+from .metrics import instrument, phase, record_wove
+from .queries import track_queries
+from .profiling import profile_requests
+from .coalesce import coalesce_requests, DEFAULT_VARY
+from .caching import StaleWhileRevalidate, cache_responses
+from .compression import compress_responses
+from .replicas import route_reads
+from .permissions import compile_permissions
+from .negotiation import decode_body, encode_response
+
+logger = logging.getLogger('byrdie.api')
 
 class Router:
     def __init__(self):
         self.routes: Dict[str, Callable] = {}
         self.views: Dict[Callable, str] = {}
+        # Compiled Django URL patterns, kept in registration order and updated
+        # in place so that anything holding a reference sees new routes.
+        self.urlpatterns: List = []
+        self._pattern_index: Dict[str, int] = {}
+        self.version = 0
+        # Frontend manifest of /api routes, keyed by their dotted JS name
+        self.api_routes: Dict[str, str] = {}
+        self._manifest = None
 
     def register(self, path: str, view: Callable, is_provisional: bool = False):
         if path in self.routes and not is_provisional:
             raise ValueError(f"Route for path '{path}' is already registered.")
+        previous = self.routes.get(path)
+        if previous is view:
+            return
+        if previous is not None:
+            self.views.pop(previous, None)
         self.routes[path] = view
         self.views[view] = path
+        if path.startswith('/api'):
+            self.api_routes = {name: p for name, p in self.api_routes.items() if p != path}
+            original_view = view
+            while hasattr(original_view, '__wrapped__'):
+                original_view = original_view.__wrapped__
+            self.api_routes[original_view.__name__.replace('__', '.')] = path
+        self._compile(path, view)
+
+    def _compile(self, path: str, view: Callable):
+        # Django paths should not start with a slash
+        path_str = path[1:] if path.startswith('/') else path
+        pattern = url_path(path_str, view)
+        if path in self._pattern_index:
+            self.urlpatterns[self._pattern_index[path]] = pattern
+        else:
+            self._pattern_index[path] = len(self.urlpatterns)
+            self.urlpatterns.append(pattern)
+        self.version += 1
+        # Resolvers memoize the pattern tree, so drop them only when it changes.
+        clear_url_caches()
 
     def get_view(self, path: str) -> Optional[Callable]:
         return self.routes.get(path)
 
+    def manifest(self) -> tuple:
+        """
+        Returns the (script, digest) of the frontend route manifest, rebuilt only after routes change.
+        """
+        if self._manifest is None or self._manifest[0] != self.version:
+            script = f"window.byrdie_routes = {json.dumps(self.api_routes, sort_keys=True)};\n"
+            digest = hashlib.sha256(script.encode()).hexdigest()[:12]
+            self._manifest = (self.version, script, digest)
+        return self._manifest[1], self._manifest[2]
+
 class Api:
     def __init__(self):
         self.router = Router()
@@ -30,15 +93,10 @@ class Api:
     @property
     def urls(self):
         """
-        Returns a list of URL patterns for the registered routes.
+        Returns the router's compiled list of URL patterns for the registered routes.
+        The list is updated in place as routes are registered.
         """
-        urlpatterns = []
-        for path_str, view in self.router.routes.items():
-            # Django paths should not start with a slash
-            if path_str.startswith('/'): 
-                path_str = path_str[1:]
-            urlpatterns.append(url_path(path_str, view))
-        return urlpatterns
+        return self.router.urlpatterns
 
     def route(self, path: Optional[str] = None, **kwargs) -> Callable:
         if callable(path):
@@ -58,11 +116,24 @@ class Api:
             return wrapped_view
         return decorator
 
-    def add_schema(self, schema_cls):
+    def add_schema(self, schema_cls, bulk: bool = False, batch_size: int = 500, **bulk_kwargs):
         """
         Registers a schema and its routes.
+        With `bulk=True`, a ModelSchema also gets POST /<schema>/bulk/create and /<schema>/bulk/update.
         """
         schema_name = schema_cls.__name__.lower().replace('schema', '')
+        if bulk:
+            if getattr(getattr(schema_cls, 'Meta', None), 'model', None) is None:
+                raise TypeError("Bulk endpoints require a ModelSchema with a model defined in its Meta.")
+            pk_name = schema_cls.Meta.model._meta.pk.name
+            if pk_name not in schema_cls.model_fields:
+                raise TypeError(f"{schema_cls.__name__} must include '{pk_name}' in its fields for bulk updates.")
+            version_field = getattr(schema_cls.Meta.model, 'version_field', None)
+            if version_field and version_field not in schema_cls.model_fields:
+                raise TypeError(f"{schema_cls.__name__} must include '{version_field}' in its fields for bulk updates.")
+            for operation, write_rows in (('create', bulk_create_rows), ('update', bulk_update_rows)):
+                bulk_view = self._create_bulk_view_wrapper(write_rows, schema_cls, operation, batch_size, **bulk_kwargs)
+                self.router.register(f"/{schema_name}/bulk/{operation}", bulk_view)
         for attr_name, attr_value in schema_cls.__dict__.items():
             is_classmethod = isinstance(attr_value, classmethod)
             view_func = attr_value.__func__ if is_classmethod else attr_value
@@ -85,64 +156,68 @@ class Api:
             # Wrap and register
             wrapped_view = self._create_schema_view_wrapper(view_func, schema_cls, is_classmethod, **action_info['kwargs'])
             self.router.register(full_path, wrapped_view)
+            has_model = getattr(getattr(schema_cls, 'Meta', None), 'model', None) is not None
+            if not is_classmethod and has_model and action_info['kwargs'].get('batch', True):
+                # Bulk variant: /<schema>/batch/<action>?pk=1,2,3
+                batch_path = path.replace("/<int:pk>", "", 1) or f"/{attr_name}"
+                batch_view = self._create_schema_batch_view_wrapper(view_func, schema_cls, **action_info['kwargs'])
+                self.router.register(f"/{schema_name}/batch{batch_path}", batch_view)
 
     def _create_view_wrapper(self, view: Callable, **decorator_kwargs) -> Callable:
         is_authenticated = decorator_kwargs.get("is_authenticated", False)
         has_permissions = decorator_kwargs.get("has_permissions", None)
+        permission_check = compile_permissions(has_permissions)
         wove_enabled = decorator_kwargs.get("wove", True)
         is_api = decorator_kwargs.get("api", False)
+        paginator = KeysetPagination.from_option(decorator_kwargs.get("paginate"))
+        declared_schema = _declared_schema(view)
         @wraps(view)
         def wrapper(request, *args, **route_kwargs):
-            # Enforce security
-            if is_authenticated and not request.user.is_authenticated:
-                return redirect('/login/')
-            if has_permissions and callable(has_permissions) and not has_permissions(request):
-                return HttpResponseForbidden()
+            denied = _enforce_security(request, is_authenticated, permission_check)
+            if denied is not None:
+                return denied
             result = None
-            if not wove_enabled:
-                result = view(request, *args, **route_kwargs)
-            else:
-                with weave() as w:
-                    result = view(request, w, *args, **route_kwargs)
-                if result is None and hasattr(w, 'result'):
-                    if is_api:
-                        result = w.result.final if hasattr(w.result, 'final') else None
-                    else:
-                        # Assemble context from all task results
-                        result = dict(w.result)
-            sig = inspect.signature(view)
-            return_annotation = sig.return_annotation
-            response_schema = return_annotation if return_annotation is not inspect.Signature.empty else None
-            if response_schema is None:
-                if hasattr(result, '_default_schema'):
-                    response_schema = result._default_schema
-                elif isinstance(result, list) and result and hasattr(result[0], '_default_schema'):
-                    response_schema = List[result[0]._default_schema]
-            return self._process_view_result(result, response_schema, view, is_api=is_api)
+            with phase('view'):
+                if not wove_enabled:
+                    result = view(request, *args, **route_kwargs)
+                else:
+                    with weave() as w:
+                        result = view(request, w, *args, **route_kwargs)
+                    record_wove(w)
+                    if result is None and hasattr(w, 'result'):
+                        if is_api:
+                            result = w.result.final if hasattr(w.result, 'final') else None
+                        else:
+                            # Assemble context from all task results
+                            result = dict(w.result)
+            return self._finalize_result(request, result, view, declared_schema, paginator, is_api=is_api)
         wrapper.is_authenticated = is_authenticated
         wrapper.has_permissions = has_permissions
-        return wrapper
+        return self._instrument(wrapper, decorator_kwargs)
 
     def _create_schema_view_wrapper(self, view_func: Callable, schema_cls: type, is_classmethod: bool, **action_kwargs) -> Callable:
         is_authenticated = action_kwargs.get("is_authenticated", False)
         has_permissions = action_kwargs.get("has_permissions", None)
+        permission_check = compile_permissions(has_permissions)
         wove_enabled = action_kwargs.get("wove", True)
+        paginator = KeysetPagination.from_option(action_kwargs.get("paginate"))
+        declared_schema = _declared_schema(view_func)
         @wraps(view_func)
         def wrapper(request, *args, **route_kwargs):
-            # Enforce security
-            if is_authenticated and not request.user.is_authenticated:
-                return redirect('/login/')
-            if has_permissions and callable(has_permissions) and not has_permissions(request):
-                return HttpResponseForbidden()
+            denied = _enforce_security(request, is_authenticated, permission_check)
+            if denied is not None:
+                return denied
             result = None
             if is_classmethod:
-                if not wove_enabled:
-                    result = view_func(schema_cls, request, *args, **route_kwargs)
-                else:
-                    with weave() as w:
-                        result = view_func(schema_cls, request, w, *args, **route_kwargs)
-                    if result is None and hasattr(w, 'result'):
-                        result = w.result.final if hasattr(w.result, 'final') else None
+                with phase('view'):
+                    if not wove_enabled:
+                        result = view_func(schema_cls, request, *args, **route_kwargs)
+                    else:
+                        with weave() as w:
+                            result = view_func(schema_cls, request, w, *args, **route_kwargs)
+                        record_wove(w)
+                        if result is None and hasattr(w, 'result'):
+                            result = w.result.final if hasattr(w.result, 'final') else None
             else:
                 pk = route_kwargs.get('pk')
                 if not pk:
@@ -150,31 +225,214 @@ class Api:
                 model = getattr(schema_cls.Meta, 'model', None)
                 if not model:
                     raise TypeError("ModelSchema used for an instance route must have a model defined in its Meta.")
-                instance = get_object_or_404(model, pk=pk)
-                schema_instance = schema_cls.model_validate(instance)
-                if not wove_enabled:
-                    result = view_func(schema_instance, request, *args, **route_kwargs)
-                else:
+                with phase('load'):
+                    instance = get_object_or_404(model, pk=pk)
+                    schema_instance = schema_cls.model_validate(instance)
+                with phase('view'):
+                    result = _call_instance_action(view_func, schema_instance, request, wove_enabled, *args, **route_kwargs)
+            fallback_schema = List[schema_cls] if is_classmethod else None
+            return self._finalize_result(request, result, view_func, declared_schema, paginator, is_api=True, fallback_schema=fallback_schema)
+        wrapper.is_authenticated = is_authenticated
+        wrapper.has_permissions = has_permissions
+        return self._instrument(wrapper, action_kwargs)
+
+    def _create_schema_batch_view_wrapper(self, view_func: Callable, schema_cls: type, **action_kwargs) -> Callable:
+        """
+        Wraps an instance action so it runs for several pks in one request.
+        All instances are loaded with a single in_bulk query and validated in one pass.
+        """
+        is_authenticated = action_kwargs.get("is_authenticated", False)
+        has_permissions = action_kwargs.get("has_permissions", None)
+        permission_check = compile_permissions(has_permissions)
+        wove_enabled = action_kwargs.get("wove", True)
+        parallel = action_kwargs.get("parallel", False)
+        max_batch = action_kwargs.get("max_batch", 100)
+        declared_schema = _declared_schema(view_func)
+        model = getattr(getattr(schema_cls, 'Meta', None), 'model', None)
+        if not model:
+            raise TypeError("ModelSchema used for an instance route must have a model defined in its Meta.")
+        adapter = TypeAdapter(List[schema_cls])
+        @wraps(view_func)
+        def wrapper(request, *args, **route_kwargs):
+            denied = _enforce_security(request, is_authenticated, permission_check)
+            if denied is not None:
+                return denied
+            try:
+                pks = [int(pk) for value in request.GET.getlist('pk') for pk in value.split(',') if pk.strip()]
+            except ValueError:
+                return HttpResponseBadRequest("pk must be a comma separated list of integers.")
+            pks = list(dict.fromkeys(pks))
+            if not pks:
+                return HttpResponseBadRequest("At least one pk is required.")
+            if len(pks) > max_batch:
+                return HttpResponseBadRequest(f"At most {max_batch} pks can be requested at once.")
+            with phase('load'):
+                instances = model.objects.in_bulk(pks)
+                found = [pk for pk in pks if pk in instances]
+                schema_instances = adapter.validate_python([instances[pk] for pk in found])
+            def run(pk, schema_instance):
+                result = _call_instance_action(view_func, schema_instance, request, wove_enabled, *args, pk=pk, **route_kwargs)
+                if isinstance(result, HttpResponse) and not 200 <= result.status_code < 300:
+                    return _ItemError(result.status_code, self._serialize_result(result, None))
+                return self._serialize_result(result, declared_schema)
+            with phase('view'):
+                if parallel and len(found) > 1:
                     with weave() as w:
-                        result = view_func(schema_instance, request, w, *args, **route_kwargs)
-                    if result is None and hasattr(w, 'result'):
-                        result = w.result.final if hasattr(w.result, 'final') else None
-            sig = inspect.signature(view_func)
-            return_annotation = sig.return_annotation
-            response_schema = return_annotation if return_annotation is not inspect.Signature.empty else None
-            if response_schema is None:
-                if hasattr(result, '_default_schema'):
-                    response_schema = result._default_schema
-                elif isinstance(result, list) and result and hasattr(result[0], '_default_schema'):
-                    response_schema = List[result[0]._default_schema]
-            return self._process_view_result(result, response_schema, view_func, is_api=True)
+                        @w.do(list(zip(found, schema_instances)))
+                        def results(item):
+                            return run(*item)
+                    data = w.result.results
+                else:
+                    data = [run(pk, schema_instance) for pk, schema_instance in zip(found, schema_instances)]
+            with phase('encode'):
+                # Items whose action answered with a non-2xx response keep its status under `errors`
+                return encode_response(request, {
+                    'results': {str(pk): item for pk, item in zip(found, data) if not isinstance(item, _ItemError)},
+                    'errors': {str(pk): item._asdict() for pk, item in zip(found, data) if isinstance(item, _ItemError)},
+                    'missing': [pk for pk in pks if pk not in instances],
+                })
+        wrapper.is_authenticated = is_authenticated
+        wrapper.has_permissions = has_permissions
+        return self._instrument(wrapper, action_kwargs)
+
+    def _create_bulk_view_wrapper(self, write_rows: Callable, schema_cls: type, operation: str, batch_size: int, **bulk_kwargs) -> Callable:
+        is_authenticated = bulk_kwargs.get("is_authenticated", False)
+        has_permissions = bulk_kwargs.get("has_permissions", None)
+        permission_check = compile_permissions(has_permissions)
+        @wraps(write_rows)
+        def wrapper(request, *args, **route_kwargs):
+            denied = _enforce_security(request, is_authenticated, permission_check)
+            if denied is not None:
+                return denied
+            if request.method != 'POST':
+                return HttpResponseNotAllowed(['POST'])
+            try:
+                rows = decode_body(request)
+            except ValueError:
+                return HttpResponseBadRequest("Invalid JSON in request body.")
+            if not isinstance(rows, list):
+                return HttpResponseBadRequest("Expected a JSON array of objects.")
+            try:
+                with phase('write'):
+                    pks, errors = write_rows(schema_cls, rows, batch_size=batch_size)
+            except IntegrityError:
+                # The database message names tables and constraints, so it stays in the logs
+                logger.exception("Bulk %s of %s failed", operation, schema_cls.__name__)
+                return HttpResponse(f"Bulk {operation} conflicts with existing data.", status=409)
+            return encode_response(request, {
+                f"{operation}d": pks,
+                'errors': {str(index): messages for index, messages in sorted(errors.items())},
+            })
         wrapper.is_authenticated = is_authenticated
         wrapper.has_permissions = has_permissions
-        return wrapper
+        return self._instrument(wrapper, bulk_kwargs)
 
-    def _process_view_result(self, result: any, schema: any, view_func: Callable, is_api: bool = False) -> HttpResponse:
+    def _instrument(self, wrapper: Callable, options: Dict[str, Any]) -> Callable:
+        """
+        Applies the per-route runtime layers (replica reads, coalescing, compression, caching, profiling, query tracking, metrics).
+        """
+        # Metrics are labelled with the path the view ends up registered under
+        label = lambda: self.router.views.get(instrumented)
+        view = route_reads(wrapper)
+        if options.get("coalesce"):
+            view = coalesce_requests(view, options.get("coalesce_vary", DEFAULT_VARY))
+        # Compress before caching so cached entries are stored compressed (keyed on Accept-Encoding)
+        view = compress_responses(view, options.get("compress"))
+        cache_policy = StaleWhileRevalidate.from_option(options.get("cache"))
+        if cache_policy is not None:
+            view = cache_responses(view, cache_policy, label)
+        if cache_policy is not None or options.get("coalesce"):
+            # Shared and cached responses skip the view's own checks, so run them first
+            view = _secured(view, options.get("is_authenticated", False), compile_permissions(options.get("has_permissions")))
+        view = track_queries(profile_requests(view, label), label, options.get("query_budget"))
+        instrumented = instrument(view, label)
+        return instrumented
+
+    def _serialize_result(self, result: any, schema: any) -> any:
+        """
+        Converts a view result into JSON-compatible data instead of a response.
+        """
+        if isinstance(result, JsonResponse):
+            return json.loads(result.content)
+        if isinstance(result, HttpResponse):
+            return result.content.decode(result.charset)
+        if schema is None:
+            if hasattr(result, '_default_schema'):
+                schema = result._default_schema
+            elif isinstance(result, list) and result and hasattr(result[0], '_default_schema'):
+                schema = List[result[0]._default_schema]
+        if schema is not None:
+            if get_origin(schema) in (list, List):
+                args = get_args(schema)
+                if args and inspect.isclass(args[0]) and issubclass(args[0], BaseModel):
+                    return [args[0].model_validate(item).model_dump(mode='json') for item in result]
+            if inspect.isclass(schema) and issubclass(schema, BaseModel):
+                return schema.model_validate(result).model_dump(mode='json')
+        if isinstance(result, BaseModel):
+            return result.model_dump(mode='json')
+        if result is None or isinstance(result, (dict, list, str, int, float, bool)):
+            return result
+        return str(result)
+
+    def _finalize_result(self, request, result: any, view_func: Callable, response_schema: any, paginator, is_api: bool = False, fallback_schema: any = None) -> HttpResponse:
+        """
+        Applies field projection and pagination to a view's result and serializes it.
+        """
+        if isinstance(result, HttpResponse):
+            return result
+        if response_schema is None and paginator is not None:
+            # A paginated collection action serializes rows with its own schema
+            response_schema = fallback_schema
+        requested_fields = _requested_fields(request)
+        projected = False
+        if requested_fields and response_schema is not None:
+            try:
+                narrowed = project_schema(response_schema, requested_fields)
+            except ValueError as e:
+                return HttpResponseBadRequest(str(e))
+            projected = True
+            # Schemas that cannot be projected are serialized in full and need every column
+            if isinstance(result, QuerySet) and narrowed != response_schema:
+                # The next cursor is read from the last row, so its ordering columns are loaded too
+                ordering = [field.lstrip('-') for field in paginator.get_ordering(result)] if paginator is not None else []
+                result = _only_fields(result, requested_fields + [name for name in ordering if name not in requested_fields])
+            response_schema = narrowed
+        page = None
+        if paginator is not None:
+            try:
+                page = paginator.paginate(request, result)
+            except InvalidCursor as e:
+                return HttpResponseBadRequest(str(e))
+            result = page.items
+        if response_schema is None:
+            if hasattr(result, '_default_schema'):
+                response_schema = result._default_schema
+            elif isinstance(result, list) and result and hasattr(result[0], '_default_schema'):
+                response_schema = List[result[0]._default_schema]
+        if requested_fields and not projected and response_schema is not None:
+            try:
+                response_schema = project_schema(response_schema, requested_fields)
+            except ValueError as e:
+                return HttpResponseBadRequest(str(e))
+        return self._process_view_result(result, response_schema, view_func, is_api=is_api, page=page, request=request)
+
+    def _process_view_result(self, result: any, schema: any, view_func: Callable, is_api: bool = False, page=None, request=None) -> HttpResponse:
         if isinstance(result, HttpResponse):
             return result
+        if page is not None:
+            # Paginated results are always returned as a JSON envelope
+            item_schema = None
+            if schema is not None and get_origin(schema) in (list, List):
+                args = get_args(schema)
+                if args and inspect.isclass(args[0]) and issubclass(args[0], BaseModel):
+                    item_schema = args[0]
+            with phase('validate'):
+                if item_schema is not None:
+                    data = _dump_rows(item_schema, result)
+                else:
+                    data = list(result)
+            with phase('encode'):
+                return encode_response(request, page.envelope(data))
         # If the view returns a dictionary for non-API, render template
         if not is_api and isinstance(result, dict) and schema is None:
             template_name = f"templates/{view_func.__name__}.html"
@@ -184,7 +442,8 @@ class Api:
                 if not source.lstrip().startswith('{% extends'):
                     wrapped_source = '{% extends "base.html" %}{% block content %}' + source + '{% endblock %}' 
                     template = engines['django'].from_string(wrapped_source)
-                return HttpResponse(template.render(result))
+                with phase('render'):
+                    return HttpResponse(template.render(result))
             except TemplateDoesNotExist:
                 return HttpResponse(f"Template '{template_name}' not found for view '{view_func.__name__}'.", status=404)
         if schema is not None:
@@ -192,18 +451,78 @@ class Api:
             if origin is list or origin is List:
                 args = get_args(schema)
                 if args and inspect.isclass(args[0]) and issubclass(args[0], BaseModel):
-                    validated_data = [args[0].model_validate(item).model_dump() for item in result]
-                    return JsonResponse(validated_data, safe=False)
+                    with phase('validate'):
+                        validated_data = _dump_rows(args[0], result)
+                    with phase('encode'):
+                        return encode_response(request, validated_data, safe=False)
             if inspect.isclass(schema) and issubclass(schema, BaseModel):
-                validated_data = schema.model_validate(result).model_dump()
-                return JsonResponse(validated_data)
+                with phase('validate'):
+                    validated_data = schema.model_validate(result).model_dump()
+                with phase('encode'):
+                    return encode_response(request, validated_data)
             return HttpResponse(str(result))
         if is_api:
             if isinstance(result, (dict, list)):
-                return JsonResponse(result, safe=not isinstance(result, list))
+                with phase('encode'):
+                    return encode_response(request, result, safe=not isinstance(result, list))
             return HttpResponse(str(result))
         return HttpResponse(str(result))
 
+def _dump_rows(schema: type, rows) -> list:
+    # Plain ModelSchemas validate a whole QuerySet column by column instead of one model per row
+    if isinstance(rows, QuerySet) and issubclass(schema, ModelSchema) and schema.supports_batch():
+        return schema.batch(rows).to_dicts()
+    return [schema.model_validate(item).model_dump() for item in rows]
+
+def _declared_schema(view: Callable) -> any:
+    return_annotation = inspect.signature(view).return_annotation
+    return return_annotation if return_annotation is not inspect.Signature.empty else None
+
+def _requested_fields(request) -> Optional[List[str]]:
+    """
+    Parses the `?fields=a,b` projection parameter.
+    """
+    raw = request.GET.get('fields')
+    if not raw:
+        return None
+    return [name.strip() for name in raw.split(',') if name.strip()]
+
+def _only_fields(queryset: QuerySet, fields: List[str]) -> QuerySet:
+    # Only defer real columns; anything else (properties, annotations) still needs the full row.
+    concrete = {f.name for f in queryset.model._meta.concrete_fields} | {f.attname for f in queryset.model._meta.concrete_fields}
+    if not all(name in concrete or name == 'pk' for name in fields):
+        return queryset
+    return queryset.only(*fields)
+
+def _enforce_security(request, is_authenticated: bool, has_permissions: Optional[Callable]) -> Optional[HttpResponse]:
+    with phase('auth'):
+        if is_authenticated and not request.user.is_authenticated:
+            return redirect('/login/')
+        if has_permissions and callable(has_permissions) and not has_permissions(request):
+            return HttpResponseForbidden()
+    return None
+
+_ItemError = namedtuple('_ItemError', ('status', 'body'))
+
+def _secured(view: Callable, is_authenticated: bool, permission_check: Optional[Callable]) -> Callable:
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        denied = _enforce_security(request, is_authenticated, permission_check)
+        if denied is not None:
+            return denied
+        return view(request, *args, **kwargs)
+    return wrapper
+
+def _call_instance_action(view_func: Callable, schema_instance: any, request, wove_enabled: bool, *args, **route_kwargs) -> any:
+    if not wove_enabled:
+        return view_func(schema_instance, request, *args, **route_kwargs)
+    with weave() as w:
+        result = view_func(schema_instance, request, w, *args, **route_kwargs)
+    record_wove(w)
+    if result is None and hasattr(w, 'result'):
+        result = w.result.final if hasattr(w.result, 'final') else None
+    return result
+
 def action(path: Optional[str] = None, **kwargs) -> Callable:
     def decorator(view: Callable) -> Callable:
         view.is_action = True
@@ -215,9 +534,23 @@ def action(path: Optional[str] = None, **kwargs) -> Callable:
 api = Api()
 route = api.route
 
+def route_manifest(request, digest: str):
+    """
+    Serves the route manifest script. The URL carries the content hash, so a
+    matching request can be cached forever; stale hashes get the current script uncached.
+    """
+    script, current_digest = api.router.manifest()
+    response = HttpResponse(script, content_type='text/javascript; charset=utf-8')
+    if digest == current_digest:
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
+
 def get_urls():
     """
     Returns a list of Django URL patterns for all registered routes.
     This allows integration into existing Django projects via include in urls.py.
+    The same list object is returned on every call and picks up routes registered later.
     """
     return api.urls
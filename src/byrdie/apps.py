@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class ByrdieConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "byrdie"
+
+    def ready(self):
+        # Connects the model change receivers that feed live updates and
+        # invalidate cached users
+        from . import auth, live  # noqa: F401
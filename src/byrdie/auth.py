@@ -1,6 +1,141 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
 from django.shortcuts import render, redirect
-from django.contrib.auth import authenticate, login as auth_login
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY, authenticate, get_user, login as auth_login
+from django.contrib.auth.middleware import AuthenticationMiddleware
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.auth.signals import user_logged_out
 from django.conf import settings
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.utils.crypto import constant_time_compare
+from django.utils.functional import SimpleLazyObject, empty
+from .permissions import forget_all, forget_user
+
+DEFAULT_USER_CACHE_TTL = 30
+DEFAULT_USER_CACHE_SIZE = 1000
+# Permission sets ModelBackend memoizes on a user instance
+PERMISSION_CACHE_ATTRS = ('_perm_cache', '_user_perm_cache', '_group_perm_cache')
+
+# Per-process LRU cache of authenticated users keyed by the session's user id.
+# Each request gets its own copy of the cached instance; permission sets memoized
+# on a copy are written back when the response is returned, so they are reused too.
+_users = OrderedDict()
+_users_lock = threading.Lock()
+
+def _cached(user_id: str):
+    with _users_lock:
+        entry = _users.get(user_id)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _users[user_id]
+            return None
+        _users.move_to_end(user_id)
+        return entry[1]
+
+def get_cached_user(request):
+    """
+    Returns the session's user without touching the database while a cached copy is
+    younger than `BYRDIE_USER_CACHE_TTL` seconds and the session auth hash still matches.
+    At most `BYRDIE_USER_CACHE_SIZE` users are kept.
+    """
+    try:
+        user_id = str(request.session[SESSION_KEY])
+    except KeyError:
+        return AnonymousUser()
+    user = _cached(user_id)
+    if user is not None:
+        session_hash = request.session.get(HASH_SESSION_KEY)
+        if session_hash and constant_time_compare(session_hash, user.get_session_auth_hash()):
+            return copy.copy(user)
+    user = get_user(request)
+    if user.is_authenticated:
+        ttl = getattr(settings, 'BYRDIE_USER_CACHE_TTL', DEFAULT_USER_CACHE_TTL)
+        size = getattr(settings, 'BYRDIE_USER_CACHE_SIZE', DEFAULT_USER_CACHE_SIZE)
+        with _users_lock:
+            _users[user_id] = (time.monotonic() + ttl, copy.copy(user))
+            _users.move_to_end(user_id)
+            while len(_users) > size:
+                _users.popitem(last=False)
+    return user
+
+def remember_permissions(user):
+    """
+    Copies the permission sets memoized on a request's user onto the cached instance.
+    """
+    if user is None or not user.is_authenticated:
+        return
+    cached = _cached(str(user.pk))
+    if cached is None:
+        return
+    for attr in PERMISSION_CACHE_ATTRS:
+        # ModelBackend replaces these sets rather than mutating them, so sharing them is safe
+        if attr in user.__dict__ and attr not in cached.__dict__:
+            setattr(cached, attr, user.__dict__[attr])
+
+def invalidate_user(user_id):
+    with _users_lock:
+        _users.pop(str(user_id), None)
+    forget_user(user_id)
+
+def invalidate_all_users():
+    with _users_lock:
+        _users.clear()
+    forget_all()
+
+def _user_changed(sender, instance, **kwargs):
+    invalidate_user(instance.pk)
+
+def _memberships_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    from django.contrib.auth import get_user_model
+    from django.contrib.auth.models import Group
+    user_model = get_user_model()
+    user_relations = [getattr(user_model, name).through for name in ('groups', 'user_permissions') if hasattr(user_model, name)]
+    if sender is Group.permissions.through:
+        # Any member of the group may be affected
+        invalidate_all_users()
+    elif sender in user_relations:
+        if not reverse:
+            invalidate_user(instance.pk)
+        elif action == 'pre_clear':
+            # Clearing e.g. group.user_set sends no pk_set, so look the members up before they go
+            user_column = next(f.attname for f in sender._meta.fields if f.is_relation and f.related_model is user_model)
+            other_column = next(f.attname for f in sender._meta.fields if f.is_relation and f.related_model is not user_model)
+            for user_id in sender.objects.filter(**{other_column: instance.pk}).values_list(user_column, flat=True):
+                invalidate_user(user_id)
+        else:
+            for user_id in pk_set or ():
+                invalidate_user(user_id)
+
+def _group_deleted(sender, instance, **kwargs):
+    invalidate_all_users()
+
+def _logged_out(sender, request, user, **kwargs):
+    if user is not None:
+        invalidate_user(user.pk)
+
+post_save.connect(_user_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid='byrdie.auth.user_saved')
+post_delete.connect(_user_changed, sender=settings.AUTH_USER_MODEL, dispatch_uid='byrdie.auth.user_deleted')
+post_delete.connect(_group_deleted, sender='auth.Group', dispatch_uid='byrdie.auth.group_deleted')
+m2m_changed.connect(_memberships_changed, dispatch_uid='byrdie.auth.memberships_changed')
+user_logged_out.connect(_logged_out, dispatch_uid='byrdie.auth.logged_out')
+
+class CachedAuthenticationMiddleware(AuthenticationMiddleware):
+    """
+    A drop-in for Django's AuthenticationMiddleware that serves `request.user` from the per-process user cache.
+    """
+    def process_request(self, request):
+        super().process_request(request)
+        request.user = SimpleLazyObject(lambda: get_cached_user(request))
+
+    def process_response(self, request, response):
+        user = getattr(request, 'user', None)
+        # Only write back when the lazy user was actually loaded by this request
+        if isinstance(user, SimpleLazyObject) and user._wrapped is not empty:
+            remember_permissions(user._wrapped)
+        return response
 
 def login(request):
     if request.method == 'POST':
@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Tuple
+from django.db import transaction
+from django.db.models import F
+from pydantic import TypeAdapter, ValidationError
+from .schemas import INPUT_CONTEXT, project_schema
+
+_adapters: Dict[Any, TypeAdapter] = {}
+
+def _adapter(schema_cls) -> TypeAdapter:
+    adapter = _adapters.get(schema_cls)
+    if adapter is None:
+        adapter = _adapters[schema_cls] = TypeAdapter(List[schema_cls])
+    return adapter
+
+def _attname(model, name: str) -> str:
+    # Foreign keys are exposed as ids, so write them through their column attribute
+    return model._meta.get_field(name).attname
+
+def validate_rows(schema_cls, rows: List[Any]) -> Tuple[List[Tuple[int, Any]], Dict[int, List[str]]]:
+    """
+    Validates a list of rows against a schema in a single pass.
+    Returns the (index, validated row) pairs that passed and the errors of the rest, keyed by index.
+    """
+    adapter = _adapter(schema_cls)
+    try:
+        return list(enumerate(adapter.validate_python(rows, context=INPUT_CONTEXT))), {}
+    except ValidationError as e:
+        errors: Dict[int, List[str]] = {}
+        for error in e.errors():
+            loc = error['loc']
+            if not loc or not isinstance(loc[0], int):
+                raise
+            field = '.'.join(str(part) for part in loc[1:])
+            errors.setdefault(loc[0], []).append(f"{field}: {error['msg']}" if field else error['msg'])
+    valid_indexes = [i for i in range(len(rows)) if i not in errors]
+    valid = adapter.validate_python([rows[i] for i in valid_indexes], context=INPUT_CONTEXT)
+    return list(zip(valid_indexes, valid)), errors
+
+def bulk_create_rows(schema_cls, rows: List[Any], batch_size: int = 500) -> Tuple[List[Any], Dict[int, List[str]]]:
+    """
+    Creates model instances from rows with bulk_create inside one transaction.
+    The primary key is not required in the payload.
+    """
+    model = schema_cls.Meta.model
+    pk_name = model._meta.pk.name
+    fields = [name for name in schema_cls.model_fields if name not in (pk_name, 'pk')]
+    valid, errors = validate_rows(project_schema(schema_cls, fields), rows)
+    objs = [model(**{_attname(model, name): getattr(row, name) for name in type(row).model_fields}) for _, row in valid]
+    with transaction.atomic():
+        created = model.objects.bulk_create(objs, batch_size=batch_size)
+    return [obj.pk for obj in created], errors
+
+def bulk_update_rows(schema_cls, rows: List[Any], batch_size: int = 500) -> Tuple[List[Any], Dict[int, List[str]]]:
+    """
+    Updates existing model instances from rows with bulk_update inside one transaction.
+    Every row must carry the primary key (`Api.add_schema` checks that the schema
+    exposes it); rows for unknown pks are reported as errors. Models with a
+    `version_field` are updated row by row instead, and each row must carry the
+    version it was read at; rows changed since then are reported as conflicts.
+    """
+    model = schema_cls.Meta.model
+    pk_name = model._meta.pk.name
+    if getattr(model, 'version_field', None):
+        return _bulk_update_versioned_rows(schema_cls, rows)
+    fields = [name for name in schema_cls.model_fields if name != pk_name]
+    valid, errors = validate_rows(schema_cls, rows)
+    with transaction.atomic():
+        existing = model.objects.in_bulk([getattr(row, pk_name) for _, row in valid])
+        objs = []
+        for index, row in valid:
+            obj = existing.get(getattr(row, pk_name))
+            if obj is None:
+                errors[index] = [f"{pk_name}: object does not exist"]
+                continue
+            for name in fields:
+                setattr(obj, _attname(model, name), getattr(row, name))
+            objs.append(obj)
+        if objs and fields:
+            model.objects.bulk_update(objs, [model._meta.get_field(name).name for name in fields], batch_size=batch_size)
+    return [obj.pk for obj in objs], errors
+
+def _bulk_update_versioned_rows(schema_cls, rows: List[Any]) -> Tuple[List[Any], Dict[int, List[str]]]:
+    # Like Model.save(), each row is one UPDATE ... WHERE pk = %s AND version = %s that
+    # bumps the version; rows written by someone else since their version are conflicts.
+    model = schema_cls.Meta.model
+    pk_name = model._meta.pk.name
+    version = model._meta.get_field(model.version_field)
+    fields = [name for name in schema_cls.model_fields if name not in (pk_name, version.name)]
+    valid, errors = validate_rows(schema_cls, rows)
+    updated = []
+    with transaction.atomic():
+        existing = set(model.objects.filter(pk__in=[getattr(row, pk_name) for _, row in valid]).values_list('pk', flat=True))
+        for index, row in valid:
+            pk = getattr(row, pk_name)
+            if pk not in existing:
+                errors[index] = [f"{pk_name}: object does not exist"]
+                continue
+            if version.name not in row.model_fields_set:
+                errors[index] = [f"{version.name}: Field required"]
+                continue
+            expected = getattr(row, version.name)
+            values = {_attname(model, name): getattr(row, name) for name in fields}
+            values[version.attname] = F(version.attname) + 1
+            if model.objects.filter(pk=pk, **{version.attname: expected}).update(**values):
+                updated.append(pk)
+            else:
+                errors[index] = [f"{version.name}: modified since version {expected}"]
+    return updated, errors
@@ -0,0 +1,111 @@
+import hashlib
+import threading
+import time
+from functools import wraps
+from typing import Any, Callable, Optional
+from django.conf import settings
+from django.core.cache import caches
+from django.db import close_old_connections
+from django.http import HttpResponse
+from wove import weave
+from .coalesce import DEFAULT_VARY, request_key
+
+class StaleWhileRevalidate:
+    """
+    A route response cache. Fresh entries (younger than `ttl`) are served as-is.
+    Entries up to `max_stale` seconds past the TTL are served immediately while
+    a background wove task recomputes them. Older entries are recomputed inline.
+    Uses the local cache alias in `BYRDIE_CACHE_ALIAS` ('default' unless set).
+    """
+    def __init__(self, ttl: float, max_stale: Optional[float] = None, vary=DEFAULT_VARY, alias: Optional[str] = None):
+        self.ttl = ttl
+        self.max_stale = max_stale if max_stale is not None else ttl * 10
+        self.vary = tuple(vary)
+        self._alias = alias
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_option(cls, option: Any) -> Optional['StaleWhileRevalidate']:
+        """
+        Builds a cache policy from the `cache=` argument of `route()`: a TTL in seconds,
+        a dict of keyword arguments or a StaleWhileRevalidate instance.
+        """
+        if option is None or option is False:
+            return None
+        if isinstance(option, cls):
+            return option
+        if isinstance(option, (int, float)) and not isinstance(option, bool):
+            return cls(ttl=option)
+        if isinstance(option, dict):
+            return cls(**option)
+        raise TypeError(f"Unsupported cache option: {option!r}")
+
+    @property
+    def cache(self):
+        return caches[self._alias or getattr(settings, 'BYRDIE_CACHE_ALIAS', 'default')]
+
+    def key(self, route: str, request) -> str:
+        digest = hashlib.sha256(repr((route, request_key(request, self.vary))).encode()).hexdigest()
+        return f"byrdie:swr:{digest}"
+
+    def store(self, key: str, response: HttpResponse):
+        entry = (time.time(), response.status_code, list(response.items()), response.content)
+        self.cache.set(key, entry, timeout=self.ttl + self.max_stale)
+
+    def refresh_in_background(self, key: str, compute: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        def done(result):
+            with self._lock:
+                self._refreshing.discard(key)
+        with weave(background=True, on_done=done) as w:
+            @w.do
+            def refreshed():
+                try:
+                    response = compute()
+                    if _cacheable(response):
+                        self.store(key, response)
+                except Exception:
+                    # A failed refresh leaves the stale entry in place until max_stale
+                    pass
+                finally:
+                    close_old_connections()
+
+def _cacheable(response) -> bool:
+    return isinstance(response, HttpResponse) and response.status_code == 200 and not response.cookies
+
+def _from_entry(entry, state: str) -> HttpResponse:
+    created, status, headers, content = entry
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response[header] = value
+    response['Age'] = str(int(time.time() - created))
+    response['X-Byrdie-Cache'] = state
+    return response
+
+def cache_responses(view: Callable, policy: StaleWhileRevalidate, label: Callable[[], str]) -> Callable:
+    """
+    Wraps a view with a stale-while-revalidate response cache for GET/HEAD requests.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        key = policy.key(label() or view.__name__, request)
+        entry = policy.cache.get(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            if age < policy.ttl:
+                return _from_entry(entry, 'hit')
+            if age < policy.ttl + policy.max_stale:
+                policy.refresh_in_background(key, lambda: view(request, *args, **kwargs))
+                return _from_entry(entry, 'stale')
+        response = view(request, *args, **kwargs)
+        if _cacheable(response):
+            policy.store(key, response)
+            response['X-Byrdie-Cache'] = 'miss'
+        return response
+    return wrapper
@@ -3,7 +3,6 @@ import sys
 from django.core.management import ManagementUtility
 from django.conf import settings
 import django
-from byrdie import urls
 from byrdie.utils import parse_imports, find_model_subclasses, register_discovered_models
 from django.apps import apps
 import importlib
@@ -25,6 +24,9 @@ def bootstrap_byrdie():
                 SECRET_KEY='a-secret-key', # In a real app, this should be secret!
                 ROOT_URLCONF='byrdie.urls', # Point to the new urls module
                 INSTALLED_APPS=[
+                    'django.contrib.contenttypes',
+                    'django.contrib.auth',
+                    'django.contrib.sessions',
                     'byrdie',
                     'django.contrib.staticfiles',
                     'app',
@@ -47,6 +49,18 @@ def bootstrap_byrdie():
                 ],
                 STATIC_URL="/static/",
                 STATICFILES_DIRS=[os.path.join(os.getcwd(), "static")],
+                STATIC_ROOT=os.path.join(os.getcwd(), "staticfiles"),
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "byrdie.staticfiles.PrecompressedManifestStorage"},
+                },
+                MIDDLEWARE=[
+                    'django.contrib.sessions.middleware.SessionMiddleware',
+                    'byrdie.auth.CachedAuthenticationMiddleware',
+                ],
+                # Sessions are stored server-side and read through the cache, so loading one rarely queries
+                SESSION_ENGINE='django.contrib.sessions.backends.cached_db',
+                SESSION_COOKIE_HTTPONLY=True,
                 MIGRATION_MODULES={'app': 'migrations'},
                 SESSION_REMEMBER_ME_AGE=1209600,  # 2 weeks
             )
@@ -98,8 +112,14 @@ def main():
     command = sys.argv[1]
     if command == "runserver":
         bootstrap_byrdie()
+        from byrdie import urls
         from byrdie.api import api
-        urls.urlpatterns.extend(api.urls)
+        from django.urls import include, path
+        # Include the router's live pattern list so routes registered later are served too.
+        urls.urlpatterns.append(path('', include(api.urls)))
+        # Build schemas, resolvers and templates now rather than on the first requests
+        from byrdie.warmup import warm_up
+        print(warm_up())
         # Default host and port
         host = "127.0.0.1"
         port = 8000
@@ -124,6 +144,22 @@ def main():
         bootstrap_byrdie()
         utility = ManagementUtility(['byrdie', 'migrate'])
         utility.execute()
+    elif command == "collectstatic":
+        bootstrap_byrdie()
+        from byrdie.staticfiles import build_static
+        written = build_static()
+        print(f"Precompressed {len(written)} static files.")
+    elif command == "worker":
+        bootstrap_byrdie()
+        from byrdie.jobs import work
+        try:
+            work(once="--once" in sys.argv[2:])
+        except KeyboardInterrupt:
+            pass
+    elif command == "profile-token":
+        bootstrap_byrdie()
+        from byrdie.profiling import make_profile_token, PROFILE_PARAM
+        print(f"?{PROFILE_PARAM}={make_profile_token()}")
     else:
         print(f"Unknown command: {command}")
         sys.exit(1)
@@ -0,0 +1,142 @@
+import asyncio
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable
+from django.conf import settings
+from django.http import HttpResponse
+
+DEFAULT_VARY = ('Accept', 'Accept-Encoding', 'Accept-Language')
+
+class _Call:
+    __slots__ = ('event', 'result', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+class SingleFlight:
+    """
+    Runs at most one computation per key at a time; concurrent callers with the
+    same key wait for it and share its result (or its exception).
+    """
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._futures: Dict[Hashable, asyncio.Future] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> tuple:
+        """
+        Returns (result, shared) where `shared` is True for callers that waited on another's call.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> tuple:
+        """
+        The asyncio counterpart of `do`, for callers on the same event loop.
+        """
+        future = self._futures.get(key)
+        if future is not None:
+            return await asyncio.shield(future), True
+        future = self._futures[key] = asyncio.get_running_loop().create_future()
+        try:
+            result = await fn()
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+        finally:
+            self._futures.pop(key, None)
+        return result, False
+
+flights = SingleFlight()
+
+def request_identity(request) -> tuple:
+    """
+    Who a request is made for: the authenticated user's pk, the Authorization
+    header and the session cookie.
+    """
+    user = getattr(request, 'user', None)
+    user_id = user.pk if user is not None and user.is_authenticated else None
+    return (
+        user_id,
+        request.headers.get('Authorization', ''),
+        request.COOKIES.get(settings.SESSION_COOKIE_NAME, ''),
+    )
+
+def request_key(request, vary: Iterable[str]) -> tuple:
+    """
+    Identifies requests that would produce the same response: method, path, query,
+    the listed request headers and the request's identity, so requests made for
+    different users or credentials are never shared.
+    """
+    return (
+        request.method,
+        request.path,
+        tuple(sorted((name, tuple(values)) for name, values in request.GET.lists())),
+        tuple(request.headers.get(header, '') for header in vary),
+        request_identity(request),
+    )
+
+def _copy_response(response: HttpResponse) -> HttpResponse:
+    # Each waiter gets its own response object so middleware can set headers and
+    # cookies independently; the body bytes are shared.
+    copy = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        copy[header] = value
+    return copy
+
+def coalesce_requests(view: Callable, vary: Iterable[str] = DEFAULT_VARY) -> Callable:
+    """
+    Wraps a view so identical concurrent GET/HEAD requests share one computation.
+    Works for both sync and async views.
+    """
+    vary = tuple(vary)
+    if inspect.iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+            response, shared = await flights.ado(request_key(request, vary), lambda: view(request, *args, **kwargs))
+            if not shared:
+                return response
+            if not isinstance(response, HttpResponse):
+                # Streaming responses can only be consumed once
+                return await view(request, *args, **kwargs)
+            return _copy_response(response)
+        return async_wrapper
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        response, shared = flights.do(request_key(request, vary), lambda: view(request, *args, **kwargs))
+        if not shared:
+            return response
+        if not isinstance(response, HttpResponse):
+            # Streaming responses can only be consumed once
+            return view(request, *args, **kwargs)
+        return _copy_response(response)
+    return wrapper
@@ -0,0 +1,99 @@
+import gzip
+import re
+from functools import wraps
+from typing import Callable, Optional
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024
+DEFAULT_TYPES = (
+    'text/html',
+    'text/plain',
+    'text/css',
+    'text/javascript',
+    'application/javascript',
+    'application/json',
+    'application/msgpack',
+    'image/svg+xml',
+)
+_q_zero_re = re.compile(r';\s*q=0(?:\.0*)?\s*$')
+
+def accepted_encodings(request) -> set:
+    encodings = set()
+    for part in request.headers.get('Accept-Encoding', '').split(','):
+        part = part.strip().lower()
+        if part and not _q_zero_re.search(part):
+            encodings.add(part.split(';')[0].strip())
+    return encodings
+
+def choose_encoding(request) -> Optional[str]:
+    accepted = accepted_encodings(request)
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(data)
+    # mtime=0 keeps the output deterministic, so identical bodies compress identically
+    return gzip.compress(data, compresslevel=6, mtime=0)
+
+def compress_response(request, response):
+    """
+    Compresses a response body in place when the client accepts it, the content
+    type is allowed (`BYRDIE_COMPRESS_TYPES`) and the body is at least
+    `BYRDIE_COMPRESS_MIN_SIZE` bytes.
+    """
+    if not isinstance(response, HttpResponse) or response.has_header('Content-Encoding'):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    content_type = response.get('Content-Type', '').split(';')[0].strip().lower()
+    if content_type not in getattr(settings, 'BYRDIE_COMPRESS_TYPES', DEFAULT_TYPES):
+        return response
+    if len(response.content) < getattr(settings, 'BYRDIE_COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE):
+        return response
+    encoding = choose_encoding(request)
+    if encoding is None:
+        return response
+    compressed = compress(response.content, encoding)
+    if len(compressed) >= len(response.content):
+        return response
+    response.content = compressed
+    response['Content-Length'] = str(len(compressed))
+    response['Content-Encoding'] = encoding
+    etag = response.get('ETag')
+    if etag and not etag.startswith('W/'):
+        # The compressed body is a different representation of the same resource
+        response['ETag'] = f"W/{etag}"
+    return response
+
+def compress_responses(view: Callable, enabled: Optional[bool] = None) -> Callable:
+    """
+    Wraps a Byrdie view so its responses are compressed. Compression is opt-in:
+    `compress=True` on the route, or `BYRDIE_COMPRESSION = True` for every route.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        response = view(request, *args, **kwargs)
+        if not (enabled if enabled is not None else getattr(settings, 'BYRDIE_COMPRESSION', False)):
+            return response
+        return compress_response(request, response)
+    return wrapper
+
+class CompressionMiddleware:
+    """
+    Applies the same compression to every response, for views outside the Byrdie router.
+    """
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        return compress_response(request, self.get_response(request))
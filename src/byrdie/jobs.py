@@ -0,0 +1,100 @@
+import json
+import logging
+import time
+from datetime import timedelta
+from typing import Optional
+from django.apps import apps
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections
+from django.http import HttpResponseNotFound, JsonResponse
+from django.utils import timezone
+from .models import Job
+
+logger = logging.getLogger('byrdie.jobs')
+
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_JOB_TIMEOUT = 3600
+
+def enqueue(instance, method_name: str, kwargs: dict) -> Job:
+    """
+    Queues a call of an exposed method on a saved model instance.
+    """
+    return Job.objects.create(
+        app_label=instance._meta.app_label,
+        model_name=instance._meta.model_name,
+        object_pk=str(instance.pk),
+        method_name=method_name,
+        kwargs=kwargs,
+    )
+
+def claim_next() -> Optional[Job]:
+    """
+    Marks the oldest queued job as running and returns it. The status check in the
+    UPDATE makes claiming safe with several workers on any database.
+    """
+    while True:
+        job = Job.objects.filter(status=Job.QUEUED).order_by('created_at').first()
+        if job is None:
+            return None
+        started_at = timezone.now()
+        if Job.objects.filter(pk=job.pk, status=Job.QUEUED).update(status=Job.RUNNING, started_at=started_at):
+            job.status, job.started_at = Job.RUNNING, started_at
+            return job
+
+def run_job(job: Job):
+    """
+    Runs a claimed job and records its result, or its error.
+    """
+    try:
+        model_class = apps.get_model(job.app_label, job.model_name)
+        instance = model_class.objects.get(pk=job.object_pk)
+        result = getattr(instance, job.method_name)(**job.kwargs)
+        # Store exactly what the client will decode
+        job.result = json.loads(json.dumps(result, cls=DjangoJSONEncoder))
+        job.status = Job.DONE
+    except Exception as e:
+        logger.exception("Job %s failed", job.pk)
+        job.error = str(e)
+        job.status = Job.FAILED
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at'])
+
+def requeue_stale(timeout: float) -> int:
+    """
+    Puts back jobs left running longer than `timeout` seconds, e.g. by a worker that died.
+    """
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.RUNNING, started_at__lt=cutoff).update(status=Job.QUEUED, started_at=None)
+
+def work(once: bool = False, poll_interval: Optional[float] = None) -> int:
+    """
+    Runs queued jobs until interrupted, sleeping `BYRDIE_JOB_POLL_INTERVAL` seconds
+    when the queue is empty. With `once=True`, returns after draining the queue.
+    Returns the number of jobs run.
+    """
+    if poll_interval is None:
+        poll_interval = getattr(settings, 'BYRDIE_JOB_POLL_INTERVAL', DEFAULT_POLL_INTERVAL)
+    requeue_stale(getattr(settings, 'BYRDIE_JOB_TIMEOUT', DEFAULT_JOB_TIMEOUT))
+    count = 0
+    while True:
+        close_old_connections()
+        job = claim_next()
+        if job is not None:
+            run_job(job)
+            count += 1
+            continue
+        if once:
+            return count
+        time.sleep(poll_interval)
+
+def job_view(request, job_id):
+    """
+    Reports a job's status, and its result or error once finished. The random job id
+    is only handed to the client that queued the call.
+    """
+    try:
+        job = Job.objects.get(pk=job_id)
+    except Job.DoesNotExist:
+        return HttpResponseNotFound("Job not found.")
+    return JsonResponse({'job': str(job.pk), 'status': job.status, 'result': job.result, 'error': job.error})
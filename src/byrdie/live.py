@@ -0,0 +1,243 @@
+import asyncio
+import json
+import queue
+import threading
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, Optional, Set
+from django.conf import settings
+from django.core import signing
+from django.core.handlers.asgi import ASGIRequest
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.http import HttpResponseBadRequest, StreamingHttpResponse
+from django.utils.module_loading import import_string
+from .models import Model
+from .rendering import exposed_state, state_diff
+
+_TOKEN_SALT = 'byrdie.live'
+DEFAULT_BROKER = 'byrdie.live.InProcessBroker'
+DEFAULT_HEARTBEAT = 15
+DEFAULT_MAX_SUBSCRIPTIONS = 100
+DEFAULT_TOKEN_MAX_AGE = 3600
+DEFAULT_STATE_CACHE_SIZE = 10000
+
+def instance_key(instance) -> str:
+    return f"{instance._meta.app_label}.{instance._meta.model_name}:{instance.pk}"
+
+def subscription_token(instance) -> str:
+    """
+    Returns a signed token that lets a client subscribe to changes of this instance.
+    Components get one in their `_meta`, so only rendered instances can be followed.
+    Tokens expire after `BYRDIE_LIVE_TOKEN_MAX_AGE` seconds.
+    """
+    return signing.TimestampSigner(salt=_TOKEN_SALT).sign(instance_key(instance))
+
+def _unsign(token: str) -> Optional[str]:
+    max_age = getattr(settings, 'BYRDIE_LIVE_TOKEN_MAX_AGE', DEFAULT_TOKEN_MAX_AGE)
+    try:
+        return signing.TimestampSigner(salt=_TOKEN_SALT).unsign(token, max_age=max_age)
+    except signing.BadSignature:
+        return None
+
+class Subscription:
+    """
+    Messages for a set of keys, delivered to one client. Subscriptions made on an
+    event loop are read with `aget`, others with `get`. When a slow client falls
+    `max_queue` messages behind, the oldest are dropped.
+    """
+    def __init__(self, broker: 'Broker', keys: Iterable[str], max_queue: int = 100):
+        self.broker = broker
+        self.keys = set(keys)
+        try:
+            self.loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(max_queue)
+        except RuntimeError:
+            self.loop = None
+            self._queue = queue.Queue(max_queue)
+
+    def deliver(self, message: str):
+        if self.loop is None:
+            self._put(message, queue.Full)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._put, message, asyncio.QueueFull)
+        except RuntimeError:
+            # The client's event loop has closed
+            self.close()
+
+    def _put(self, message: str, full: type):
+        while True:
+            try:
+                self._queue.put_nowait(message)
+                return
+            except full:
+                self._queue.get_nowait()
+
+    def get(self, timeout: float) -> Optional[str]:
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    async def aget(self, timeout: float) -> Optional[str]:
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+class Broker:
+    """
+    Fans out model change messages to subscriptions. Set `BYRDIE_LIVE_BROKER` to the
+    dotted path of a subclass to relay messages through an external broker.
+    """
+    def subscribe(self, keys: Iterable[str]) -> Subscription:
+        raise NotImplementedError
+
+    def unsubscribe(self, subscription: Subscription):
+        raise NotImplementedError
+
+    def publish(self, key: str, message: str):
+        raise NotImplementedError
+
+class InProcessBroker(Broker):
+    """
+    Delivers messages to subscribers in the same process.
+    """
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, keys: Iterable[str]) -> Subscription:
+        subscription = Subscription(self, keys)
+        with self._lock:
+            for key in subscription.keys:
+                self._subscribers[key].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        with self._lock:
+            for key in subscription.keys:
+                subscribers = self._subscribers.get(key)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[key]
+
+    def has_subscribers(self, key: str) -> bool:
+        return key in self._subscribers
+
+    def publish(self, key: str, message: str):
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+        for subscription in subscribers:
+            subscription.deliver(message)
+
+_broker: Optional[Broker] = None
+
+def get_broker() -> Broker:
+    global _broker
+    if _broker is None:
+        _broker = import_string(getattr(settings, 'BYRDIE_LIVE_BROKER', DEFAULT_BROKER))()
+    return _broker
+
+# key -> the state subscribers last heard about, for the in-process broker only.
+# Other brokers relay messages between processes that do not share this view.
+_last_states = OrderedDict()
+_states_lock = threading.Lock()
+
+def _compact(key: str, payload: dict) -> Optional[dict]:
+    """
+    Replaces a full state payload with its difference from the last broadcast state.
+    Returns None when nothing changed.
+    """
+    with _states_lock:
+        if 'state' not in payload:
+            _last_states.pop(key, None)
+            return payload
+        last = _last_states.pop(key, None)
+        state = payload['state'] if last is None else state_diff(last, payload['state'])
+        _last_states[key] = {**(last or {}), **payload['state']}
+        while len(_last_states) > getattr(settings, 'BYRDIE_LIVE_STATE_CACHE_SIZE', DEFAULT_STATE_CACHE_SIZE):
+            _last_states.popitem(last=False)
+    return {**payload, 'state': state} if state else None
+
+def _publish(broker: Broker, key: str, payload: dict):
+    if isinstance(broker, InProcessBroker):
+        payload = _compact(key, payload)
+        if payload is None:
+            return
+    broker.publish(key, json.dumps({'key': key, **payload}, cls=DjangoJSONEncoder))
+
+def broadcast(key: str, payload: dict):
+    broker = get_broker()
+    if isinstance(broker, InProcessBroker) and not broker.has_subscribers(key):
+        # The next subscriber starts from a freshly rendered component, so its first update is complete
+        with _states_lock:
+            _last_states.pop(key, None)
+        return
+    # Subscribers only hear about committed changes
+    transaction.on_commit(lambda: _publish(broker, key, payload))
+
+def _saved(sender, instance, update_fields=None, **kwargs):
+    if not isinstance(instance, Model):
+        return
+    state = exposed_state(instance)
+    if update_fields is not None:
+        state = {name: value for name, value in state.items() if name in update_fields}
+    if state:
+        broadcast(instance_key(instance), {'state': state})
+
+def _deleted(sender, instance, **kwargs):
+    if isinstance(instance, Model):
+        broadcast(instance_key(instance), {'deleted': True})
+
+post_save.connect(_saved, dispatch_uid='byrdie.live.saved')
+post_delete.connect(_deleted, dispatch_uid='byrdie.live.deleted')
+
+def _event_stream(keys: Set[str], heartbeat: float):
+    subscription = get_broker().subscribe(keys)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            message = subscription.get(heartbeat)
+            yield f"data: {message}\n\n" if message is not None else ': keepalive\n\n'
+    finally:
+        subscription.close()
+
+async def _aevent_stream(keys: Set[str], heartbeat: float):
+    subscription = get_broker().subscribe(keys)
+    try:
+        yield 'retry: 3000\n\n'
+        while True:
+            message = await subscription.aget(heartbeat)
+            yield f"data: {message}\n\n" if message is not None else ': keepalive\n\n'
+    finally:
+        subscription.close()
+
+def live_view(request):
+    """
+    Streams changes of the subscribed instances as Server-Sent Events. Clients pass
+    the components' subscription tokens as repeated `?c=` parameters. Under WSGI
+    each open stream holds a worker thread, so serve it with ASGI in production.
+    """
+    tokens = request.GET.getlist('c')
+    max_subscriptions = getattr(settings, 'BYRDIE_LIVE_MAX_SUBSCRIPTIONS', DEFAULT_MAX_SUBSCRIPTIONS)
+    if not tokens or len(tokens) > max_subscriptions:
+        return HttpResponseBadRequest(f"Pass between 1 and {max_subscriptions} subscription tokens.")
+    keys = {_unsign(token) for token in tokens}
+    if None in keys:
+        return HttpResponseBadRequest("Invalid subscription token.")
+    heartbeat = getattr(settings, 'BYRDIE_LIVE_HEARTBEAT', DEFAULT_HEARTBEAT)
+    if isinstance(request, ASGIRequest):
+        stream = _aevent_stream(keys, heartbeat)
+    else:
+        stream = _event_stream(keys, heartbeat)
+    response = StreamingHttpResponse(stream, content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keep proxies such as nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
@@ -0,0 +1,181 @@
+import bisect
+import re
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotFound
+
+# Upper bounds (seconds) of the latency histogram buckets, roughly log-spaced
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUANTILES = (0.5, 0.95, 0.99)
+
+_current_timer: ContextVar[Optional['RequestTimer']] = ContextVar('byrdie_request_timer', default=None)
+_token_re = re.compile(r'[^A-Za-z0-9_.-]')
+
+class RequestTimer:
+    """
+    Collects phase durations for one request and renders them as a Server-Timing header.
+    """
+    __slots__ = ('phases',)
+
+    def __init__(self):
+        self.phases: List[Tuple[str, float]] = []
+
+    def add(self, name: str, seconds: float):
+        self.phases.append((name, seconds))
+
+    def header(self) -> str:
+        return ', '.join(f"{_token_re.sub('_', name)};dur={seconds * 1000:.2f}" for name, seconds in self.phases)
+
+def current_timer() -> Optional[RequestTimer]:
+    return _current_timer.get()
+
+@contextmanager
+def phase(name: str):
+    """
+    Times a block as a named phase of the current request. A no-op outside instrumented views.
+    """
+    timer = _current_timer.get()
+    if timer is None:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        timer.add(name, perf_counter() - start)
+
+def record_wove(w):
+    """
+    Adds the duration of each `@w.do` task of a finished weave block to the current request.
+    """
+    timer = _current_timer.get()
+    result = getattr(w, 'result', None)
+    if timer is None or result is None:
+        return
+    timings = getattr(result, 'timings', {})
+    for name in getattr(result, '_definition_order', timings):
+        if name in timings:
+            timer.add(f"wove.{name}", timings[name])
+
+class LatencyHistogram:
+    """
+    A fixed-bucket latency histogram. Observing is a bisect and two additions under a lock.
+    """
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float):
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            self.counts[index] += 1
+            self.total += seconds
+            self.count += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimates a quantile by linear interpolation inside the bucket that contains it.
+        """
+        with self._lock:
+            counts = list(self.counts)
+            count = self.count
+        if not count:
+            return 0.0
+        rank = q * count
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+class MetricsRegistry:
+    """
+    In-process per-route latency histograms.
+    """
+    def __init__(self):
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, route: str, seconds: float):
+        histogram = self.histograms.get(route)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(route, LatencyHistogram())
+        histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {}
+
+    def render(self) -> str:
+        """
+        Renders all histograms in the Prometheus text exposition format.
+        """
+        name = 'byrdie_request_duration_seconds'
+        lines = [
+            f"# HELP {name} Latency of Byrdie views by route.",
+            f"# TYPE {name} histogram",
+        ]
+        quantile_lines = [
+            f"# HELP {name}_quantile Estimated latency quantiles of Byrdie views by route.",
+            f"# TYPE {name}_quantile gauge",
+        ]
+        for route, histogram in sorted(self.histograms.items()):
+            label = route.replace('\\', '\\\\').replace('"', '\\"')
+            with histogram._lock:
+                counts = list(histogram.counts)
+                total, count = histogram.total, histogram.count
+            cumulative = 0
+            for bound, bucket_count in zip(histogram.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{name}_bucket{{route="{label}",le="{bound}"}} {cumulative}')
+            lines.append(f'{name}_bucket{{route="{label}",le="+Inf"}} {count}')
+            lines.append(f'{name}_sum{{route="{label}"}} {total}')
+            lines.append(f'{name}_count{{route="{label}"}} {count}')
+            for q in QUANTILES:
+                quantile_lines.append(f'{name}_quantile{{route="{label}",quantile="{q}"}} {histogram.quantile(q)}')
+        return '\n'.join(lines + quantile_lines) + '\n'
+
+registry = MetricsRegistry()
+
+def instrument(view: Callable, label: Callable[[], str]) -> Callable:
+    """
+    Wraps a Byrdie view so it records its latency. The Server-Timing header is added
+    when `BYRDIE_SERVER_TIMING` is on, which defaults to `DEBUG`.
+    `label` is called after the request to name the route in the histograms.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        timer = RequestTimer()
+        token = _current_timer.set(timer)
+        start = perf_counter()
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _current_timer.reset(token)
+            elapsed = perf_counter() - start
+            registry.observe(label() or view.__name__, elapsed)
+        if getattr(settings, 'BYRDIE_SERVER_TIMING', settings.DEBUG) and isinstance(response, HttpResponse):
+            timer.add('total', elapsed)
+            response['Server-Timing'] = timer.header()
+        return response
+    return wrapper
+
+def metrics_view(request):
+    """
+    Serves the latency histograms when `BYRDIE_METRICS = True` is set.
+    """
+    if not getattr(settings, 'BYRDIE_METRICS', False):
+        return HttpResponseNotFound()
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
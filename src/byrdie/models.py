@@ -1,22 +1,58 @@
-from django.db import models
+import uuid
+from django.db import DatabaseError, models
 
-def expose(func):
+def expose(func=None, *, render: bool = False, background: bool = False):
     """
     Decorator to expose a method to the frontend.
+    With `render=True`, calls respond with the re-rendered component and the changed exposed fields.
+    With `background=True`, calls are queued as a Job and respond with its id straight away.
+    """
+    def decorator(func):
+        func._byrdie_exposed = True
+        func._byrdie_render = render
+        func._byrdie_background = background
+        return func
+    if func is None:
+        return decorator
+    return decorator(func)
+
+class VersionConflict(DatabaseError):
+    """
+    Raised when saving a versioned instance that was changed by someone else since it was loaded.
     """
-    func._byrdie_exposed = True
-    return func
 
 class Model(models.Model):
     """
     Base model for Byrdie applications.
+    Set `version_field` to the name of an integer field to enable optimistic locking.
     """
     components = []
     exposed_fields = []
+    version_field = None
 
     class Meta:
         abstract = True
 
+    def get_version(self):
+        if self.version_field:
+            return getattr(self, self._meta.get_field(self.version_field).attname)
+        return None
+
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs):
+        # Versioned saves are one UPDATE ... WHERE pk = %s AND version = %s that also
+        # bumps the version, so concurrent writers cannot overwrite each other.
+        if not self.version_field:
+            return super()._do_update(base_qs, using, pk_val, values, *args, **kwargs)
+        field = self._meta.get_field(self.version_field)
+        expected = getattr(self, field.attname)
+        values = [value for value in values if value[0] is not field] + [(field, None, expected + 1)]
+        updated = super()._do_update(base_qs.filter(**{field.attname: expected}), using, pk_val, values, *args, **kwargs)
+        if updated:
+            setattr(self, field.attname, expected + 1)
+        elif base_qs.filter(pk=pk_val).exists():
+            raise VersionConflict(f"{self._meta.label} {pk_val} was modified since version {expected}.")
+        return updated
+
 
 class Byrdie(Model):
     """
@@ -27,3 +63,33 @@ class Byrdie(Model):
 
     def __str__(self):
         return self.name
+
+
+class Job(Model):
+    """
+    A queued call of a background exposed method, run by `byrdie worker`.
+    Its status, result and error are exposed, so clients can follow it live.
+    """
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(QUEUED, 'Queued'), (RUNNING, 'Running'), (DONE, 'Done'), (FAILED, 'Failed')]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    app_label = models.CharField(max_length=100)
+    model_name = models.CharField(max_length=100)
+    object_pk = models.CharField(max_length=255)
+    method_name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=QUEUED, db_index=True)
+    result = models.JSONField(null=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True)
+    finished_at = models.DateTimeField(null=True)
+
+    exposed_fields = ['status', 'result', 'error']
+
+    class Meta:
+        ordering = ['created_at']
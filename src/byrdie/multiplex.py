@@ -0,0 +1,97 @@
+import copy
+import json
+import logging
+import weakref
+from django.conf import settings
+from django.http import Http404, HttpResponseBadRequest, HttpResponseNotAllowed, QueryDict
+from django.urls import Resolver404, URLResolver
+from django.urls.resolvers import RegexPattern
+from .api import api
+from .negotiation import MSGPACK_TYPES, decode_content, encode_response
+
+logger = logging.getLogger('byrdie.multiplex')
+
+DEFAULT_MAX_REQUESTS = 20
+# Only conditional request headers are taken from each entry; everything else comes from the outer request
+FORWARDED_HEADERS = ('If-None-Match',)
+RETURNED_HEADERS = ('Content-Type', 'ETag', 'Cache-Control', 'Age', 'Location')
+_STRIPPED_META = ('HTTP_ACCEPT_ENCODING', 'HTTP_IF_NONE_MATCH', 'CONTENT_TYPE', 'CONTENT_LENGTH')
+
+_resolvers = weakref.WeakKeyDictionary()
+
+def _resolver(router) -> URLResolver:
+    # Router.urlpatterns is updated in place, so one resolver per router stays current
+    resolver = _resolvers.get(router)
+    if resolver is None:
+        resolver = _resolvers[router] = URLResolver(RegexPattern(r'^/'), router.urlpatterns)
+    return resolver
+
+def _subrequest(request, path: str, query: str, headers: dict):
+    sub = copy.copy(request)
+    # `headers` is a cached property built from META
+    sub.__dict__.pop('headers', None)
+    meta = {key: value for key, value in request.META.items() if key not in _STRIPPED_META}
+    meta.update(REQUEST_METHOD='GET', PATH_INFO=path, QUERY_STRING=query)
+    for name in FORWARDED_HEADERS:
+        if headers.get(name):
+            meta[f"HTTP_{name.upper().replace('-', '_')}"] = headers[name]
+    sub.META = sub.environ = meta
+    sub.method = 'GET'
+    sub.path = sub.path_info = path
+    sub.GET = QueryDict(query)
+    return sub
+
+def _encode(response) -> dict:
+    headers = {name: response[name] for name in RETURNED_HEADERS if response.has_header(name)}
+    content = b''.join(response.streaming_content) if response.streaming else response.content
+    if response.status_code == 304 or not content:
+        body = None
+    elif headers.get('Content-Type', '').split(';')[0] in ('application/json',) + MSGPACK_TYPES:
+        body = decode_content(content, headers['Content-Type'])
+    else:
+        body = content.decode(response.charset or 'utf-8')
+    return {'status': response.status_code, 'headers': headers, 'body': body}
+
+def dispatch(request, entry: dict, router=None) -> dict:
+    """
+    Runs one GET sub-request of a multiplexed call against the router and returns
+    its status, cache headers and decoded body.
+    """
+    path, _, query = str(entry.get('url', '')).partition('?')
+    try:
+        match = _resolver(router or api.router).resolve(path)
+    except Resolver404:
+        return {'status': 404, 'headers': {}, 'body': None}
+    sub = _subrequest(request, path, query, entry.get('headers') or {})
+    sub.resolver_match = match
+    try:
+        response = match.func(sub, *match.args, **match.kwargs)
+    except Http404:
+        return {'status': 404, 'headers': {}, 'body': None}
+    except Exception:
+        logger.exception("Multiplexed request to %s failed", path)
+        return {'status': 500, 'headers': {}, 'body': None}
+    etag = response.get('ETag')
+    if response.status_code == 200 and etag and etag == sub.headers.get('If-None-Match'):
+        response.status_code = 304
+    return _encode(response)
+
+def multiplex_view(request):
+    """
+    Answers several GET route calls in one round trip. The POST body is
+    `{"requests": [{"id": ..., "url": "/api/...", "headers": {...}}]}` and each
+    result comes back under the same id. At most `BYRDIE_MULTIPLEX_MAX` calls per request.
+    """
+    if request.method != 'POST':
+        return HttpResponseNotAllowed(['POST'])
+    try:
+        entries = json.loads(request.body)['requests']
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return HttpResponseBadRequest("Expected a JSON object with a 'requests' list.")
+    if not isinstance(entries, list) or not all(isinstance(entry, dict) for entry in entries):
+        return HttpResponseBadRequest("Expected a JSON object with a 'requests' list.")
+    max_requests = getattr(settings, 'BYRDIE_MULTIPLEX_MAX', DEFAULT_MAX_REQUESTS)
+    if len(entries) > max_requests:
+        return HttpResponseBadRequest(f"At most {max_requests} requests can be multiplexed.")
+    responses = [{'id': entry.get('id')} | dispatch(request, entry) for entry in entries]
+    return encode_response(request, {'responses': responses})
@@ -0,0 +1,79 @@
+import json
+from typing import Any
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import patch_vary_headers
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional
+    msgpack = None
+
+MSGPACK_CONTENT_TYPE = 'application/msgpack'
+MSGPACK_TYPES = (MSGPACK_CONTENT_TYPE, 'application/x-msgpack', 'application/vnd.msgpack')
+_json_encoder = DjangoJSONEncoder()
+
+def _quality(accept: str, media_types: tuple) -> float:
+    best = 0.0
+    for part in accept.split(','):
+        media_type, *params = [piece.strip() for piece in part.split(';')]
+        if media_type.lower() not in media_types:
+            continue
+        quality = 1.0
+        for param in params:
+            if param.startswith('q='):
+                try:
+                    quality = float(param[2:])
+                except ValueError:
+                    quality = 0.0
+        best = max(best, quality)
+    return best
+
+def wants_msgpack(request) -> bool:
+    """
+    True when msgpack is installed and the client prefers MessagePack to JSON.
+    """
+    if msgpack is None:
+        return False
+    accept = request.headers.get('Accept', '')
+    if 'msgpack' not in accept:
+        return False
+    preference = _quality(accept, MSGPACK_TYPES)
+    return preference > 0 and preference >= _quality(accept, ('application/json',))
+
+def packb(data: Any) -> bytes:
+    # Dates, decimals and UUIDs become the same strings JSON responses use
+    return msgpack.packb(data, default=_json_encoder.default, use_bin_type=True)
+
+def encode_response(request, data: Any, status: int = 200, safe: bool = True) -> HttpResponse:
+    """
+    Encodes serialized data as MessagePack or JSON, following the request's Accept header.
+    """
+    if request is not None and wants_msgpack(request):
+        response = HttpResponse(packb(data), content_type=MSGPACK_CONTENT_TYPE, status=status)
+    else:
+        response = JsonResponse(data, safe=safe, status=status)
+    if msgpack is not None:
+        patch_vary_headers(response, ('Accept',))
+    return response
+
+def decode_body(request) -> Any:
+    """
+    Decodes a JSON or MessagePack request body, raising ValueError when it is malformed.
+    """
+    if request.content_type in MSGPACK_TYPES:
+        if msgpack is None:
+            raise ValueError("MessagePack request bodies require the msgpack package.")
+        try:
+            return msgpack.unpackb(request.body, raw=False)
+        except Exception as e:
+            raise ValueError(f"Invalid MessagePack: {e}") from e
+    return json.loads(request.body)
+
+def decode_content(content: bytes, content_type: str) -> Any:
+    """
+    Decodes a response body produced by `encode_response`.
+    """
+    if content_type.split(';')[0].strip() in MSGPACK_TYPES:
+        return msgpack.unpackb(content, raw=False)
+    return json.loads(content)
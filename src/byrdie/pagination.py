@@ -0,0 +1,172 @@
+import base64
+import binascii
+import json
+from typing import Any, List, Optional, Sequence
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q, QuerySet
+
+class InvalidCursor(ValueError):
+    """
+    Raised when a client sends a cursor that cannot be decoded.
+    """
+    pass
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    raw = json.dumps(list(values), cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).rstrip(b'=').decode()
+
+def decode_cursor(cursor: str) -> List[Any]:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        raise InvalidCursor("Invalid pagination cursor.")
+    if not isinstance(values, list):
+        raise InvalidCursor("Invalid pagination cursor.")
+    return values
+
+class Page:
+    """
+    One page of a keyset-paginated collection.
+    """
+    def __init__(self, items: list, next_cursor: Optional[str], next_url: Optional[str]):
+        self.items = items
+        self.next_cursor = next_cursor
+        self.next_url = next_url
+
+    def envelope(self, data: list) -> dict:
+        return {'results': data, 'next': self.next_url, 'cursor': self.next_cursor}
+
+class KeysetPagination:
+    """
+    Keyset (cursor) pagination over a QuerySet.
+    Pages are selected with a WHERE clause on the ordering columns instead of an
+    OFFSET, so every page costs the same regardless of depth. The ordering should
+    be backed by an index; the primary key is always appended as a tie-breaker.
+    """
+    cursor_param = 'cursor'
+    limit_param = 'limit'
+
+    def __init__(self, ordering: Optional[Sequence[str]] = None, page_size: int = 50, max_page_size: int = 500):
+        self.ordering = tuple(ordering) if ordering else None
+        self.page_size = page_size
+        self.max_page_size = max_page_size
+
+    @classmethod
+    def from_option(cls, option: Any) -> Optional['KeysetPagination']:
+        """
+        Builds a paginator from the `paginate=` argument of `route()`/`action()`.
+        Accepts True, a page size, an ordering field name or a KeysetPagination.
+        """
+        if option is None or option is False:
+            return None
+        if isinstance(option, cls):
+            return option
+        if option is True:
+            return cls()
+        if isinstance(option, int):
+            return cls(page_size=option)
+        if isinstance(option, str):
+            return cls(ordering=[option])
+        if isinstance(option, (list, tuple)):
+            return cls(ordering=option)
+        raise TypeError(f"Unsupported paginate option: {option!r}")
+
+    def get_ordering(self, queryset: QuerySet) -> List[str]:
+        ordering = list(self.ordering or queryset.query.order_by or queryset.model._meta.ordering or [])
+        for field in ordering:
+            if not isinstance(field, str):
+                raise TypeError("Keyset pagination only supports ordering by field names.")
+            model_field = _model_field(queryset.model, field.lstrip('-'))
+            # NULLs never match __gt/__lt, so rows with them would silently drop out of every page
+            if model_field is not None and model_field.null:
+                raise TypeError(f"Keyset pagination cannot order by the nullable field '{field.lstrip('-')}'.")
+        if not any(field.lstrip('-') in ('pk', queryset.model._meta.pk.name) for field in ordering):
+            descending = bool(ordering) and ordering[-1].startswith('-')
+            ordering.append('-pk' if descending else 'pk')
+        return ordering
+
+    def get_limit(self, request) -> int:
+        try:
+            limit = int(request.GET.get(self.limit_param, self.page_size))
+        except ValueError:
+            limit = self.page_size
+        return max(1, min(limit, self.max_page_size))
+
+    def paginate(self, request, queryset: Any) -> Page:
+        if not isinstance(queryset, QuerySet):
+            raise TypeError("paginate= requires the view to return a QuerySet.")
+        ordering = self.get_ordering(queryset)
+        queryset = queryset.order_by(*ordering)
+        cursor = request.GET.get(self.cursor_param)
+        if cursor:
+            values = decode_cursor(cursor)
+            if len(values) != len(ordering):
+                raise InvalidCursor("Invalid pagination cursor.")
+            values = [_cursor_value(queryset.model, field.lstrip('-'), value) for field, value in zip(ordering, values)]
+            queryset = queryset.filter(self._after(ordering, values))
+        limit = self.get_limit(request)
+        items = list(queryset[:limit + 1])
+        if len(items) <= limit:
+            return Page(items, None, None)
+        items = items[:limit]
+        next_cursor = encode_cursor([self._value(items[-1], field.lstrip('-')) for field in ordering])
+        query = request.GET.copy()
+        query[self.cursor_param] = next_cursor
+        return Page(items, next_cursor, f"{request.path}?{query.urlencode()}")
+
+    @staticmethod
+    def _after(ordering: List[str], values: List[Any]) -> Q:
+        # (a, b, c) > (x, y, z) expanded into OR-ed prefixes, respecting each column's direction
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            clause = Q(**{f"{name}__{lookup}": values[i]})
+            for prev_field, prev_value in zip(ordering[:i], values[:i]):
+                clause &= Q(**{prev_field.lstrip('-'): prev_value})
+            condition |= clause
+        return condition
+
+    @staticmethod
+    def _value(obj: Any, field: str) -> Any:
+        value = obj
+        for part in field.split('__'):
+            value = getattr(value, part)
+        if isinstance(value, models.Model):
+            value = value.pk
+        return value
+
+def _model_field(model, path: str) -> Optional[models.Field]:
+    """
+    Resolves an ordering path such as `author__name` to its model field, or None
+    for names that are not model fields (annotations).
+    """
+    field = None
+    for part in path.split('__'):
+        if model is None:
+            return None
+        try:
+            field = model._meta.pk if part == 'pk' else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        model = field.related_model if field.is_relation else None
+    # Ordering by a foreign key orders by the related primary key
+    if field is not None and field.is_relation and field.concrete:
+        field = field.target_field
+    return field
+
+def _cursor_value(model, path: str, value: Any) -> Any:
+    if value is None or isinstance(value, (list, dict)):
+        raise InvalidCursor("Invalid pagination cursor.")
+    field = _model_field(model, path)
+    if field is None:
+        return value
+    try:
+        value = field.to_python(value)
+        field.get_prep_value(value)
+    except (ValidationError, TypeError, ValueError):
+        raise InvalidCursor("Invalid pagination cursor.")
+    return value
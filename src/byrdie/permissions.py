@@ -0,0 +1,142 @@
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from functools import wraps
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Set
+from django.conf import settings
+
+DEFAULT_PERMISSION_CACHE_TTL = 30
+DEFAULT_PERMISSION_CACHE_SIZE = 10000
+
+# (user id, permission key) -> (expires, result) in insertion order; the user's full
+# permission set is stored under the key '*'. `_keys_by_user` indexes it for forget_user.
+_results: "OrderedDict[tuple, tuple]" = OrderedDict()
+_keys_by_user: Dict[Any, Set[tuple]] = defaultdict(set)
+_lock = threading.Lock()
+
+def _ttl() -> float:
+    return getattr(settings, 'BYRDIE_PERMISSION_CACHE_TTL', DEFAULT_PERMISSION_CACHE_TTL)
+
+def _user_id(request) -> Optional[Any]:
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated:
+        return None
+    return user.pk
+
+def _request_cache(request) -> dict:
+    cache = getattr(request, '_byrdie_permissions', None)
+    if cache is None:
+        cache = request._byrdie_permissions = {}
+    return cache
+
+def memoize(request, key: Hashable, compute: Callable[[], Any], ttl: Optional[float] = None) -> Any:
+    """
+    Returns the cached result for (user, key), computing it at most once per request
+    and once per `BYRDIE_PERMISSION_CACHE_TTL` seconds across requests.
+    """
+    per_request = _request_cache(request)
+    if key in per_request:
+        return per_request[key]
+    cache_key = (_user_id(request), key)
+    entry = _results.get(cache_key)
+    if entry is not None and entry[0] > time.monotonic():
+        result = entry[1]
+    else:
+        result = compute()
+        _store(cache_key, time.monotonic() + (_ttl() if ttl is None else ttl), result)
+    per_request[key] = result
+    return result
+
+def _discard(cache_key: tuple):
+    del _results[cache_key]
+    keys = _keys_by_user.get(cache_key[0])
+    if keys is not None:
+        keys.discard(cache_key)
+        if not keys:
+            del _keys_by_user[cache_key[0]]
+
+def _store(cache_key: tuple, expires: float, result: Any):
+    """
+    Stores a result, dropping expired entries from the oldest end and keeping at
+    most `BYRDIE_PERMISSION_CACHE_SIZE` entries.
+    """
+    size = getattr(settings, 'BYRDIE_PERMISSION_CACHE_SIZE', DEFAULT_PERMISSION_CACHE_SIZE)
+    now = time.monotonic()
+    with _lock:
+        if cache_key in _results:
+            _discard(cache_key)
+        _results[cache_key] = (expires, result)
+        _keys_by_user[cache_key[0]].add(cache_key)
+        while _results:
+            oldest, (oldest_expires, _) = next(iter(_results.items()))
+            if oldest_expires > now and len(_results) <= size:
+                break
+            _discard(oldest)
+
+def forget_user(user_id):
+    with _lock:
+        for cache_key in list(_keys_by_user.get(user_id, ())):
+            _discard(cache_key)
+
+def forget_all():
+    with _lock:
+        _results.clear()
+        _keys_by_user.clear()
+
+class RequiredPermissions:
+    """
+    The declarative `has_permissions=["app.view_note"]` form: the user needs every
+    listed permission. A user's permission set is loaded once and shared by all routes.
+    """
+    def __init__(self, perms: Iterable[str]):
+        self.perms = frozenset(perms)
+
+    def __call__(self, request) -> bool:
+        user = getattr(request, 'user', None)
+        if user is None or not user.is_active:
+            return False
+        if user.is_superuser:
+            return True
+        granted = memoize(request, '*', lambda: frozenset(user.get_all_permissions()))
+        return self.perms <= granted
+
+    def __repr__(self):
+        return f"RequiredPermissions({sorted(self.perms)!r})"
+
+def cached_permission(key: Optional[Callable] = None, ttl: Optional[float] = None) -> Callable:
+    """
+    Marks a `has_permissions` callable whose result may be reused across requests of
+    the same user. `key(request)` returns what else the result depends on, such as
+    an object id from `request.resolver_match`; by default it depends on the user alone.
+    """
+    def decorator(check: Callable) -> Callable:
+        @wraps(check)
+        def wrapper(request):
+            extra = key(request) if key is not None else None
+            return memoize(request, (check, extra), lambda: check(request), ttl)
+        wrapper._byrdie_cached_permission = True
+        return wrapper
+    return decorator
+
+def compile_permissions(spec: Any) -> Optional[Callable]:
+    """
+    Turns a `has_permissions` argument into a check run by the route wrappers. Permission
+    names become a RequiredPermissions check. Plain callables are memoized per request,
+    since they may depend on more than the user.
+    """
+    if spec is None or spec is False:
+        return None
+    if isinstance(spec, str):
+        return RequiredPermissions([spec])
+    if isinstance(spec, (list, tuple, set, frozenset)):
+        return RequiredPermissions(spec)
+    if not callable(spec):
+        raise TypeError(f"Unsupported has_permissions option: {spec!r}")
+    if getattr(spec, '_byrdie_cached_permission', False):
+        return spec
+    def check(request):
+        per_request = _request_cache(request)
+        if spec not in per_request:
+            per_request[spec] = spec(request)
+        return per_request[spec]
+    return check
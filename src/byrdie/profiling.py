@@ -0,0 +1,268 @@
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from functools import wraps
+from typing import Callable, Dict, List, Optional
+from django.conf import settings
+from django.core import signing
+from django.http import HttpResponse, HttpResponseNotFound, JsonResponse
+
+PROFILE_PARAM = '__profile'
+_TOKEN_SALT = 'byrdie.profiling'
+
+def make_profile_token() -> str:
+    """
+    Returns a signed token that forces profiling of a request when passed as `?__profile=<token>`.
+    """
+    return signing.TimestampSigner(salt=_TOKEN_SALT).sign('profile')
+
+def _valid_token(token: str) -> bool:
+    max_age = getattr(settings, 'BYRDIE_PROFILE_TOKEN_MAX_AGE', 3600)
+    try:
+        return signing.TimestampSigner(salt=_TOKEN_SALT).unsign(token, max_age=max_age) == 'profile'
+    except signing.BadSignature:
+        return False
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+def _stack(frame, limit: int = 128) -> List:
+    frames = []
+    while frame is not None and len(frames) < limit:
+        frames.append(frame)
+        frame = frame.f_back
+    frames.reverse()
+    return frames
+
+def _is_worker_frame(frame) -> bool:
+    return frame.f_code.co_name == '_worker' and frame.f_code.co_filename.endswith(os.path.join('concurrent', 'futures', 'thread.py'))
+
+def _is_pool_worker(frames: List) -> bool:
+    return any(_is_worker_frame(f) for f in frames)
+
+def _worker_executor(frames: List):
+    for f in frames:
+        if _is_worker_frame(f):
+            reference = f.f_locals.get('executor_reference')
+            return reference() if reference is not None else None
+    return None
+
+def _weave_executors(frames: List) -> List:
+    # A sync `with weave()` block runs its tasks from WoveContextManager.__exit__,
+    # on the dedicated executor that the block created for its sync tasks
+    executors = []
+    for f in frames:
+        if f.f_code.co_name == '__exit__' and f.f_code.co_filename.endswith(os.path.join('wove', 'context.py')):
+            executor = getattr(f.f_locals.get('self'), '_executor', None)
+            if executor is not None:
+                executors.append(executor)
+    return executors
+
+def _is_idle(frames: List) -> bool:
+    return bool(frames) and os.path.basename(frames[-1].f_code.co_filename) in ('threading.py', 'queue.py')
+
+class ProfileSession:
+    """
+    Stack samples collected for one request.
+    """
+    def __init__(self, thread_id: int):
+        self.thread_id = thread_id
+        self.samples = Counter()
+
+class StackSampler:
+    """
+    A background thread that samples the stacks of requests being profiled.
+    Besides the request thread it samples the busy thread-pool workers of the
+    request's own wove blocks, which is where wove runs sync `@w.do` tasks.
+    """
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.sessions: Dict[int, ProfileSession] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, session: ProfileSession):
+        with self._lock:
+            self.sessions[id(session)] = session
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='byrdie-profiler', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def stop(self, session: ProfileSession):
+        with self._lock:
+            self.sessions.pop(id(session), None)
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while True:
+            with self._lock:
+                sessions = list(self.sessions.values())
+                if not sessions:
+                    self._wakeup.clear()
+            if not sessions:
+                self._wakeup.wait()
+                continue
+            self.sample(sessions, own_id)
+            time.sleep(self.interval)
+
+    def sample(self, sessions: List[ProfileSession], own_id: Optional[int] = None):
+        stacks = {}
+        workers = {}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            frames = _stack(frame)
+            stacks[thread_id] = frames
+            if _is_pool_worker(frames) and not _is_idle(frames):
+                executor = _worker_executor(frames)
+                if executor is not None:
+                    workers.setdefault(id(executor), []).append(frames)
+        for session in sessions:
+            frames = stacks.get(session.thread_id)
+            if frames is None:
+                continue
+            session.samples[';'.join(['request'] + [_frame_label(f) for f in frames])] += 1
+            # Tasks may open nested weave blocks, whose workers belong to the request too
+            pending = _weave_executors(frames)
+            seen = set()
+            while pending:
+                executor = pending.pop()
+                if id(executor) in seen:
+                    continue
+                seen.add(id(executor))
+                for worker_frames in workers.get(id(executor), ()):
+                    session.samples[';'.join(['worker'] + [_frame_label(f) for f in worker_frames])] += 1
+                    pending.extend(_weave_executors(worker_frames))
+
+sampler = StackSampler()
+
+class ProfileStore:
+    """
+    A bounded on-disk ring buffer of request profiles; the oldest are removed first.
+    """
+    def __init__(self, directory: Optional[str] = None, keep: Optional[int] = None):
+        self._directory = directory
+        self._keep = keep
+
+    @property
+    def directory(self) -> str:
+        return self._directory or getattr(settings, 'BYRDIE_PROFILE_DIR', os.path.join(tempfile.gettempdir(), 'byrdie-profiles'))
+
+    @property
+    def keep(self) -> int:
+        return self._keep or getattr(settings, 'BYRDIE_PROFILE_KEEP', 50)
+
+    def save(self, profile: dict) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        profile_id = f"{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+        tmp_path = os.path.join(self.directory, f".{profile_id}.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, os.path.join(self.directory, f"{profile_id}.json"))
+        for old_id in self.ids()[:-self.keep]:
+            try:
+                os.remove(os.path.join(self.directory, f"{old_id}.json"))
+            except FileNotFoundError:
+                pass
+        return profile_id
+
+    def ids(self) -> List[str]:
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name[:-5] for name in names if name.endswith('.json'))
+
+    def load(self, profile_id: str) -> Optional[dict]:
+        if profile_id not in self.ids():
+            return None
+        with open(os.path.join(self.directory, f"{profile_id}.json")) as f:
+            return json.load(f)
+
+store = ProfileStore()
+
+def collapsed(profile: dict) -> str:
+    """
+    Renders a profile's samples as collapsed stacks, the input format of flame graph tools.
+    """
+    return ''.join(f"{stack} {count}\n" for stack, count in sorted(profile['stacks'].items()))
+
+def _path_without_token(request) -> str:
+    # The token is a credential; keep it out of the stored (and listed) profile
+    query = request.GET.copy()
+    query.pop(PROFILE_PARAM, None)
+    return f"{request.path}?{query.urlencode()}" if query else request.path
+
+def profile_requests(view: Callable, label: Callable[[], str]) -> Callable:
+    """
+    Wraps a Byrdie view so that, with `BYRDIE_PROFILING = True`, requests slower than
+    `BYRDIE_PROFILE_THRESHOLD_MS` or carrying a valid `?__profile` token are sampled
+    and saved to the profile store. Only a `BYRDIE_PROFILE_SAMPLE_RATE` fraction of
+    requests (default all) is watched for the threshold, bounding the overhead.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not getattr(settings, 'BYRDIE_PROFILING', False):
+            return view(request, *args, **kwargs)
+        token = request.GET.get(PROFILE_PARAM)
+        forced = bool(token) and _valid_token(token)
+        threshold_ms = getattr(settings, 'BYRDIE_PROFILE_THRESHOLD_MS', None)
+        if not forced and (threshold_ms is None or random.random() >= getattr(settings, 'BYRDIE_PROFILE_SAMPLE_RATE', 1.0)):
+            return view(request, *args, **kwargs)
+        session = ProfileSession(threading.get_ident())
+        sampler.interval = getattr(settings, 'BYRDIE_PROFILE_INTERVAL_MS', 5) / 1000
+        sampler.start(session)
+        start = time.perf_counter()
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            sampler.stop(session)
+            duration_ms = (time.perf_counter() - start) * 1000
+        if forced or duration_ms >= threshold_ms:
+            profile_id = store.save({
+                'route': label() or view.__name__,
+                'path': _path_without_token(request),
+                'method': request.method,
+                'duration_ms': round(duration_ms, 3),
+                'reason': 'token' if forced else 'threshold',
+                'created': time.time(),
+                'interval_ms': sampler.interval * 1000,
+                'stacks': dict(session.samples),
+            })
+            if isinstance(response, HttpResponse):
+                response['X-Byrdie-Profile'] = profile_id
+        return response
+    return wrapper
+
+def _can_view_profiles(request) -> bool:
+    if not getattr(settings, 'BYRDIE_PROFILING', False):
+        return False
+    user = getattr(request, 'user', None)
+    return settings.DEBUG or bool(user is not None and user.is_staff)
+
+def profiles_view(request, profile_id: Optional[str] = None):
+    """
+    Lists stored profiles, or returns one as collapsed stacks. Available to staff, or to anyone in DEBUG.
+    """
+    if not _can_view_profiles(request):
+        return HttpResponseNotFound()
+    if profile_id is None:
+        index = []
+        for stored_id in reversed(store.ids()):
+            profile = store.load(stored_id)
+            if profile is not None:
+                index.append({key: profile[key] for key in ('route', 'path', 'duration_ms', 'reason', 'created')} | {'id': stored_id})
+        return JsonResponse(index, safe=False)
+    profile = store.load(profile_id)
+    if profile is None:
+        return HttpResponseNotFound()
+    return HttpResponse(collapsed(profile), content_type='text/plain; charset=utf-8')
@@ -0,0 +1,38 @@
+"""
+Pytest plugin that fails tests whose requests exceed a route's `query_budget`.
+Registered through the `pytest11` entry point; enable it in a project without
+installing Byrdie with `-p byrdie.pytest_plugin`.
+"""
+import pytest
+from byrdie import queries
+
+def pytest_addoption(parser):
+    group = parser.getgroup('byrdie')
+    group.addoption(
+        '--byrdie-ignore-query-budgets',
+        action='store_true',
+        default=False,
+        help="Do not fail tests when a Byrdie route goes over its query_budget.",
+    )
+    group.addoption(
+        '--byrdie-fail-on-n-plus-one',
+        action='store_true',
+        default=False,
+        help="Also fail tests when a Byrdie route repeats the same query shape.",
+    )
+
+def pytest_configure(config):
+    if not config.getoption('byrdie_ignore_query_budgets'):
+        queries.force_tracking = True
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    with queries.collect_violations() as violations:
+        result = yield
+    if item.config.getoption('byrdie_ignore_query_budgets'):
+        return result
+    kinds = {'budget', 'n+1'} if item.config.getoption('byrdie_fail_on_n_plus_one') else {'budget'}
+    failures = [v for v in violations if v.kind in kinds]
+    if failures:
+        pytest.fail('\n'.join(v.message for v in failures), pytrace=False)
+    return result
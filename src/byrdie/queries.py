@@ -0,0 +1,144 @@
+import logging
+import re
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter
+from typing import Callable, List, Optional
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from .metrics import current_timer
+
+logger = logging.getLogger('byrdie.queries')
+
+# Set by the pytest plugin so budgets are checked regardless of DEBUG
+force_tracking = False
+
+_current_stats: ContextVar[Optional['QueryStats']] = ContextVar('byrdie_query_stats', default=None)
+_whitespace_re = re.compile(r'\s+')
+_in_list_re = re.compile(r'IN \((?:%s, )*%s\)')
+_number_re = re.compile(r'\b\d+\b')
+
+class Violation:
+    """
+    A route that went over its query budget or repeated a query shape.
+    """
+    def __init__(self, route: str, kind: str, message: str):
+        self.route = route
+        self.kind = kind
+        self.message = message
+
+    def __repr__(self):
+        return f"Violation({self.route!r}, {self.kind!r})"
+
+# Violations are only kept while a collector is installed; the innermost one receives them
+_collectors: List[List[Violation]] = []
+_violations_lock = threading.Lock()
+
+@contextmanager
+def collect_violations():
+    """
+    Collects the violations reported until the block exits into the yielded list.
+    The pytest plugin installs one for each test.
+    """
+    collected: List[Violation] = []
+    with _violations_lock:
+        _collectors.append(collected)
+    try:
+        yield collected
+    finally:
+        with _violations_lock:
+            _collectors.remove(collected)
+
+def query_shape(sql: str) -> str:
+    """
+    Normalizes SQL so that queries differing only in parameters compare equal.
+    """
+    sql = _whitespace_re.sub(' ', sql).strip()
+    sql = _in_list_re.sub('IN (...)', sql)
+    return _number_re.sub('N', sql)
+
+class QueryStats:
+    """
+    Counts the queries run while handling one request, including those in wove worker threads.
+    """
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes = Counter()
+        self._lock = threading.Lock()
+
+    def record(self, sql: str, seconds: float):
+        shape = query_shape(sql)
+        with self._lock:
+            self.count += 1
+            self.duration += seconds
+            self.shapes[shape] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        return [(shape, count) for shape, count in self.shapes.most_common() if count >= threshold]
+
+def _dispatch(execute, sql, params, many, context):
+    # Installed once per connection; forwards to whichever request is being tracked
+    # in the current context (wove worker threads inherit it).
+    stats = _current_stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    start = perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.record(sql, perf_counter() - start)
+
+def _install(connection, **kwargs):
+    if _dispatch not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_dispatch)
+
+connection_created.connect(_install)
+
+def tracking_enabled() -> bool:
+    enabled = getattr(settings, 'BYRDIE_QUERY_TRACKING', None)
+    if enabled is None:
+        return force_tracking or settings.DEBUG
+    return enabled
+
+def _report(route: str, kind: str, message: str):
+    logger.warning(message)
+    with _violations_lock:
+        if _collectors:
+            _collectors[-1].append(Violation(route, kind, message))
+
+def track_queries(view: Callable, label: Callable[[], str], query_budget: Optional[int] = None) -> Callable:
+    """
+    Wraps a Byrdie view so its queries are counted and timed when tracking is enabled.
+    Warns when the route exceeds `query_budget` or repeats a query shape (a likely N+1).
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not tracking_enabled():
+            return view(request, *args, **kwargs)
+        for connection in connections.all(initialized_only=True):
+            _install(connection)
+        stats = QueryStats()
+        token = _current_stats.set(stats)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _current_stats.reset(token)
+        timer = current_timer()
+        if timer is not None:
+            timer.add('db', stats.duration)
+        route = label() or view.__name__
+        if query_budget is not None and stats.count > query_budget:
+            _report(route, 'budget', f"{route} ran {stats.count} queries, over its budget of {query_budget} ({stats.duration * 1000:.1f}ms in the database).")
+        threshold = getattr(settings, 'BYRDIE_N_PLUS_ONE_THRESHOLD', 5)
+        for shape, count in stats.repeated(threshold):
+            _report(route, 'n+1', f"{route} ran the same query {count} times, possible N+1: {shape}")
+        if isinstance(response, HttpResponse):
+            response['X-Byrdie-Queries'] = str(stats.count)
+        return response
+    return wrapper
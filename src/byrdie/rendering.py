@@ -17,6 +17,8 @@ def render_component(instance: models.Model, variant: str = None) -> str:
     else:
         template_name = f'components/{component_name}.html'
 
+    from .live import subscription_token
+
     try:
         # Pass the instance and variant to the template context
         context = {
@@ -33,11 +35,13 @@ def render_component(instance: models.Model, variant: str = None) -> str:
             '_meta': {
                 'app_label': instance._meta.app_label,
                 'model_name': instance._meta.model_name.lower(),
+                'variant': variant,
+                'live': subscription_token(instance),
             }
         }
-        if hasattr(instance, 'exposed_fields'):
-            for field_name in instance.exposed_fields:
-                exposed_data[field_name] = getattr(instance, field_name)
+        exposed_data.update(exposed_state(instance))
+        if getattr(instance, 'version_field', None):
+            exposed_data['_meta']['version_field'] = instance.version_field
 
         exposed_methods = []
         for name in dir(instance):
@@ -64,3 +68,17 @@ def render_component(instance: models.Model, variant: str = None) -> str:
 
     except TemplateDoesNotExist:
         return mark_safe(f"<!-- Component template not found: {template_name} -->")
+
+def exposed_state(instance: models.Model) -> dict:
+    """
+    Returns the current values of the instance's exposed fields.
+    """
+    state = {field_name: getattr(instance, field_name) for field_name in getattr(instance, 'exposed_fields', [])}
+    # Clients send the version back with each call for optimistic locking
+    version_field = getattr(instance, 'version_field', None)
+    if version_field:
+        state[version_field] = instance.get_version()
+    return state
+
+def state_diff(before: dict, after: dict) -> dict:
+    return {key: value for key, value in after.items() if key not in before or before[key] != value}
@@ -0,0 +1,108 @@
+import contextvars
+import time
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Optional
+from django.conf import settings
+from django.http import HttpResponse
+
+PIN_COOKIE = 'byrdie_primary'
+DEFAULT_PIN_SECONDS = 5
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class ReadState:
+    """
+    Where reads go for the current request. The object is shared by the wove
+    worker threads of the request, so a write in any task sends later reads to the primary.
+    """
+    __slots__ = ('alias', 'wrote')
+
+    def __init__(self, alias: Optional[str]):
+        self.alias = alias
+        self.wrote = False
+
+_state: contextvars.ContextVar[Optional[ReadState]] = contextvars.ContextVar('byrdie_read_state', default=None)
+
+# Users and sessions are always read from the primary, so a login or password
+# change that has not replicated yet cannot yield an anonymous or stale user
+PRIMARY_APP_LABELS = ('auth', 'sessions')
+
+def _primary_only(model) -> bool:
+    return model._meta.app_label in PRIMARY_APP_LABELS or model._meta.label == settings.AUTH_USER_MODEL
+
+class ReplicaRouter:
+    """
+    A database router that sends reads inside `use_replica()` to the replica alias
+    and everything else to the default database. Add it to `DATABASE_ROUTERS`.
+    """
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if state is None or state.wrote or _primary_only(model):
+            return None
+        return state.alias
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        return None
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        return True
+
+@contextmanager
+def use_replica(alias: Optional[str]):
+    token = _state.set(ReadState(alias) if alias else None)
+    try:
+        yield
+    finally:
+        _state.reset(token)
+
+def replica_alias() -> Optional[str]:
+    return getattr(settings, 'BYRDIE_READ_REPLICA', None)
+
+def _pinned(request) -> bool:
+    try:
+        return float(request.COOKIES.get(PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def _pin(response):
+    # Reads go to the primary for a short while after a write, so users see their own changes
+    seconds = getattr(settings, 'BYRDIE_REPLICA_PIN_SECONDS', DEFAULT_PIN_SECONDS)
+    response.set_cookie(PIN_COOKIE, str(time.time() + seconds), max_age=seconds, httponly=True, samesite='Lax')
+
+def _session_changed(request) -> bool:
+    # A modified session gets a new cookie, as after a login or logout
+    session = getattr(request, 'session', None)
+    return session is not None and session.modified
+
+def route_reads(view: Callable) -> Callable:
+    """
+    Wraps a view so that, with `BYRDIE_READ_REPLICA` set, reads of safe requests go to
+    the replica unless the client wrote recently. Unsafe requests and requests that
+    change the session pin the client to the primary.
+    """
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        alias = replica_alias()
+        if alias is None:
+            return view(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS:
+            response = view(request, *args, **kwargs)
+            if isinstance(response, HttpResponse):
+                _pin(response)
+            return response
+        if _pinned(request):
+            return view(request, *args, **kwargs)
+        state = ReadState(alias)
+        token = _state.set(state)
+        try:
+            response = view(request, *args, **kwargs)
+        finally:
+            _state.reset(token)
+        if (state.wrote or _session_changed(request)) and isinstance(response, HttpResponse):
+            _pin(response)
+        return response
+    return wrapper
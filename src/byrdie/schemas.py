@@ -1,4 +1,14 @@
-from pydantic import BaseModel as PydanticBaseModel, ConfigDict
+import base64
+import threading
+from array import array
+from collections import OrderedDict, namedtuple
+from typing import Annotated, Any, List, Iterable, Optional, Tuple, get_origin, get_args
+from django.conf import settings
+from django.db.models import NOT_PROVIDED, QuerySet
+from django.db.models.query import ModelIterable
+from pydantic import AfterValidator, AliasChoices, BaseModel as PydanticBaseModel, BeforeValidator, ConfigDict, Field, PlainSerializer, TypeAdapter, ValidationInfo
+from pydantic._internal._model_construction import ModelMetaclass
+from byrdie.utils import FIELD_TYPE_MAPPING, NON_NEGATIVE_FIELD_TYPES
 
 class BaseModel(PydanticBaseModel):
     """
@@ -8,12 +18,98 @@ class BaseModel(PydanticBaseModel):
         from_attributes=True,
     )
 
-from pydantic._internal._model_construction import ModelMetaclass
-from byrdie.utils import FIELD_TYPE_MAPPING
+_EMPTY_VALUES = {str: '', bytes: b''}
 
+# Validation context for request payloads. Choices and max_length are only enforced
+# on input, so rows stored before a choice was removed or a column was shortened
+# (which SQLite does not enforce) can still be serialized.
+INPUT_CONTEXT = {'byrdie': 'input'}
 
-from pydantic._internal._model_construction import ModelMetaclass
-from byrdie.utils import FIELD_TYPE_MAPPING
+def _binary_input(value):
+    # PostgreSQL returns memoryview for BinaryField; JSON payloads carry base64 text
+    if isinstance(value, memoryview):
+        return value.tobytes()
+    if isinstance(value, str):
+        return base64.b64decode(value, validate=True)
+    return value
+
+def _binary_output(value: bytes) -> str:
+    return base64.b64encode(value).decode('ascii')
+
+Binary = Annotated[bytes, BeforeValidator(_binary_input), PlainSerializer(_binary_output, return_type=str)]
+
+def _input_validator(check) -> AfterValidator:
+    def validate(value, info: ValidationInfo):
+        if info.context == INPUT_CONTEXT:
+            check(value)
+        return value
+    return AfterValidator(validate)
+
+def _choices_validator(choices: list) -> AfterValidator:
+    allowed = frozenset(choices)
+    def check(value):
+        if value not in allowed:
+            raise ValueError(f"{value!r} is not one of {sorted(map(str, allowed))}")
+    return _input_validator(check)
+
+def _max_length_validator(max_length: int) -> AfterValidator:
+    def check(value):
+        if len(value) > max_length:
+            raise ValueError(f"must be at most {max_length} long, got {len(value)}")
+    return _input_validator(check)
+
+def field_definition(django_field) -> Tuple[type, Any, Any]:
+    """
+    Maps a Django model field to (python type, constrained annotation, pydantic default),
+    where the default is a FieldInfo or `...` for required fields.
+    max_digits/positive become constraints, max_length and choices are checked on
+    input only (see INPUT_CONTEXT), binary data is base64 text, null fields are Optional and
+    blank or defaulted fields are not required.
+    """
+    field_type = django_field.get_internal_type()
+    if django_field.is_relation and django_field.concrete:
+        # Foreign keys expose the related primary key, read from the `<name>_id` column
+        python_type = FIELD_TYPE_MAPPING.get(django_field.target_field.get_internal_type(), str)
+    else:
+        python_type = FIELD_TYPE_MAPPING.get(field_type, str)
+
+    constraints = {}
+    if field_type in NON_NEGATIVE_FIELD_TYPES:
+        constraints['ge'] = 0
+    if field_type == 'DecimalField':
+        constraints.update(max_digits=django_field.max_digits, decimal_places=django_field.decimal_places)
+
+    metadata = []
+    if constraints:
+        metadata.append(Field(**constraints))
+    max_length = getattr(django_field, 'max_length', None) if python_type in (str, bytes) else None
+    if max_length:
+        if python_type is str:
+            metadata.append(Field(json_schema_extra={'maxLength': max_length}))
+        metadata.append(_max_length_validator(max_length))
+    choices = [value for value, _ in django_field.flatchoices] if django_field.choices else []
+    if choices:
+        if django_field.blank and '' not in choices and python_type is str:
+            choices.append('')
+        metadata += [Field(json_schema_extra={'enum': choices}), _choices_validator(choices)]
+    base = Binary if python_type is bytes else python_type
+    annotation = Annotated[(base, *metadata)] if metadata else base
+
+    field_kwargs = {}
+    if django_field.is_relation and django_field.concrete:
+        field_kwargs['validation_alias'] = AliasChoices(django_field.attname, django_field.name)
+    if django_field.null:
+        field_kwargs['default'] = None
+    elif django_field.default is not NOT_PROVIDED:
+        if callable(django_field.default):
+            field_kwargs['default_factory'] = django_field.default
+        else:
+            field_kwargs['default'] = django_field.default
+    elif django_field.blank and python_type in _EMPTY_VALUES:
+        field_kwargs['default'] = _EMPTY_VALUES[python_type]
+    if django_field.null:
+        annotation = Optional[annotation]
+    return python_type, annotation, Field(**field_kwargs) if field_kwargs else ...
 
 class Schema(BaseModel):
     """
@@ -21,6 +117,15 @@ class Schema(BaseModel):
     """
     pass
 
+def has_decorators(schema) -> bool:
+    """
+    True when a pydantic model declares validators, serializers or computed fields.
+    """
+    decorators = schema.__pydantic_decorators__
+    return any((decorators.validators, decorators.field_validators, decorators.root_validators,
+                decorators.field_serializers, decorators.model_serializers,
+                decorators.model_validators, decorators.computed_fields))
+
 class ModelSchemaBase(ModelMetaclass):
     def __new__(cls, name, bases, attrs, **kwargs):
         meta = attrs.get('Meta')
@@ -30,17 +135,23 @@ class ModelSchemaBase(ModelMetaclass):
             fields = meta.fields
 
             pydantic_fields = {}
+            columns = {}
             for field_name in fields:
                 django_field = model._meta.get_field(field_name)
-                field_type = django_field.get_internal_type()
-                python_type = FIELD_TYPE_MAPPING.get(field_type, str)
-                pydantic_fields[field_name] = python_type
+                python_type, annotation, default = field_definition(django_field)
+                pydantic_fields[field_name] = (annotation, default)
+                if django_field.concrete and not django_field.many_to_many:
+                    columns[field_name] = Column(field_name, django_field.attname, python_type, annotation, django_field.null)
+            # Only plain column-backed schemas can use the columnar batch path
+            attrs['__byrdie_columns__'] = columns if len(columns) == len(fields) else None
 
             if '__annotations__' not in attrs:
                 attrs['__annotations__'] = {}
 
-            for field_name, python_type in pydantic_fields.items():
-                attrs['__annotations__'][field_name] = python_type
+            for field_name, (annotation, default) in pydantic_fields.items():
+                attrs['__annotations__'][field_name] = annotation
+                if default is not ... and field_name not in attrs:
+                    attrs[field_name] = default
 
         if not any(issubclass(b, Schema) for b in bases):
             bases = (Schema,) + bases
@@ -54,3 +165,156 @@ class ModelSchema(Schema, metaclass=ModelSchemaBase):
     """
     class Meta:
         abstract = True
+
+    @classmethod
+    def supports_batch(cls) -> bool:
+        """
+        True when every field maps to a model column and the schema has no validators,
+        so `batch()` produces exactly what per-row validation would.
+        """
+        columns = getattr(cls, '__byrdie_columns__', None)
+        if not columns or set(cls.model_fields) != set(columns):
+            return False
+        return not has_decorators(cls)
+
+    @classmethod
+    def batch(cls, source) -> 'ColumnBatch':
+        """
+        Validates many rows into a ColumnBatch: one coerced array per field instead of one
+        model object per row. Accepts a QuerySet (read with values_list), model instances or dicts.
+        """
+        if not cls.supports_batch():
+            raise TypeError(f"{cls.__name__} has fields or validators that need per-row validation.")
+        columns = cls.__byrdie_columns__
+        names = list(columns)
+        if isinstance(source, QuerySet) and source._iterable_class is ModelIterable:
+            rows = source.values_list(*(columns[name].attname for name in names))
+            raw = [list(values) for values in zip(*rows)] or [[] for _ in names]
+        else:
+            items = source if isinstance(source, list) else list(source)
+            if items and isinstance(items[0], dict):
+                raw = [[item[name] for item in items] for name in names]
+            else:
+                raw = [[getattr(item, columns[name].attname) for item in items] for name in names]
+        return ColumnBatch(cls, {name: columns[name].coerce(values) for name, values in zip(names, raw)})
+
+
+class Column:
+    """
+    A ModelSchema field backed by a model column, with list-at-a-time coercion.
+    Non-null integer and float columns are stored in compact arrays.
+    """
+    __slots__ = ('name', 'attname', 'python_type', 'null', '_adapter', '_serialize')
+
+    def __init__(self, name: str, attname: str, python_type: type, annotation, null: bool):
+        self.name = name
+        self.attname = attname
+        self.python_type = python_type
+        self.null = null
+        # Built with the schema so the first batch() call does not pay for it
+        self._adapter = TypeAdapter(List[annotation])
+        # Binary columns are turned into base64 text, like per-row model_dump()
+        self._serialize = python_type is bytes
+
+    def coerce(self, values: list):
+        values = self._adapter.validate_python(values)
+        if self._serialize:
+            values = self._adapter.dump_python(values)
+        typecode = None if self.null else _ARRAY_TYPECODES.get(self.python_type)
+        if typecode is not None:
+            try:
+                return array(typecode, values)
+            except OverflowError:
+                pass
+        return values
+
+_ARRAY_TYPECODES = {int: 'q', float: 'd'}
+
+
+class ColumnBatch:
+    """
+    Rows of a ModelSchema stored column by column. Iterating yields lightweight
+    named tuples; `to_dicts()` and `to_columns()` give serializable output.
+    """
+    __slots__ = ('schema', 'columns', '_row_type')
+
+    def __init__(self, schema: type, columns: dict):
+        self.schema = schema
+        self.columns = columns
+        self._row_type = _row_type(schema, tuple(columns))
+
+    def __len__(self) -> int:
+        return len(next(iter(self.columns.values()), ()))
+
+    def __iter__(self):
+        return map(self._row_type._make, zip(*self.columns.values()))
+
+    def __getitem__(self, index: int):
+        return self._row_type._make(column[index] for column in self.columns.values())
+
+    def column(self, name: str):
+        return self.columns[name]
+
+    def to_dicts(self) -> list:
+        names = tuple(self.columns)
+        return [dict(zip(names, values)) for values in zip(*self.columns.values())]
+
+    def to_columns(self) -> dict:
+        return {name: list(values) if isinstance(values, array) else values for name, values in self.columns.items()}
+
+_row_types = {}
+
+def _row_type(schema: type, names: tuple):
+    key = (schema, names)
+    row_type = _row_types.get(key)
+    if row_type is None:
+        row_type = _row_types[key] = namedtuple(f"{schema.__name__}Row", names)
+    return row_type
+
+
+DEFAULT_MAX_PROJECTIONS = 256
+
+# (schema, field set) -> projection, least recently used first
+_projections = OrderedDict()
+_projections_lock = threading.Lock()
+
+def project_schema(schema, fields: Iterable[str]):
+    """
+    Returns a schema narrowed to `fields`, for a schema class or `List[schema]`.
+    Projections keep the schema's model_config and are cached, at most
+    `BYRDIE_MAX_PROJECTIONS` of them. Schemas with validators, serializers or
+    computed fields are returned unchanged, since a projection would drop them.
+    """
+    if get_origin(schema) in (list, List):
+        args = get_args(schema)
+        if not args:
+            return schema
+        return List[project_schema(args[0], fields)]
+    if not (isinstance(schema, type) and issubclass(schema, PydanticBaseModel)):
+        return schema
+    key = (schema, frozenset(fields))
+    unknown = sorted(key[1] - set(schema.model_fields))
+    if unknown:
+        raise ValueError(f"Unknown fields for {schema.__name__}: {', '.join(unknown)}")
+    if has_decorators(schema):
+        return schema
+    with _projections_lock:
+        projection = _projections.get(key)
+        if projection is not None:
+            _projections.move_to_end(key)
+            return projection
+    names = [name for name in schema.model_fields if name in key[1]]
+    namespace = {
+        '__module__': schema.__module__,
+        '__annotations__': {name: schema.model_fields[name].annotation for name in names},
+        'model_config': schema.model_config,
+        **{name: schema.model_fields[name] for name in names},
+    }
+    # Byrdie schemas keep their base so the projection is still treated as a Byrdie schema
+    base = BaseModel if issubclass(schema, BaseModel) else PydanticBaseModel
+    projection = type(base)(f"{schema.__name__}Projection", (base,), namespace)
+    with _projections_lock:
+        _projections[key] = projection
+        while len(_projections) > getattr(settings, 'BYRDIE_MAX_PROJECTIONS', DEFAULT_MAX_PROJECTIONS):
+            _projections.popitem(last=False)
+    return projection
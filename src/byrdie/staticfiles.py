@@ -0,0 +1,87 @@
+import mimetypes
+import os
+import re
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.http import FileResponse, Http404
+from django.utils._os import safe_join
+from .compression import DEFAULT_MIN_SIZE, accepted_encodings, brotli, compress
+
+COMPRESSIBLE_EXTENSIONS = ('.js', '.css', '.html', '.json', '.svg', '.txt', '.map', '.xml')
+FAR_FUTURE = 'public, max-age=31536000, immutable'
+# ManifestStaticFilesStorage names files like byrdie.3f2a9c1b7e4d.js
+_hashed_name_re = re.compile(r'\.[0-9a-f]{12}\.[^./]+$')
+_ENCODING_SUFFIXES = (('br', '.br'), ('gzip', '.gz'))
+
+def precompress_file(path: str, min_size: int = DEFAULT_MIN_SIZE) -> list:
+    """
+    Writes .gz (and .br when brotli is installed) siblings of a static file.
+    Returns the paths written.
+    """
+    if not path.endswith(COMPRESSIBLE_EXTENSIONS):
+        return []
+    with open(path, 'rb') as f:
+        data = f.read()
+    if len(data) < min_size:
+        return []
+    written = []
+    for encoding, suffix in _ENCODING_SUFFIXES:
+        if encoding == 'br' and brotli is None:
+            continue
+        compressed = compress(data, encoding)
+        if len(compressed) < len(data):
+            with open(path + suffix, 'wb') as f:
+                f.write(compressed)
+            written.append(path + suffix)
+    return written
+
+def precompress_directory(root: str) -> list:
+    written = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            written.extend(precompress_file(os.path.join(directory, name)))
+    return written
+
+class PrecompressedManifestStorage(ManifestStaticFilesStorage):
+    """
+    Fingerprints static files like ManifestStaticFilesStorage and writes
+    precompressed variants of every collected file.
+    """
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if not dry_run:
+            precompress_directory(self.location)
+
+def serve_static(request, path):
+    """
+    Serves a collected static file from STATIC_ROOT, picking a precompressed variant
+    the client accepts. Fingerprinted files are cached forever by browsers.
+    """
+    try:
+        full_path = safe_join(settings.STATIC_ROOT, path)
+    except ValueError:
+        raise Http404("Invalid static path.")
+    if not os.path.isfile(full_path):
+        raise Http404("Static file not found.")
+    content_type, _ = mimetypes.guess_type(full_path)
+    accepted = accepted_encodings(request)
+    serve_path, encoding = full_path, None
+    for candidate, suffix in _ENCODING_SUFFIXES:
+        if candidate in accepted and os.path.isfile(full_path + suffix):
+            serve_path, encoding = full_path + suffix, candidate
+            break
+    response = FileResponse(open(serve_path, 'rb'), content_type=content_type or 'application/octet-stream')
+    if encoding:
+        response['Content-Encoding'] = encoding
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = FAR_FUTURE if _hashed_name_re.search(path) else 'no-cache'
+    return response
+
+def build_static(verbosity: int = 1) -> list:
+    """
+    Collects, fingerprints and precompresses static files into STATIC_ROOT.
+    """
+    from django.core.management import call_command
+    call_command('collectstatic', interactive=False, verbosity=verbosity)
+    # Storages other than PrecompressedManifestStorage do not compress on their own
+    return precompress_directory(settings.STATIC_ROOT)
@@ -77,22 +77,23 @@ def byrdie(parser, token):
     parser.delete_first_token()
     return ByrdieNode(nodelist)
 
-import json
+from django.urls import reverse, NoReverseMatch
 from byrdie.api import api
 
 @register.simple_tag
-def byrdie_api_routes():
+def byrdie_routes_url():
     """
-    Outputs a script tag with a JSON object of the API routes.
+    Returns the content-hashed URL of the API route manifest script.
     """
-    api_routes = {}
-    for path, view in api.router.routes.items():
-        if path.startswith('/api'):
-            original_view = view
-            while hasattr(original_view, '__wrapped__'):
-                original_view = original_view.__wrapped__
-
-            js_name = original_view.__name__.replace('__', '.')
-            api_routes[js_name] = path
+    _, digest = api.router.manifest()
+    try:
+        return reverse('byrdie-routes', args=[digest])
+    except NoReverseMatch:
+        return f"/byrdie/routes.{digest}.js"
 
-    return mark_safe(f'<script>window.byrdie_routes = {json.dumps(api_routes)};</script>')
+@register.simple_tag
+def byrdie_api_routes():
+    """
+    Outputs a script tag that loads the API route manifest.
+    """
+    return mark_safe(f'<script src="{byrdie_routes_url()}"></script>')
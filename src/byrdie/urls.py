@@ -1,8 +1,31 @@
-from django.urls import path
+import re
+from django.conf import settings
+from django.urls import path, re_path
 from .views import call_exposed_method
 from .auth import login
+from .metrics import metrics_view
+from .profiling import profiles_view
+from .staticfiles import serve_static
+from .api import route_manifest
+from .multiplex import multiplex_view
+from .live import live_view
+from .jobs import job_view
+from .replicas import route_reads
 
 urlpatterns = [
-    path('byrdie/call/<str:app_label>/<str:model_name>/<int:pk>/<str:method_name>/', call_exposed_method, name='byrdie-call'),
-    path('login/', login, name='login'),
+    path('byrdie/call/<str:app_label>/<str:model_name>/<int:pk>/<str:method_name>/', route_reads(call_exposed_method), name='byrdie-call'),
+    path('login/', route_reads(login), name='login'),
+    path('byrdie/metrics', metrics_view, name='byrdie-metrics'),
+    path('byrdie/profiles', profiles_view, name='byrdie-profiles'),
+    path('byrdie/profiles/<str:profile_id>', profiles_view, name='byrdie-profile'),
+    path('byrdie/routes.<str:digest>.js', route_manifest, name='byrdie-routes'),
+    path('byrdie/multiplex', multiplex_view, name='byrdie-multiplex'),
+    path('byrdie/live', live_view, name='byrdie-live'),
+    path('byrdie/jobs/<uuid:job_id>', job_view, name='byrdie-job'),
 ]
+
+# Serve collected, precompressed static files when STATIC_ROOT is set and the
+# static URL is local. In DEBUG, runserver's staticfiles handler takes precedence.
+_static_prefix = getattr(settings, 'STATIC_URL', None) or ''
+if getattr(settings, 'STATIC_ROOT', None) and _static_prefix.startswith('/'):
+    urlpatterns.append(re_path(rf"^{re.escape(_static_prefix.lstrip('/'))}(?P<path>.*)$", serve_static, name='byrdie-static'))
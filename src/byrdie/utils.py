@@ -2,26 +2,48 @@ import ast
 import inspect
 import sys
 import datetime
+import decimal
+import uuid
+from typing import Any
 from django.apps import apps
 
 # A mapping from Django field types to Python types for Pydantic
 FIELD_TYPE_MAPPING = {
     'AutoField': int,
     'BigAutoField': int,
-    'CharField': str,
+    'SmallAutoField': int,
     'IntegerField': int,
+    'BigIntegerField': int,
+    'SmallIntegerField': int,
     'PositiveIntegerField': int,
+    'PositiveBigIntegerField': int,
+    'PositiveSmallIntegerField': int,
     'FloatField': float,
+    'DecimalField': decimal.Decimal,
     'BooleanField': bool,
-    'DateField': datetime.date,
-    'DateTimeField': datetime.datetime,
+    'NullBooleanField': bool,
+    'CharField': str,
+    'TextField': str,
     'EmailField': str,
     'URLField': str,
-    'TextField': str,
+    'SlugField': str,
+    'FilePathField': str,
+    'GenericIPAddressField': str,
+    'IPAddressField': str,
+    'UUIDField': uuid.UUID,
+    'DateField': datetime.date,
+    'DateTimeField': datetime.datetime,
+    'TimeField': datetime.time,
+    'DurationField': datetime.timedelta,
+    'BinaryField': bytes,
+    'JSONField': Any,
     'ForeignKey': int,  # By default, we'll expose the foreign key ID
     'OneToOneField': int,
 }
 
+# Field types whose values can never be negative
+NON_NEGATIVE_FIELD_TYPES = {'PositiveIntegerField', 'PositiveBigIntegerField', 'PositiveSmallIntegerField'}
+
 def parse_imports(app_path):
     """
     Parse the app.py file to extract project-specific import module names.
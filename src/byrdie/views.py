@@ -1,6 +1,11 @@
-import json
 from django.apps import apps
-from django.http import JsonResponse, HttpResponseBadRequest, HttpResponseNotFound, HttpResponseForbidden
+from django.db import transaction
+from django.http import HttpResponseBadRequest, HttpResponseNotFound, HttpResponseForbidden
+from .jobs import enqueue
+from .live import subscription_token
+from .models import VersionConflict
+from .negotiation import decode_body, encode_response
+from .rendering import exposed_state, render_component, state_diff
 
 def call_exposed_method(request, app_label, model_name, pk, method_name):
     if request.method != 'POST':
@@ -25,14 +30,54 @@ def call_exposed_method(request, app_label, model_name, pk, method_name):
         return HttpResponseForbidden(f"Method {method_name} is not exposed.")
 
     try:
-        kwargs = json.loads(request.body) if request.body else {}
-    except json.JSONDecodeError:
+        kwargs = decode_body(request) if request.body else {}
+    except ValueError:
         return HttpResponseBadRequest("Invalid JSON in request body.")
 
+    if getattr(method, '_byrdie_background', False):
+        job = enqueue(instance, method_name, kwargs)
+        return encode_response(request, {'job': str(job.pk), 'status': job.status, 'live': subscription_token(job)}, status=202)
+
+    versioned = bool(getattr(instance, 'version_field', None))
+    if versioned and request.headers.get('X-Byrdie-Version'):
+        # Reject calls made against state the client has not seen yet
+        try:
+            client_version = int(request.headers['X-Byrdie-Version'])
+        except ValueError:
+            return HttpResponseBadRequest("Invalid X-Byrdie-Version header.")
+        if client_version != instance.get_version():
+            return _conflict(request, instance)
+
+    render = getattr(method, '_byrdie_render', False)
+    before = exposed_state(instance) if render else None
+
     try:
-        result = method(**kwargs)
+        if versioned:
+            # A conflict rolls back everything the method wrote
+            with transaction.atomic():
+                result = method(**kwargs)
+        else:
+            result = method(**kwargs)
+    except VersionConflict:
+        return _conflict(request, instance)
     except Exception as e:
         # It's good practice to log the exception here.
         return HttpResponseBadRequest(f"Error calling method {method_name}: {e}")
 
-    return JsonResponse(result)
+    if render:
+        # The component's variant comes from the page that rendered it
+        variant = request.headers.get('X-Byrdie-Variant') or None
+        response = encode_response(request, {
+            'result': result,
+            'html': render_component(instance, variant=variant),
+            'state': state_diff(before, exposed_state(instance)),
+        })
+    else:
+        response = encode_response(request, result)
+    if versioned:
+        response['X-Byrdie-Version'] = str(instance.get_version())
+    return response
+
+def _conflict(request, instance):
+    fresh = type(instance).objects.get(pk=instance.pk)
+    return encode_response(request, {'error': 'conflict', 'state': exposed_state(fresh)}, status=409)
@@ -0,0 +1,130 @@
+import os
+import time
+from contextlib import contextmanager
+from typing import List, get_args, get_origin
+from django.conf import settings
+from django.template import TemplateDoesNotExist, TemplateSyntaxError, engines
+from django.template.loader import get_template
+from django.urls import get_resolver
+from .api import api, _declared_schema
+from .schemas import BaseModel, ModelSchema
+
+class WarmupReport:
+    """
+    What `warm_up()` preloaded: one (stage, count, seconds) entry per stage, plus
+    anything that failed to load, which would otherwise fail on its first request.
+    """
+    def __init__(self):
+        self.stages: List[tuple] = []
+        self.errors: List[str] = []
+
+    @contextmanager
+    def stage(self, name: str):
+        warmed = []
+        start = time.perf_counter()
+        yield warmed
+        self.stages.append((name, len(warmed), time.perf_counter() - start))
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(seconds for _, _, seconds in self.stages)
+
+    def __str__(self):
+        lines = [f"Warmed up in {self.total_seconds * 1000:.1f} ms:"]
+        lines += [f"  {name:<12} {count:>5}  {seconds * 1000:8.1f} ms" for name, count, seconds in self.stages]
+        lines += [f"  error: {error}" for error in self.errors]
+        return "\n".join(lines)
+
+def _schemas_in(annotation) -> list:
+    if get_origin(annotation) in (list, List):
+        return [schema for arg in get_args(annotation) for schema in _schemas_in(arg)]
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return [annotation]
+    return []
+
+def _original(view):
+    while hasattr(view, '__wrapped__'):
+        view = view.__wrapped__
+    return view
+
+def _model_schemas(cls=ModelSchema) -> list:
+    found = []
+    for subclass in cls.__subclasses__():
+        found.append(subclass)
+        found.extend(_model_schemas(subclass))
+    return found
+
+def _complete(schema, report: WarmupReport) -> bool:
+    # Schemas with unresolved forward references build their validators lazily
+    if schema.__pydantic_complete__:
+        return True
+    try:
+        schema.model_rebuild()
+        return True
+    except Exception as e:
+        report.errors.append(f"{schema.__qualname__}: {e}")
+        return False
+
+def _component_templates() -> list:
+    names = set()
+    for engine in engines.all():
+        for directory in getattr(engine, 'template_dirs', ()):
+            components = os.path.join(directory, 'components')
+            for root, _, files in os.walk(components):
+                for file in files:
+                    if file.endswith('.html'):
+                        relative = os.path.relpath(os.path.join(root, file), directory)
+                        names.add(relative.replace(os.sep, '/'))
+    return sorted(names)
+
+def _load_template(name: str, report: WarmupReport, required: bool = True) -> bool:
+    try:
+        get_template(name)
+        return True
+    except TemplateDoesNotExist:
+        if required:
+            report.errors.append(f"{name}: template not found")
+    except TemplateSyntaxError as e:
+        report.errors.append(f"{name}: {e}")
+    return False
+
+def warm_up(router=None) -> WarmupReport:
+    """
+    Preloads everything the first request to each route would otherwise build:
+    route schemas, every ModelSchema, the URL resolvers, the route manifest and
+    the component and page templates. Returns a report of what was warmed.
+    """
+    router = router or api.router
+    report = WarmupReport()
+
+    with report.stage('routes') as warmed:
+        for path, view in list(router.routes.items()):
+            for schema in _schemas_in(_declared_schema(_original(view))):
+                _complete(schema, report)
+            warmed.append(path)
+        router.manifest()
+
+    with report.stage('schemas') as warmed:
+        for schema in _model_schemas():
+            if _complete(schema, report):
+                warmed.append(schema)
+
+    with report.stage('urls') as warmed:
+        from .multiplex import _resolver
+        # Populating a resolver compiles the regex of every pattern below it
+        resolvers = [_resolver(router)]
+        if getattr(settings, 'ROOT_URLCONF', None):
+            resolvers.append(get_resolver())
+        for resolver in resolvers:
+            resolver.reverse_dict
+            warmed.append(resolver)
+
+    with report.stage('templates') as warmed:
+        for name in ['base.html'] + _component_templates():
+            if _load_template(name, report, required=name != 'base.html'):
+                warmed.append(name)
+        # Pages of non-API routes are rendered from templates/<view name>.html
+        for path, view in list(router.routes.items()):
+            if not path.startswith('/api') and _load_template(f"templates/{_original(view).__name__}.html", report, required=False):
+                warmed.append(path)
+    return report
@@ -15,7 +15,7 @@ document.addEventListener('alpine:init', () => {
             }
             const finalPart = parts[parts.length - 1];
 
-            current[finalPart] = async (params = {}) => {
+            const buildUrl = (params = {}) => {
                 // Replace path parameters like <int:pk>
                 let finalPath = path;
                 const urlParams = new URLSearchParams();
@@ -32,21 +32,28 @@ document.addEventListener('alpine:init', () => {
 
                 const url = new URL(finalPath, window.location.origin);
                 url.search = urlParams.toString();
+                return url;
+            };
 
-                const response = await fetch(url, {
-                    method: 'GET', // for now, we only support GET
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'X-CSRFToken': getCookie('csrftoken') // Django's CSRF token
-                    },
-                    // body will be used for POST/PUT in the future
-                });
-
-                if (!response.ok) {
-                    throw new Error(`Byrdie API error: ${response.statusText}`);
+            // Options: `supersede` (true, or a key shared by calls) aborts the previous
+            // pending call with the same key; `signal`, `method` and `body` go to fetch.
+            current[finalPart] = async (params = {}, options = {}) => {
+                if (options.supersede) {
+                    const key = options.supersede === true ? name : options.supersede;
+                    byrdieRuntime.supersede(key, options);
                 }
+                return byrdieFetch(buildUrl(params), options);
+            };
 
-                return response.json();
+            // Iterate over the pages of a route declared with `paginate=`:
+            //   for await (const page of byrdie.notes.list.pages()) { ... }
+            current[finalPart].pages = async function* (params = {}) {
+                let url = buildUrl(params);
+                while (url) {
+                    const page = await byrdieFetch(url);
+                    yield page.results;
+                    url = page.next ? new URL(page.next, window.location.origin) : null;
+                }
             };
         }
     }
@@ -54,8 +61,20 @@ document.addEventListener('alpine:init', () => {
     Alpine.data('byrdieComponent', (initialData) => {
         const component = { ...initialData };
 
+        // With `byrdie_config.live`, saved changes to the instance are pushed over Server-Sent Events
+        if (initialData._meta.live) {
+            component.init = function () {
+                if (byrdieRuntime.config().live) {
+                    byrdieLive.subscribe(initialData._meta.live, this);
+                }
+            };
+            component.destroy = function () {
+                byrdieLive.unsubscribe(initialData._meta.live, this);
+            };
+        }
+
         for (const methodName of initialData.exposed_methods) {
-            component[methodName] = async (...args) => {
+            component[methodName] = async function (...args) {
                 const appLabel = initialData._meta.app_label;
                 const modelName = initialData._meta.model_name;
                 const pk = initialData.pk;
@@ -65,25 +84,64 @@ document.addEventListener('alpine:init', () => {
                     body = args[0];
                 }
 
+                const headers = {
+                    'Content-Type': 'application/json',
+                    'Accept': byrdieAccept(),
+                    'X-CSRFToken': getCookie('csrftoken'),
+                };
+                if (initialData._meta.variant) {
+                    headers['X-Byrdie-Variant'] = initialData._meta.variant;
+                }
+                const versionField = initialData._meta.version_field;
+                if (versionField) {
+                    headers['X-Byrdie-Version'] = this[versionField];
+                }
+
                 const response = await fetch(`/byrdie/call/${appLabel}/${modelName}/${pk}/${methodName}/`, {
                     method: 'POST',
-                    headers: {
-                        'Content-Type': 'application/json',
-                        'X-CSRFToken': getCookie('csrftoken'),
-                    },
+                    headers,
                     body: JSON.stringify(body)
                 });
 
+                // Someone else changed the instance first; show their state and let the caller retry
+                if (response.status === 409) {
+                    const conflict = await byrdieDecode(response);
+                    Object.assign(this, conflict.state);
+                    const error = new Error('Byrdie method call conflict: the object was modified.');
+                    error.conflict = true;
+                    throw error;
+                }
+
                 if (!response.ok) {
                     throw new Error(`Byrdie method call error: ${response.statusText}`);
                 }
 
-                const result = await response.json();
+                if (versionField && response.headers.has('X-Byrdie-Version')) {
+                    this[versionField] = parseInt(response.headers.get('X-Byrdie-Version'), 10);
+                }
+
+                let result = await byrdieDecode(response);
+
+                // Methods exposed with background=True are queued; wait for the job's result
+                if (response.status === 202 && result.job) {
+                    result = await byrdieWaitForJob(result.job);
+                    if (result === null || typeof result !== 'object') {
+                        return result;
+                    }
+                }
+
+                // Methods exposed with render=True answer with fresh markup and the changed fields
+                if (result && typeof result.html === 'string' && 'state' in result) {
+                    byrdieMorph(this.$root, result.html);
+                    Object.assign(this, result.state);
+                    return result.result;
+                }
 
                 // Update the component's data
                 for (const [key, value] of Object.entries(result)) {
-                    component[key] = value;
+                    this[key] = value;
                 }
+                return result;
             };
         }
 
@@ -91,6 +149,490 @@ document.addEventListener('alpine:init', () => {
     });
 });
 
+// Client runtime shared by all route functions. Configure it with
+// `window.byrdie_config = {batch: true, ...}` before the page loads.
+const byrdieRuntime = {
+    cache: new Map(),
+    inflight: new Map(),
+    queue: [],
+    flushTimer: null,
+    superseded: new Map(),
+
+    config() {
+        return Object.assign({
+            batch: false,
+            batchDelay: 0,
+            maxBatch: 20,
+            multiplexUrl: '/byrdie/multiplex',
+            live: false,
+            liveUrl: '/byrdie/live',
+            msgpack: false,
+        }, window.byrdie_config || {});
+    },
+
+    supersede(key, options) {
+        const previous = this.superseded.get(key);
+        if (previous) {
+            previous.abort();
+        }
+        const controller = new AbortController();
+        if (options.signal) {
+            options.signal.addEventListener('abort', () => controller.abort(), { once: true });
+        }
+        options.signal = controller.signal;
+        this.superseded.set(key, controller);
+    },
+
+    // Responses are cached while fresh by max-age, and revalidated with their ETag afterwards
+    lookup(key) {
+        const entry = this.cache.get(key);
+        if (entry && entry.expires > Date.now()) {
+            return { fresh: true, entry };
+        }
+        return { fresh: false, entry };
+    },
+
+    store(key, headers, data) {
+        const cacheControl = (headers['cache-control'] || '').toLowerCase();
+        if (cacheControl.includes('no-store')) {
+            this.cache.delete(key);
+            return;
+        }
+        const maxAge = /max-age=(\d+)/.exec(cacheControl);
+        const noCache = cacheControl.includes('no-cache');
+        const age = parseInt(headers['age'] || '0', 10) || 0;
+        const expires = maxAge && !noCache ? Date.now() + (parseInt(maxAge[1], 10) - age) * 1000 : 0;
+        const etag = headers['etag'] || null;
+        if (expires > Date.now() || etag) {
+            this.cache.set(key, { data, etag, expires });
+        } else {
+            this.cache.delete(key);
+        }
+    },
+
+    // Turns a direct or multiplexed response into data, updating the cache
+    settle(key, status, headers, body, entry) {
+        if (status === 304 && entry) {
+            this.store(key, headers, entry.data);
+            return entry.data;
+        }
+        if (status < 200 || status >= 300) {
+            throw new Error(`Byrdie API error: ${status}`);
+        }
+        this.store(key, headers, body);
+        return body;
+    },
+
+    async direct(url, entry, signal) {
+        const headers = {
+            'Content-Type': 'application/json',
+            'Accept': byrdieAccept(),
+            'X-CSRFToken': getCookie('csrftoken'), // Django's CSRF token
+        };
+        if (entry && entry.etag) {
+            headers['If-None-Match'] = entry.etag;
+        }
+        const response = await fetch(url, { method: 'GET', headers, signal });
+        const responseHeaders = {};
+        for (const name of ['cache-control', 'etag', 'age']) {
+            if (response.headers.has(name)) {
+                responseHeaders[name] = response.headers.get(name);
+            }
+        }
+        if (!response.ok && response.status !== 304) {
+            throw new Error(`Byrdie API error: ${response.statusText}`);
+        }
+        const body = response.status === 304 ? null : await byrdieDecode(response);
+        return this.settle(url.toString(), response.status, responseHeaders, body, entry);
+    },
+
+    enqueue(url, entry, signal) {
+        return new Promise((resolve, reject) => {
+            this.queue.push({ url, entry, signal, resolve, reject });
+            const config = this.config();
+            if (this.queue.length >= config.maxBatch) {
+                this.flush();
+            } else if (this.flushTimer === null) {
+                this.flushTimer = setTimeout(() => this.flush(), config.batchDelay);
+            }
+        });
+    },
+
+    async flush() {
+        clearTimeout(this.flushTimer);
+        this.flushTimer = null;
+        const batch = [];
+        for (const call of this.queue) {
+            if (call.signal && call.signal.aborted) {
+                call.reject(new DOMException('The call was superseded or aborted.', 'AbortError'));
+            } else {
+                batch.push(call);
+            }
+        }
+        this.queue = [];
+        if (batch.length === 1) {
+            const call = batch[0];
+            this.direct(call.url, call.entry, call.signal).then(call.resolve, call.reject);
+            return;
+        }
+        if (batch.length === 0) {
+            return;
+        }
+        try {
+            const response = await fetch(this.config().multiplexUrl, {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                    'Accept': byrdieAccept(),
+                    'X-CSRFToken': getCookie('csrftoken'),
+                },
+                body: JSON.stringify({
+                    requests: batch.map((call, id) => ({
+                        id,
+                        url: call.url.pathname + call.url.search,
+                        headers: call.entry && call.entry.etag ? { 'If-None-Match': call.entry.etag } : {},
+                    })),
+                }),
+            });
+            if (!response.ok) {
+                throw new Error(`Byrdie API error: ${response.statusText}`);
+            }
+            const { responses } = await byrdieDecode(response);
+            for (const result of responses) {
+                const call = batch[result.id];
+                const headers = {};
+                for (const [name, value] of Object.entries(result.headers || {})) {
+                    headers[name.toLowerCase()] = value;
+                }
+                try {
+                    call.resolve(this.settle(call.url.toString(), result.status, headers, result.body, call.entry));
+                } catch (error) {
+                    call.reject(error);
+                }
+            }
+        } catch (error) {
+            batch.forEach(call => call.reject(error));
+        }
+    },
+
+    // Identical in-flight GETs share one request. It is aborted only once every caller has aborted.
+    get(url, signal) {
+        const key = url.toString();
+        const { fresh, entry } = this.lookup(key);
+        if (fresh) {
+            return Promise.resolve(entry.data);
+        }
+        let flight = this.inflight.get(key);
+        if (!flight) {
+            const controller = new AbortController();
+            flight = { controller, waiters: 0 };
+            const request = this.config().batch
+                ? this.enqueue(url, entry, controller.signal)
+                : this.direct(url, entry, controller.signal);
+            // An aborted flight is left to settle on its own; later callers start a fresh one
+            const forget = () => {
+                if (this.inflight.get(key) === flight) {
+                    this.inflight.delete(key);
+                }
+            };
+            controller.signal.addEventListener('abort', forget, { once: true });
+            flight.promise = request.finally(forget);
+            flight.promise.catch(() => {});
+            this.inflight.set(key, flight);
+        }
+        flight.waiters++;
+        if (!signal) {
+            return flight.promise;
+        }
+        return new Promise((resolve, reject) => {
+            const onAbort = () => {
+                if (--flight.waiters === 0) {
+                    flight.controller.abort();
+                }
+                reject(new DOMException('The call was superseded or aborted.', 'AbortError'));
+            };
+            if (signal.aborted) {
+                return onAbort();
+            }
+            signal.addEventListener('abort', onAbort, { once: true });
+            flight.promise.then(resolve, reject).finally(() => signal.removeEventListener('abort', onAbort));
+        });
+    },
+};
+
+// One EventSource carries the updates for every live component on the page
+const byrdieLive = {
+    subscribers: new Map(),
+    source: null,
+    timer: null,
+
+    keyOf(component) {
+        return `${component._meta.app_label}.${component._meta.model_name}:${component.pk}`;
+    },
+
+    subscribe(token, component) {
+        if (!this.subscribers.has(token)) {
+            this.subscribers.set(token, new Set());
+        }
+        this.subscribers.get(token).add(component);
+        this.reconnect();
+    },
+
+    unsubscribe(token, component) {
+        const components = this.subscribers.get(token);
+        if (!components) {
+            return;
+        }
+        components.delete(component);
+        if (components.size === 0) {
+            this.subscribers.delete(token);
+            this.reconnect();
+        }
+    },
+
+    // Components initialising together share one reconnect
+    reconnect() {
+        clearTimeout(this.timer);
+        this.timer = setTimeout(() => {
+            if (this.source) {
+                this.source.close();
+                this.source = null;
+            }
+            if (this.subscribers.size === 0) {
+                return;
+            }
+            const url = new URL(byrdieRuntime.config().liveUrl, window.location.origin);
+            for (const token of this.subscribers.keys()) {
+                url.searchParams.append('c', token);
+            }
+            this.source = new EventSource(url);
+            this.source.onmessage = (event) => this.receive(JSON.parse(event.data));
+        }, 0);
+    },
+
+    receive(message) {
+        for (const components of this.subscribers.values()) {
+            for (const component of components) {
+                if (this.keyOf(component) !== message.key) {
+                    continue;
+                }
+                if (message.deleted) {
+                    component.$root.dispatchEvent(new CustomEvent('byrdie:deleted', { bubbles: true }));
+                } else {
+                    Object.assign(component, message.state);
+                }
+            }
+        }
+    },
+};
+
+// Polls a background job with backoff until it finishes, returning its result
+async function byrdieWaitForJob(jobId) {
+    let delay = 250;
+    while (true) {
+        await new Promise(resolve => setTimeout(resolve, delay));
+        const response = await fetch(`/byrdie/jobs/${jobId}`, {
+            headers: { 'Content-Type': 'application/json' },
+        });
+        if (!response.ok) {
+            throw new Error(`Byrdie job error: ${response.statusText}`);
+        }
+        const job = await response.json();
+        if (job.status === 'done') {
+            return job.result;
+        }
+        if (job.status === 'failed') {
+            throw new Error(`Byrdie job failed: ${job.error}`);
+        }
+        delay = Math.min(delay * 1.5, 2000);
+    }
+}
+
+async function byrdieFetch(url, options = {}) {
+    const method = (options.method || 'GET').toUpperCase();
+    if (method === 'GET') {
+        return byrdieRuntime.get(url, options.signal);
+    }
+    // Writes bypass batching and the cache, and invalidate cached reads
+    const response = await fetch(url, {
+        method,
+        headers: {
+            'Content-Type': 'application/json',
+            'Accept': byrdieAccept(),
+            'X-CSRFToken': getCookie('csrftoken'),
+        },
+        body: options.body === undefined ? undefined : JSON.stringify(options.body),
+        signal: options.signal,
+    });
+    byrdieRuntime.cache.clear();
+    if (!response.ok) {
+        throw new Error(`Byrdie API error: ${response.statusText}`);
+    }
+    return response.status === 204 ? null : byrdieDecode(response);
+}
+
+// Patches a component's root element to match freshly rendered markup, reusing
+// existing nodes so focus, Alpine state and listeners survive. Uses Alpine's
+// morph plugin when it is loaded.
+function byrdieMorph(root, html) {
+    const template = document.createElement('template');
+    template.innerHTML = html.trim();
+    const fresh = template.content.firstElementChild;
+    if (!fresh) {
+        return;
+    }
+    // The live component keeps its own x-data; only the markup is updated
+    fresh.removeAttribute('x-data');
+    if (window.Alpine && Alpine.morph) {
+        fresh.setAttribute('x-data', root.getAttribute('x-data'));
+        Alpine.morph(root, fresh);
+        return;
+    }
+    for (const { name } of Array.from(root.attributes)) {
+        if (name !== 'x-data' && !fresh.hasAttribute(name)) {
+            root.removeAttribute(name);
+        }
+    }
+    for (const { name, value } of Array.from(fresh.attributes)) {
+        if (root.getAttribute(name) !== value) {
+            root.setAttribute(name, value);
+        }
+    }
+    morphChildren(root, fresh);
+}
+
+function morphChildren(current, fresh) {
+    const freshNodes = Array.from(fresh.childNodes);
+    freshNodes.forEach((freshNode, i) => {
+        const node = current.childNodes[i];
+        if (!node) {
+            current.appendChild(freshNode);
+        } else if (node.nodeType !== freshNode.nodeType || node.nodeName !== freshNode.nodeName) {
+            current.replaceChild(freshNode, node);
+        } else if (node.nodeType === Node.ELEMENT_NODE) {
+            for (const { name } of Array.from(node.attributes)) {
+                if (!freshNode.hasAttribute(name)) {
+                    node.removeAttribute(name);
+                }
+            }
+            for (const { name, value } of Array.from(freshNode.attributes)) {
+                if (node.getAttribute(name) !== value) {
+                    node.setAttribute(name, value);
+                }
+            }
+            morphChildren(node, freshNode);
+        } else if (node.nodeValue !== freshNode.nodeValue) {
+            node.nodeValue = freshNode.nodeValue;
+        }
+    });
+    while (current.childNodes.length > freshNodes.length) {
+        current.removeChild(current.lastChild);
+    }
+}
+
+// With `byrdie_config.msgpack`, responses are requested as MessagePack when the server supports it
+function byrdieAccept() {
+    return byrdieRuntime.config().msgpack
+        ? 'application/msgpack, application/json;q=0.9'
+        : 'application/json';
+}
+
+async function byrdieDecode(response) {
+    const contentType = response.headers.get('Content-Type') || '';
+    if (contentType.includes('msgpack')) {
+        return msgpackDecode(new Uint8Array(await response.arrayBuffer()));
+    }
+    return response.json();
+}
+
+// A minimal MessagePack decoder covering the types the server produces
+function msgpackDecode(bytes) {
+    const view = new DataView(bytes.buffer, bytes.byteOffset, bytes.byteLength);
+    const text = new TextDecoder();
+    let offset = 0;
+
+    const str = (length) => {
+        const value = text.decode(bytes.subarray(offset, offset + length));
+        offset += length;
+        return value;
+    };
+    const bin = (length) => {
+        const value = bytes.slice(offset, offset + length);
+        offset += length;
+        return value;
+    };
+    const array = (length) => {
+        const value = new Array(length);
+        for (let i = 0; i < length; i++) {
+            value[i] = read();
+        }
+        return value;
+    };
+    const map = (length) => {
+        const value = {};
+        for (let i = 0; i < length; i++) {
+            const key = read();
+            value[key] = read();
+        }
+        return value;
+    };
+    const uint = (size) => {
+        let value;
+        if (size === 1) value = view.getUint8(offset);
+        else if (size === 2) value = view.getUint16(offset);
+        else if (size === 4) value = view.getUint32(offset);
+        else value = Number(view.getBigUint64(offset));
+        offset += size;
+        return value;
+    };
+    const int = (size) => {
+        let value;
+        if (size === 1) value = view.getInt8(offset);
+        else if (size === 2) value = view.getInt16(offset);
+        else if (size === 4) value = view.getInt32(offset);
+        else value = Number(view.getBigInt64(offset));
+        offset += size;
+        return value;
+    };
+
+    function read() {
+        const type = view.getUint8(offset++);
+        if (type < 0x80) return type;
+        if (type < 0x90) return map(type & 0x0f);
+        if (type < 0xa0) return array(type & 0x0f);
+        if (type < 0xc0) return str(type & 0x1f);
+        if (type >= 0xe0) return type - 0x100;
+        switch (type) {
+            case 0xc0: return null;
+            case 0xc2: return false;
+            case 0xc3: return true;
+            case 0xc4: return bin(uint(1));
+            case 0xc5: return bin(uint(2));
+            case 0xc6: return bin(uint(4));
+            case 0xca: { const value = view.getFloat32(offset); offset += 4; return value; }
+            case 0xcb: { const value = view.getFloat64(offset); offset += 8; return value; }
+            case 0xcc: return uint(1);
+            case 0xcd: return uint(2);
+            case 0xce: return uint(4);
+            case 0xcf: return uint(8);
+            case 0xd0: return int(1);
+            case 0xd1: return int(2);
+            case 0xd2: return int(4);
+            case 0xd3: return int(8);
+            case 0xd9: return str(uint(1));
+            case 0xda: return str(uint(2));
+            case 0xdb: return str(uint(4));
+            case 0xdc: return array(uint(2));
+            case 0xdd: return array(uint(4));
+            case 0xde: return map(uint(2));
+            case 0xdf: return map(uint(4));
+            default: throw new Error(`Unsupported MessagePack type 0x${type.toString(16)}`);
+        }
+    }
+
+    return read();
+}
+
 function getCookie(name) {
     let cookieValue = null;
     if (document.cookie && document.cookie !== '') {
@@ -21,6 +21,44 @@ class ExposedModel(Model):
         return self.value * 2
 
 
+class Counter(Model):
+    label = models.CharField(max_length=100)
+    value = models.IntegerField(default=0)
+    exposed_fields = ["label", "value"]
+
+    class Meta:
+        app_label = 'tests'
+
+    @expose(render=True)
+    def increment(self, by=1):
+        self.value += by
+        self.save()
+        return self.value
+
+    @expose(background=True)
+    def recount(self, to=0):
+        self.value = to
+        self.save()
+        return {"value": self.value}
+
+
+class Ticket(Model):
+    title = models.CharField(max_length=100)
+    votes = models.IntegerField(default=0)
+    version = models.IntegerField(default=0)
+    exposed_fields = ["votes"]
+    version_field = "version"
+
+    class Meta:
+        app_label = 'tests'
+
+    @expose
+    def vote(self):
+        self.votes += 1
+        self.save()
+        return {"votes": self.votes}
+
+
 class Note(Model):
     content = models.TextField()
     components = ["card"]
@@ -41,3 +79,16 @@ class UnserializedModel(Model):
 
     class Meta:
         app_label = 'tests'
+
+
+class LineItem(Model):
+    counter = models.ForeignKey(Counter, on_delete=models.CASCADE)
+    price = models.DecimalField(max_digits=6, decimal_places=2)
+    quantity = models.PositiveSmallIntegerField(default=1)
+    unit = models.CharField(max_length=2, choices=[("kg", "Kilograms"), ("ea", "Each")], blank=True)
+    note = models.CharField(max_length=10, blank=True)
+    ships_in = models.DurationField(null=True)
+    label_image = models.BinaryField(null=True)
+
+    class Meta:
+        app_label = 'tests'
@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth import login, logout
+from django.contrib.auth.models import Permission, User
+from django.contrib.sessions.middleware import SessionMiddleware
+from django.http import HttpResponse
+from byrdie import auth
+from byrdie.auth import CachedAuthenticationMiddleware
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def signed_cookie_sessions(settings):
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+    auth._users.clear()
+    yield
+    auth._users.clear()
+
+def _request(rf, cookies=None):
+    request = rf.get("/")
+    request.COOKIES.update(cookies or {})
+    SessionMiddleware(lambda r: None).process_request(request)
+    CachedAuthenticationMiddleware(lambda r: None).process_request(request)
+    return request
+
+def _logged_in_cookies(rf, user):
+    request = _request(rf)
+    login(request, user, backend="django.contrib.auth.backends.ModelBackend")
+    request.session.save()
+    return {"sessionid": request.session.session_key}
+
+def test_user_is_loaded_once_and_then_served_from_cache(rf, django_assert_num_queries):
+    user = User.objects.create_user("ada", password="pw")
+    cookies = _logged_in_cookies(rf, user)
+    with django_assert_num_queries(1):
+        assert _request(rf, cookies).user.pk == user.pk
+    with django_assert_num_queries(0):
+        assert _request(rf, cookies).user.pk == user.pk
+
+def _respond(rf, cookies, view):
+    request = rf.get("/")
+    request.COOKIES.update(cookies)
+    SessionMiddleware(lambda r: None).process_request(request)
+    return CachedAuthenticationMiddleware(view)(request)
+
+def test_permissions_are_reused_across_requests(rf, django_assert_num_queries):
+    user = User.objects.create_user("ada", password="pw")
+    user.user_permissions.add(Permission.objects.get(codename="view_user"))
+    cookies = _logged_in_cookies(rf, user)
+    view = lambda request: HttpResponse(str(request.user.has_perm("auth.view_user")))
+    assert _respond(rf, cookies, view).content == b"True"
+    with django_assert_num_queries(0):
+        assert _respond(rf, cookies, view).content == b"True"
+
+def test_each_request_gets_its_own_user_instance(rf):
+    user = User.objects.create_user("ada", password="pw")
+    cookies = _logged_in_cookies(rf, user)
+    first = _request(rf, cookies).user
+    first.first_name = "changed by one request"
+    second = _request(rf, cookies).user
+    assert second.first_name == ""
+    assert second._wrapped is not first._wrapped
+
+def test_user_cache_is_bounded(rf, settings):
+    settings.BYRDIE_USER_CACHE_SIZE = 2
+    users = [User.objects.create_user(f"user{i}", password="pw") for i in range(3)]
+    for user in users:
+        _request(rf, _logged_in_cookies(rf, user)).user.pk
+    assert list(auth._users) == [str(users[1].pk), str(users[2].pk)]
+
+def test_saving_the_user_invalidates_the_cache(rf, django_assert_num_queries):
+    user = User.objects.create_user("ada", password="pw")
+    cookies = _logged_in_cookies(rf, user)
+    _request(rf, cookies).user.pk
+    User.objects.get(pk=user.pk).save()
+    with django_assert_num_queries(1):
+        _request(rf, cookies).user.pk
+
+def test_session_hash_mismatch_falls_back_to_database(rf):
+    user = User.objects.create_user("ada", password="pw")
+    cookies = _logged_in_cookies(rf, user)
+    assert _request(rf, cookies).user.is_authenticated
+    # Bypass signals so only the session hash check can catch the change
+    User.objects.filter(pk=user.pk).update(password="changed")
+    auth._users[str(user.pk)][1].password = "changed"
+    assert not _request(rf, cookies).user.is_authenticated
+
+def test_logout_invalidates_the_cache(rf):
+    user = User.objects.create_user("ada", password="pw")
+    cookies = _logged_in_cookies(rf, user)
+    request = _request(rf, cookies)
+    request.user.pk
+    assert str(user.pk) in auth._users
+    logout(request)
+    assert str(user.pk) not in auth._users
+
+def test_clearing_a_groups_members_invalidates_them(rf):
+    from django.contrib.auth.models import Group
+    group = Group.objects.create(name="editors")
+    users = [User.objects.create_user(f"user{i}", password="pw") for i in range(2)]
+    group.user_set.add(*users)
+    for user in users:
+        _request(rf, _logged_in_cookies(rf, user)).user.pk
+    assert set(auth._users) == {str(user.pk) for user in users}
+    group.user_set.clear()
+    assert not auth._users
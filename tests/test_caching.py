@@ -0,0 +1,115 @@
+import threading
+import pytest
+from django.core.cache import cache
+from byrdie.api import Api
+from byrdie import caching
+from byrdie.caching import StaleWhileRevalidate
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+def test_fresh_responses_are_served_from_cache(rf):
+    api = Api()
+    calls = []
+    @api.route("/dashboard", api=True, wove=False, cache=60)
+    def dashboard(request):
+        calls.append(1)
+        return {"calls": len(calls)}
+    view = api.router.get_view("/api/dashboard")
+    first = view(rf.get("/api/dashboard"))
+    second = view(rf.get("/api/dashboard"))
+    assert first['X-Byrdie-Cache'] == "miss"
+    assert second['X-Byrdie-Cache'] == "hit"
+    assert second.content == first.content
+    assert len(calls) == 1
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(caching, "time", clock)
+    return clock
+
+def test_stale_response_is_served_and_refreshed_in_background(rf, clock):
+    policy = StaleWhileRevalidate(ttl=10, max_stale=60)
+    refreshed = threading.Event()
+    store = policy.store
+    def store_and_signal(key, response):
+        store(key, response)
+        refreshed.set()
+    policy.store = store_and_signal
+    api = Api()
+    calls = []
+    @api.route("/dashboard", api=True, wove=False, cache=policy)
+    def dashboard(request):
+        calls.append(1)
+        return {"calls": len(calls)}
+    view = api.router.get_view("/api/dashboard")
+    view(rf.get("/api/dashboard"))
+    refreshed.clear()
+    clock.now += 11
+    stale = view(rf.get("/api/dashboard"))
+    assert stale['X-Byrdie-Cache'] == "stale"
+    assert stale.content == b'{"calls": 1}'
+    assert refreshed.wait(5)
+    fresh = view(rf.get("/api/dashboard"))
+    assert fresh['X-Byrdie-Cache'] == "hit"
+    assert fresh.content == b'{"calls": 2}'
+
+def test_entries_past_max_stale_are_recomputed_inline(rf, clock):
+    api = Api()
+    calls = []
+    @api.route("/dashboard/inline", api=True, wove=False, cache=StaleWhileRevalidate(ttl=10, max_stale=10))
+    def dashboard(request):
+        calls.append(1)
+        return {"calls": len(calls)}
+    view = api.router.get_view("/api/dashboard/inline")
+    view(rf.get("/api/dashboard/inline"))
+    clock.now += 21
+    response = view(rf.get("/api/dashboard/inline"))
+    assert response['X-Byrdie-Cache'] == "miss"
+    assert response.content == b'{"calls": 2}'
+
+def test_cache_entries_are_per_credentials(rf):
+    api = Api()
+    @api.route("/me", api=True, wove=False, cache=60)
+    def me(request):
+        return {"auth": request.headers.get("Authorization", "")}
+    view = api.router.get_view("/api/me")
+    assert view(rf.get("/api/me", HTTP_AUTHORIZATION="Bearer a")).content == b'{"auth": "Bearer a"}'
+    anonymous = view(rf.get("/api/me"))
+    assert anonymous['X-Byrdie-Cache'] == "miss"
+    assert anonymous.content == b'{"auth": ""}'
+
+def test_security_checks_run_before_cache_lookups(rf):
+    api = Api()
+    allowed = {"value": True}
+    @api.route("/report", api=True, wove=False, cache=60, has_permissions=lambda request: allowed["value"])
+    def report(request):
+        return {"secret": 1}
+    view = api.router.get_view("/api/report")
+    assert view(rf.get("/api/report"))['X-Byrdie-Cache'] == "miss"
+    allowed["value"] = False
+    assert view(rf.get("/api/report")).status_code == 403
+
+def test_only_get_requests_are_cached(rf):
+    api = Api()
+    calls = []
+    @api.route("/dashboard", api=True, wove=False, cache=60)
+    def dashboard(request):
+        calls.append(1)
+        return {"calls": len(calls)}
+    view = api.router.get_view("/api/dashboard")
+    view(rf.post("/api/dashboard"))
+    view(rf.post("/api/dashboard"))
+    assert len(calls) == 2
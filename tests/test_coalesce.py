@@ -0,0 +1,96 @@
+import asyncio
+import threading
+import time
+from byrdie.api import Api
+from byrdie.coalesce import SingleFlight, coalesce_requests
+
+
+def _concurrently(n, fn):
+    results = [None] * n
+    def run(i):
+        results[i] = fn()
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+def test_identical_concurrent_gets_share_one_computation(rf):
+    api = Api()
+    calls = []
+    @api.route("/expensive", api=True, wove=False, coalesce=True)
+    def expensive(request):
+        calls.append(1)
+        time.sleep(0.1)
+        return {"value": len(calls)}
+    view = api.router.get_view("/api/expensive")
+    responses = _concurrently(5, lambda: view(rf.get("/api/expensive?a=1")))
+    assert len(calls) == 1
+    assert {r.content for r in responses} == {b'{"value": 1}'}
+    assert len({id(r) for r in responses}) == 5
+
+def test_different_queries_are_not_coalesced(rf):
+    api = Api()
+    calls = []
+    @api.route("/expensive", api=True, wove=False, coalesce=True)
+    def expensive(request):
+        calls.append(1)
+        time.sleep(0.05)
+        return {"q": request.GET["q"]}
+    view = api.router.get_view("/api/expensive")
+    counter = iter(range(3))
+    lock = threading.Lock()
+    def call():
+        with lock:
+            q = next(counter)
+        return view(rf.get(f"/api/expensive?q={q}"))
+    _concurrently(3, call)
+    assert len(calls) == 3
+
+def test_errors_are_shared():
+    flights = SingleFlight()
+    def boom():
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+    errors = []
+    def call():
+        try:
+            flights.do("key", boom)
+        except RuntimeError as e:
+            errors.append(e)
+    _concurrently(3, call)
+    assert len(errors) == 3
+
+def test_async_views_are_coalesced(rf):
+    calls = []
+    async def view(request):
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        from django.http import HttpResponse
+        return HttpResponse(b"done")
+    wrapped = coalesce_requests(view)
+    async def main():
+        return await asyncio.gather(*(wrapped(rf.get("/async")) for _ in range(4)))
+    responses = asyncio.run(main())
+    assert len(calls) == 1
+    assert [r.content for r in responses] == [b"done"] * 4
+
+def test_requests_for_different_credentials_are_not_coalesced(rf):
+    api = Api()
+    calls = []
+    @api.route("/expensive", api=True, wove=False, coalesce=True)
+    def expensive(request):
+        calls.append(1)
+        time.sleep(0.05)
+        return {"auth": request.headers["Authorization"]}
+    view = api.router.get_view("/api/expensive")
+    tokens = iter(["Bearer a", "Bearer b"])
+    lock = threading.Lock()
+    def call():
+        with lock:
+            token = next(tokens)
+        return view(rf.get("/api/expensive", HTTP_AUTHORIZATION=token))
+    responses = _concurrently(2, call)
+    assert len(calls) == 2
+    assert {r.content for r in responses} == {b'{"auth": "Bearer a"}', b'{"auth": "Bearer b"}'}
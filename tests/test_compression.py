@@ -0,0 +1,66 @@
+import gzip
+import json
+from django.http import HttpResponse
+from byrdie.api import Api
+from byrdie.staticfiles import precompress_directory, serve_static
+
+
+def test_large_json_responses_are_gzipped(rf):
+    api = Api()
+    @api.route("/big", api=True, wove=False, compress=True)
+    def big(request):
+        return [{"name": f"row {i}", "value": i} for i in range(500)]
+    view = api.router.get_view("/api/big")
+    response = view(rf.get("/api/big", HTTP_ACCEPT_ENCODING="gzip, deflate"))
+    assert response['Content-Encoding'] == "gzip"
+    assert 'Accept-Encoding' in response['Vary']
+    assert len(json.loads(gzip.decompress(response.content))) == 500
+
+def test_small_or_unaccepted_responses_are_not_compressed(rf):
+    api = Api()
+    @api.route("/small", api=True, wove=False, compress=True)
+    def small(request):
+        return {"ok": True}
+    @api.route("/big", api=True, wove=False, compress=True)
+    def big(request):
+        return [i for i in range(1000)]
+    small_response = api.router.get_view("/api/small")(rf.get("/api/small", HTTP_ACCEPT_ENCODING="gzip"))
+    assert not small_response.has_header('Content-Encoding')
+    big_response = api.router.get_view("/api/big")(rf.get("/api/big", HTTP_ACCEPT_ENCODING="gzip;q=0"))
+    assert not big_response.has_header('Content-Encoding')
+
+def test_content_type_allow_list(rf):
+    api = Api()
+    @api.route("/binary", api=True, wove=False, compress=True)
+    def binary(request):
+        return HttpResponse(b"x" * 5000, content_type="application/octet-stream")
+    response = api.router.get_view("/api/binary")(rf.get("/api/binary", HTTP_ACCEPT_ENCODING="gzip"))
+    assert not response.has_header('Content-Encoding')
+
+def test_precompressed_fingerprinted_static_files(rf, tmp_path, settings):
+    settings.STATIC_ROOT = str(tmp_path)
+    (tmp_path / "js").mkdir()
+    source = b"console.log('byrdie');\n" * 200
+    (tmp_path / "js" / "byrdie.0123456789ab.js").write_bytes(source)
+    (tmp_path / "js" / "byrdie.js").write_bytes(source)
+    written = precompress_directory(str(tmp_path))
+    assert str(tmp_path / "js" / "byrdie.js.gz") in written
+    response = serve_static(rf.get("/static/js/byrdie.0123456789ab.js", HTTP_ACCEPT_ENCODING="gzip"), "js/byrdie.0123456789ab.js")
+    assert response['Content-Encoding'] == "gzip"
+    assert "immutable" in response['Cache-Control']
+    assert gzip.decompress(b"".join(response.streaming_content)) == source
+    response.file_to_stream.close()
+    response = serve_static(rf.get("/static/js/byrdie.js"), "js/byrdie.js")
+    assert not response.has_header('Content-Encoding')
+    assert response['Cache-Control'] == "no-cache"
+    response.file_to_stream.close()
+
+def test_compression_is_opt_in(rf, settings):
+    api = Api()
+    @api.route("/big", api=True, wove=False)
+    def big(request):
+        return [i for i in range(1000)]
+    request = rf.get("/api/big", HTTP_ACCEPT_ENCODING="gzip")
+    assert not api.router.get_view("/api/big")(request).has_header('Content-Encoding')
+    settings.BYRDIE_COMPRESSION = True
+    assert api.router.get_view("/api/big")(request)['Content-Encoding'] == "gzip"
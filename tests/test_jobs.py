@@ -0,0 +1,59 @@
+import json
+from datetime import timedelta
+import pytest
+from django.utils import timezone
+from byrdie.jobs import claim_next, job_view, requeue_stale, work
+from byrdie.models import Job
+from byrdie.views import call_exposed_method
+from tests.models import Counter
+
+
+def _call(rf, counter, body):
+    request = rf.post("/", data=json.dumps(body), content_type="application/json")
+    return call_exposed_method(request, "tests", "counter", counter.pk, "recount")
+
+@pytest.mark.django_db
+def test_background_method_is_queued_and_run_by_worker(rf):
+    counter = Counter.objects.create(label="Clicks", value=5)
+    response = _call(rf, counter, {"to": 9})
+    assert response.status_code == 202
+    payload = json.loads(response.content)
+    assert payload["status"] == "queued"
+    counter.refresh_from_db()
+    assert counter.value == 5
+    assert work(once=True) == 1
+    counter.refresh_from_db()
+    assert counter.value == 9
+    status = json.loads(job_view(rf.get("/"), payload["job"]).content)
+    assert status == {"job": payload["job"], "status": "done", "result": {"value": 9}, "error": ""}
+
+@pytest.mark.django_db
+def test_failed_job_records_error(rf):
+    counter = Counter.objects.create(label="Clicks")
+    job_id = json.loads(_call(rf, counter, {"unknown": 1}).content)["job"]
+    work(once=True)
+    job = Job.objects.get(pk=job_id)
+    assert job.status == Job.FAILED
+    assert "unknown" in job.error
+    assert job.finished_at is not None
+
+@pytest.mark.django_db
+def test_jobs_are_claimed_once():
+    counter = Counter.objects.create(label="Clicks")
+    Job.objects.create(app_label="tests", model_name="counter", object_pk=str(counter.pk), method_name="recount")
+    job = claim_next()
+    assert job.status == Job.RUNNING
+    assert claim_next() is None
+
+@pytest.mark.django_db
+def test_stale_running_jobs_are_requeued():
+    job = Job.objects.create(app_label="tests", model_name="counter", object_pk="1", method_name="recount",
+                             status=Job.RUNNING, started_at=timezone.now() - timedelta(hours=2))
+    assert requeue_stale(3600) == 1
+    job.refresh_from_db()
+    assert job.status == Job.QUEUED
+
+@pytest.mark.django_db
+def test_unknown_job_is_404(rf):
+    import uuid
+    assert job_view(rf.get("/"), uuid.uuid4()).status_code == 404
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import threading
+import pytest
+from byrdie import live
+from byrdie.live import InProcessBroker, instance_key, live_view, subscription_token
+from tests.models import Counter
+
+
+@pytest.mark.django_db
+def test_saves_are_broadcast_to_subscribers_after_commit(django_capture_on_commit_callbacks):
+    counter = Counter.objects.create(label="Clicks", value=1)
+    subscription = live.get_broker().subscribe([instance_key(counter)])
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            counter.value = 2
+            counter.save(update_fields=["value"])
+        message = json.loads(subscription.get(timeout=1))
+    finally:
+        subscription.close()
+    assert message == {"key": f"tests.counter:{counter.pk}", "state": {"value": 2}}
+
+@pytest.mark.django_db
+def test_deletes_are_broadcast(django_capture_on_commit_callbacks):
+    counter = Counter.objects.create(label="Clicks")
+    key = instance_key(counter)
+    subscription = live.get_broker().subscribe([key])
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            counter.delete()
+        assert json.loads(subscription.get(timeout=1)) == {"key": key, "deleted": True}
+    finally:
+        subscription.close()
+
+@pytest.mark.django_db
+def test_later_broadcasts_only_carry_changed_fields(django_capture_on_commit_callbacks):
+    counter = Counter.objects.create(label="Clicks", value=1)
+    subscription = live.get_broker().subscribe([instance_key(counter)])
+    try:
+        with django_capture_on_commit_callbacks(execute=True):
+            counter.value = 2
+            counter.save()
+        assert json.loads(subscription.get(timeout=1))["state"] == {"label": "Clicks", "value": 2}
+        with django_capture_on_commit_callbacks(execute=True):
+            counter.value = 3
+            counter.save()
+        assert json.loads(subscription.get(timeout=1))["state"] == {"value": 3}
+        with django_capture_on_commit_callbacks(execute=True):
+            counter.save()
+        assert subscription.get(timeout=0.05) is None
+    finally:
+        subscription.close()
+
+def test_async_subscription_receives_messages_from_other_threads():
+    broker = InProcessBroker()
+    async def listen():
+        subscription = broker.subscribe(["tests.counter:1"])
+        threading.Timer(0.01, broker.publish, args=("tests.counter:1", "hello")).start()
+        try:
+            return await subscription.aget(timeout=1)
+        finally:
+            subscription.close()
+    assert asyncio.run(listen()) == "hello"
+    assert not broker.has_subscribers("tests.counter:1")
+
+def test_slow_subscribers_drop_oldest_messages():
+    broker = InProcessBroker()
+    subscription = broker.subscribe(["k"])
+    subscription._queue.maxsize = 2
+    for message in ("a", "b", "c"):
+        broker.publish("k", message)
+    assert [subscription.get(0), subscription.get(0), subscription.get(0)] == ["b", "c", None]
+
+def test_event_stream_yields_messages_and_keepalives():
+    stream = live._event_stream({"tests.counter:7"}, heartbeat=0.01)
+    assert next(stream) == "retry: 3000\n\n"
+    live.get_broker().publish("tests.counter:7", '{"key": "tests.counter:7"}')
+    assert next(stream) == 'data: {"key": "tests.counter:7"}\n\n'
+    assert next(stream) == ": keepalive\n\n"
+    stream.close()
+    assert not live.get_broker().has_subscribers("tests.counter:7")
+
+def test_live_view_requires_signed_tokens(rf):
+    assert live_view(rf.get("/byrdie/live")).status_code == 400
+    assert live_view(rf.get("/byrdie/live", {"c": "tests.counter:1"})).status_code == 400
+    counter = Counter(pk=1, label="Clicks")
+    response = live_view(rf.get("/byrdie/live", {"c": subscription_token(counter)}))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "text/event-stream"
+    assert response["Cache-Control"] == "no-cache"
+
+def test_subscription_tokens_expire(rf, settings):
+    token = subscription_token(Counter(pk=1, label="Clicks"))
+    settings.BYRDIE_LIVE_TOKEN_MAX_AGE = -1
+    assert live_view(rf.get("/byrdie/live", {"c": token})).status_code == 400
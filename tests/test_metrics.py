@@ -0,0 +1,87 @@
+from byrdie.api import Api
+from byrdie.metrics import LatencyHistogram, MetricsRegistry, metrics_view, registry
+
+
+def test_server_timing_header(rf, settings):
+    settings.BYRDIE_SERVER_TIMING = True
+    api = Api()
+    @api.route("/timed", api=True, wove=False)
+    def timed(request):
+        return {"ok": True}
+    view = api.router.get_view("/api/timed")
+    response = view(rf.get("/api/timed"))
+    header = response['Server-Timing']
+    for name in ("auth", "view", "encode", "total"):
+        assert f"{name};dur=" in header
+
+def test_server_timing_includes_wove_tasks(rf, settings):
+    settings.BYRDIE_SERVER_TIMING = True
+    api = Api()
+    @api.route("/woven", api=True)
+    def woven(request, w):
+        @w.do
+        def numbers():
+            return [1, 2, 3]
+        @w.do
+        def total(numbers):
+            return {"total": sum(numbers)}
+    view = api.router.get_view("/api/woven")
+    response = view(rf.get("/api/woven"))
+    assert "wove.numbers;dur=" in response['Server-Timing']
+    assert "wove.total;dur=" in response['Server-Timing']
+
+def test_server_timing_can_be_disabled(rf, settings):
+    settings.BYRDIE_SERVER_TIMING = False
+    api = Api()
+    @api.route("/untimed", api=True, wove=False)
+    def untimed(request):
+        return {"ok": True}
+    response = api.router.get_view("/api/untimed")(rf.get("/api/untimed"))
+    assert not response.has_header('Server-Timing')
+
+def test_server_timing_defaults_to_debug(rf, settings):
+    api = Api()
+    @api.route("/default", api=True, wove=False)
+    def default(request):
+        return {"ok": True}
+    view = api.router.get_view("/api/default")
+    settings.DEBUG = False
+    assert not view(rf.get("/api/default")).has_header('Server-Timing')
+    settings.DEBUG = True
+    assert view(rf.get("/api/default")).has_header('Server-Timing')
+
+def test_latency_is_recorded_per_route(rf):
+    api = Api()
+    @api.route("/recorded/route", api=True, wove=False)
+    def recorded(request):
+        return {"ok": True}
+    view = api.router.get_view("/api/recorded/route")
+    before = registry.histograms.get("/api/recorded/route")
+    before_count = before.count if before else 0
+    view(rf.get("/api/recorded/route"))
+    assert registry.histograms["/api/recorded/route"].count == before_count + 1
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram(buckets=(0.1, 0.2, 0.3))
+    for _ in range(90):
+        histogram.observe(0.05)
+    for _ in range(10):
+        histogram.observe(0.25)
+    assert histogram.quantile(0.5) <= 0.1
+    assert 0.2 < histogram.quantile(0.99) <= 0.3
+
+def test_prometheus_rendering():
+    metrics = MetricsRegistry()
+    metrics.observe("/api/notes", 0.003)
+    text = metrics.render()
+    assert 'byrdie_request_duration_seconds_bucket{route="/api/notes",le="0.005"} 1' in text
+    assert 'byrdie_request_duration_seconds_count{route="/api/notes"} 1' in text
+    assert 'byrdie_request_duration_seconds_quantile{route="/api/notes",quantile="0.99"}' in text
+
+def test_metrics_endpoint_is_opt_in(rf, settings):
+    settings.BYRDIE_METRICS = False
+    assert metrics_view(rf.get("/byrdie/metrics")).status_code == 404
+    settings.BYRDIE_METRICS = True
+    response = metrics_view(rf.get("/byrdie/metrics"))
+    assert response.status_code == 200
+    assert response['Content-Type'].startswith('text/plain')
@@ -0,0 +1,61 @@
+import json
+from byrdie.api import Api
+from byrdie.multiplex import dispatch, multiplex_view
+
+
+def _api():
+    api = Api()
+    @api.route("/notes", api=True, wove=False)
+    def list_notes(request):
+        return {"q": request.GET.get("q"), "path": request.path}
+    @api.route("/tagged", api=True, wove=False)
+    def tagged(request):
+        from django.http import JsonResponse
+        response = JsonResponse({"tag": "a"})
+        response["ETag"] = '"v1"'
+        response["Cache-Control"] = "max-age=60"
+        return response
+    return api
+
+def test_dispatch_runs_get_subrequest(rf):
+    api = _api()
+    outer = rf.post("/byrdie/multiplex", HTTP_ACCEPT_ENCODING="gzip")
+    result = dispatch(outer, {"url": "/api/notes?q=hello"}, router=api.router)
+    assert result["status"] == 200
+    assert result["body"] == {"q": "hello", "path": "/api/notes"}
+    assert "Content-Encoding" not in result["headers"]
+
+def test_dispatch_unknown_route_is_404(rf):
+    api = _api()
+    result = dispatch(rf.post("/byrdie/multiplex"), {"url": "/api/missing"}, router=api.router)
+    assert result == {"status": 404, "headers": {}, "body": None}
+
+def test_dispatch_honours_if_none_match(rf):
+    api = _api()
+    outer = rf.post("/byrdie/multiplex")
+    first = dispatch(outer, {"url": "/api/tagged"}, router=api.router)
+    assert first["headers"]["ETag"] == '"v1"'
+    assert first["headers"]["Cache-Control"] == "max-age=60"
+    revalidated = dispatch(outer, {"url": "/api/tagged", "headers": {"If-None-Match": '"v1"'}}, router=api.router)
+    assert revalidated["status"] == 304
+    assert revalidated["body"] is None
+
+def test_multiplex_view_validates_body(rf, settings):
+    assert multiplex_view(rf.get("/byrdie/multiplex")).status_code == 405
+    bad = rf.post("/byrdie/multiplex", data="[]", content_type="application/json")
+    assert multiplex_view(bad).status_code == 400
+    settings.BYRDIE_MULTIPLEX_MAX = 1
+    body = json.dumps({"requests": [{"id": 1, "url": "/a"}, {"id": 2, "url": "/b"}]})
+    too_many = rf.post("/byrdie/multiplex", data=body, content_type="application/json")
+    assert multiplex_view(too_many).status_code == 400
+
+def test_resolvers_are_dropped_with_their_router():
+    import gc
+    from byrdie import multiplex
+    api = Api()
+    multiplex._resolver(api.router)
+    assert api.router in multiplex._resolvers
+    count = len(multiplex._resolvers)
+    del api
+    gc.collect()
+    assert len(multiplex._resolvers) == count - 1
@@ -0,0 +1,50 @@
+import datetime
+import json
+import pytest
+from byrdie.api import Api
+from byrdie.negotiation import decode_body, wants_msgpack
+from byrdie.views import call_exposed_method
+from tests.models import Counter
+
+msgpack = pytest.importorskip("msgpack")
+
+
+def test_accept_header_negotiation(rf):
+    assert wants_msgpack(rf.get("/", HTTP_ACCEPT="application/msgpack"))
+    assert wants_msgpack(rf.get("/", HTTP_ACCEPT="application/msgpack, application/json;q=0.9"))
+    assert not wants_msgpack(rf.get("/", HTTP_ACCEPT="application/json, application/msgpack;q=0.5"))
+    assert not wants_msgpack(rf.get("/", HTTP_ACCEPT="application/msgpack;q=0"))
+    assert not wants_msgpack(rf.get("/"))
+
+def test_api_route_responds_with_msgpack_when_preferred(rf):
+    api = Api()
+    @api.route("/stats", api=True, wove=False)
+    def stats(request):
+        return {"count": 3, "when": datetime.date(2024, 1, 2)}
+    view = api.router.get_view("/api/stats")
+    packed = view(rf.get("/api/stats", HTTP_ACCEPT="application/msgpack"))
+    assert packed["Content-Type"] == "application/msgpack"
+    assert "Accept" in packed["Vary"]
+    assert msgpack.unpackb(packed.content) == {"count": 3, "when": "2024-01-02"}
+    plain = view(rf.get("/api/stats"))
+    assert json.loads(plain.content) == {"count": 3, "when": "2024-01-02"}
+
+def test_msgpack_request_body_is_decoded(rf):
+    request = rf.post("/", data=msgpack.packb({"by": 2}), content_type="application/msgpack")
+    assert decode_body(request) == {"by": 2}
+    bad = rf.post("/", data=b"\xc1", content_type="application/msgpack")
+    with pytest.raises(ValueError):
+        decode_body(bad)
+
+@pytest.mark.django_db
+def test_exposed_method_call_accepts_and_returns_msgpack(rf, tmp_path, settings):
+    settings.TEMPLATES = [{**settings.TEMPLATES[0], "DIRS": [str(tmp_path)]}]
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "counter.html").write_text("<div>{{ object.value }}</div>")
+    counter = Counter.objects.create(label="Clicks", value=1)
+    request = rf.post("/", data=msgpack.packb({"by": 4}), content_type="application/msgpack",
+                      HTTP_ACCEPT="application/msgpack")
+    response = call_exposed_method(request, "tests", "counter", counter.pk, "increment")
+    payload = msgpack.unpackb(response.content)
+    assert payload["result"] == 5
+    assert payload["state"] == {"value": 5}
@@ -0,0 +1,130 @@
+import pytest
+import json
+from typing import List
+from byrdie.api import Api, action
+from byrdie.schemas import Schema, ModelSchema
+from tests.models import SerializedModel
+
+
+class ItemSchema(Schema):
+    name: str
+    value: int
+
+
+@pytest.mark.django_db
+def test_keyset_pagination_walks_all_pages(rf):
+    api = Api()
+    for i in range(5):
+        SerializedModel.objects.create(name=f"item{i}", value=i, secret="x")
+    @api.route("/items", api=True, wove=False, paginate=2)
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    view = api.router.get_view("/api/items")
+    seen = []
+    url = "/api/items"
+    pages = 0
+    while url:
+        response = view(rf.get(url))
+        data = json.loads(response.content)
+        seen.extend(row["value"] for row in data["results"])
+        url = data["next"]
+        pages += 1
+    assert seen == [0, 1, 2, 3, 4]
+    assert pages == 3
+
+@pytest.mark.django_db
+def test_keyset_pagination_descending_ordering(rf):
+    api = Api()
+    for i in range(3):
+        SerializedModel.objects.create(name=f"item{i}", value=i % 2, secret="x")
+    @api.route("/items", api=True, wove=False, paginate=2)
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.order_by("-value")
+    view = api.router.get_view("/api/items")
+    first = json.loads(view(rf.get("/api/items")).content)
+    second = json.loads(view(rf.get(first["next"])).content)
+    names = [row["name"] for row in first["results"] + second["results"]]
+    assert names == ["item1", "item2", "item0"]
+    assert second["next"] is None
+
+@pytest.mark.django_db
+def test_page_size_is_capped(rf):
+    from byrdie.pagination import KeysetPagination
+    api = Api()
+    for i in range(5):
+        SerializedModel.objects.create(name=f"item{i}", value=i, secret="x")
+    @api.route("/items", api=True, wove=False, paginate=KeysetPagination(page_size=2, max_page_size=3))
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    view = api.router.get_view("/api/items")
+    data = json.loads(view(rf.get("/api/items?limit=100")).content)
+    assert len(data["results"]) == 3
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_bad_request(rf):
+    api = Api()
+    @api.route("/items", api=True, wove=False, paginate=True)
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    view = api.router.get_view("/api/items")
+    response = view(rf.get("/api/items?cursor=not-a-cursor"))
+    assert response.status_code == 400
+
+@pytest.mark.django_db
+def test_cursor_values_must_match_the_ordering_fields(rf):
+    from byrdie.pagination import encode_cursor
+    api = Api()
+    @api.route("/items", api=True, wove=False, paginate="value")
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    view = api.router.get_view("/api/items")
+    for values in ([{}, 1], [1, "abc"], [None, 1], [[1], 1]):
+        response = view(rf.get("/api/items", {"cursor": encode_cursor(values)}))
+        assert response.status_code == 400
+    assert view(rf.get("/api/items", {"cursor": encode_cursor(["5", "1"])})).status_code == 200
+
+@pytest.mark.django_db
+def test_nullable_ordering_fields_are_rejected(rf):
+    from tests.models import LineItem
+    api = Api()
+    @api.route("/lines", api=True, wove=False, paginate="ships_in")
+    def lines(request):
+        return LineItem.objects.all()
+    with pytest.raises(TypeError):
+        api.router.get_view("/api/lines")(rf.get("/api/lines"))
+
+@pytest.mark.django_db
+def test_schema_classmethod_pagination(rf):
+    api = Api()
+    class SerializedModelSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name']
+        @classmethod
+        @action(wove=False, paginate=1)
+        def latest(cls, request):
+            return SerializedModel.objects.order_by('-id')
+    api.add_schema(SerializedModelSchema)
+    SerializedModel.objects.create(name="a", value=1, secret="x")
+    SerializedModel.objects.create(name="b", value=2, secret="x")
+    view = api.router.get_view("/serializedmodel/latest")
+    data = json.loads(view(rf.get("/serializedmodel/latest")).content)
+    assert [row["name"] for row in data["results"]] == ["b"]
+    assert data["cursor"] is not None
+
+@pytest.mark.django_db
+def test_fields_keep_the_ordering_columns_loaded(rf, django_assert_num_queries):
+    from byrdie.pagination import KeysetPagination
+    api = Api()
+    for i in range(3):
+        SerializedModel.objects.create(name=f"item{i}", value=i, secret="x")
+    @api.route("/items", api=True, wove=False, paginate=KeysetPagination(ordering=["value"], page_size=2))
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    view = api.router.get_view("/api/items")
+    with django_assert_num_queries(1):
+        data = json.loads(view(rf.get("/api/items?fields=name")).content)
+    assert data["results"] == [{"name": "item0"}, {"name": "item1"}]
+    with django_assert_num_queries(1):
+        data = json.loads(view(rf.get(data["next"])).content)
+    assert data["results"] == [{"name": "item2"}]
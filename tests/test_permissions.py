@@ -0,0 +1,107 @@
+import pytest
+from django.contrib.auth.models import Group, Permission, User
+from byrdie import permissions
+from byrdie.api import Api
+from byrdie.permissions import RequiredPermissions, cached_permission, compile_permissions
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def clear_permission_cache():
+    permissions.forget_all()
+    yield
+    permissions.forget_all()
+
+def _request(rf, user):
+    request = rf.get("/")
+    # A fresh instance per request, as the auth middleware would load it
+    request.user = User.objects.get(pk=user.pk)
+    return request
+
+def _grant(user, codename):
+    user.user_permissions.add(Permission.objects.get(codename=codename))
+
+def test_declarative_permissions_are_compiled_at_registration(rf):
+    api = Api()
+    @api.route("/users", has_permissions=["auth.view_user"], wove=False)
+    def list_users(request):
+        return "ok"
+    view = api.router.get_view("/users")
+    user = User.objects.create_user("ada")
+    assert view(_request(rf, user)).status_code == 403
+    _grant(user, "view_user")
+    assert view(_request(rf, user)).status_code == 200
+
+def test_permission_set_is_loaded_once_across_requests(rf, django_assert_num_queries):
+    user = User.objects.create_user("ada")
+    _grant(user, "view_user")
+    check = RequiredPermissions(["auth.view_user"])
+    assert check(_request(rf, user))
+    request = _request(rf, user)
+    with django_assert_num_queries(0):
+        assert check(request)
+        assert not RequiredPermissions(["auth.change_user"])(request)
+
+def test_group_permission_changes_invalidate(rf):
+    user = User.objects.create_user("ada")
+    group = Group.objects.create(name="staff")
+    user.groups.add(group)
+    check = RequiredPermissions(["auth.view_user"])
+    assert not check(_request(rf, user))
+    group.permissions.add(Permission.objects.get(codename="view_user"))
+    assert check(_request(rf, user))
+
+def test_anonymous_users_have_no_permissions(rf):
+    from django.contrib.auth.models import AnonymousUser
+    request = rf.get("/")
+    request.user = AnonymousUser()
+    assert not RequiredPermissions(["auth.view_user"])(request)
+
+def test_plain_callables_run_once_per_request(rf):
+    calls = []
+    def allowed(request):
+        calls.append(request)
+        return True
+    check = compile_permissions(allowed)
+    user = User.objects.create_user("ada")
+    request = _request(rf, user)
+    assert check(request) and check(request)
+    assert check(_request(rf, user))
+    assert len(calls) == 2
+
+def test_cached_permission_is_reused_per_user_and_key(rf):
+    calls = []
+    @cached_permission(key=lambda request: request.GET.get("note"))
+    def can_edit(request):
+        calls.append(1)
+        return True
+    check = compile_permissions(can_edit)
+    user = User.objects.create_user("ada")
+    for note in ("1", "1", "2"):
+        request = rf.get("/", {"note": note})
+        request.user = user
+        assert check(request)
+    assert len(calls) == 2
+    user.save()
+    request = rf.get("/", {"note": "1"})
+    request.user = user
+    check(request)
+    assert len(calls) == 3
+
+def test_result_cache_is_bounded_and_prunes_expired(rf, settings):
+    settings.BYRDIE_PERMISSION_CACHE_SIZE = 3
+    @cached_permission(key=lambda request: request.GET.get("note"), ttl=60)
+    def can_edit(request):
+        return True
+    @cached_permission(key=lambda request: "short", ttl=-1)
+    def expired(request):
+        return True
+    user = User.objects.create_user("ada")
+    for check, note in [(expired, None)] + [(can_edit, str(n)) for n in range(5)]:
+        request = rf.get("/", {"note": note} if note else {})
+        request.user = user
+        compile_permissions(check)(request)
+    assert [key[1][1] for key in permissions._results] == ["2", "3", "4"]
+    permissions.forget_user(user.pk)
+    assert not permissions._results and not permissions._keys_by_user
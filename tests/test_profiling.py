@@ -0,0 +1,108 @@
+import threading
+import time
+import pytest
+from wove import weave
+from byrdie.api import Api
+from byrdie.profiling import ProfileStore, collapsed, make_profile_token, profiles_view
+from byrdie import profiling
+
+
+@pytest.fixture
+def profile_store(tmp_path, settings, monkeypatch):
+    settings.BYRDIE_PROFILING = True
+    settings.BYRDIE_PROFILE_INTERVAL_MS = 1
+    store = ProfileStore(directory=str(tmp_path), keep=2)
+    monkeypatch.setattr(profiling, 'store', store)
+    return store
+
+def test_slow_request_is_profiled(rf, settings, profile_store):
+    settings.BYRDIE_PROFILE_THRESHOLD_MS = 10
+    api = Api()
+    @api.route("/slow", api=True, wove=False)
+    def slow(request):
+        time.sleep(0.05)
+        return {"ok": True}
+    response = api.router.get_view("/api/slow")(rf.get("/api/slow"))
+    profile = profile_store.load(response['X-Byrdie-Profile'])
+    assert profile['route'] == "/api/slow"
+    assert profile['reason'] == "threshold"
+    assert "slow (test_profiling.py" in collapsed(profile)
+
+def test_fast_request_is_not_profiled(rf, settings, profile_store):
+    settings.BYRDIE_PROFILE_THRESHOLD_MS = 10000
+    api = Api()
+    @api.route("/fast", api=True, wove=False)
+    def fast(request):
+        return {"ok": True}
+    response = api.router.get_view("/api/fast")(rf.get("/api/fast"))
+    assert not response.has_header('X-Byrdie-Profile')
+    assert profile_store.ids() == []
+
+def test_signed_token_forces_profile(rf, settings, profile_store):
+    settings.BYRDIE_PROFILE_THRESHOLD_MS = None
+    api = Api()
+    @api.route("/fast", api=True, wove=False)
+    def fast(request):
+        return {"ok": True}
+    view = api.router.get_view("/api/fast")
+    assert not view(rf.get("/api/fast?__profile=forged")).has_header('X-Byrdie-Profile')
+    response = view(rf.get(f"/api/fast?page=2&__profile={make_profile_token()}"))
+    profile = profile_store.load(response['X-Byrdie-Profile'])
+    assert profile['reason'] == "token"
+    assert profile['path'] == "/api/fast?page=2"
+
+def test_profile_store_is_bounded(profile_store):
+    for i in range(4):
+        profile_store.save({'stacks': {}, 'n': i})
+    ids = profile_store.ids()
+    assert len(ids) == 2
+    assert profile_store.load(ids[-1])['n'] == 3
+
+def test_profiles_endpoint(rf, settings, profile_store):
+    settings.DEBUG = True
+    profile_id = profile_store.save({'route': '/r', 'path': '/r', 'duration_ms': 1, 'reason': 'token', 'created': 0, 'stacks': {'request;a;b': 3}})
+    assert profiles_view(rf.get("/byrdie/profiles"), profile_id).content == b"request;a;b 3\n"
+    settings.DEBUG = False
+    assert profiles_view(rf.get("/byrdie/profiles"), profile_id).status_code == 404
+
+def test_sample_rate_skips_unsampled_requests(rf, settings, profile_store):
+    settings.BYRDIE_PROFILE_THRESHOLD_MS = 0
+    settings.BYRDIE_PROFILE_SAMPLE_RATE = 0
+    api = Api()
+    @api.route("/fast", api=True, wove=False)
+    def fast(request):
+        return {"ok": True}
+    view = api.router.get_view("/api/fast")
+    assert not view(rf.get("/api/fast")).has_header('X-Byrdie-Profile')
+    assert view(rf.get(f"/api/fast?__profile={make_profile_token()}")).has_header('X-Byrdie-Profile')
+
+def test_only_the_requests_own_workers_are_sampled(rf, settings, profile_store):
+    settings.BYRDIE_PROFILE_THRESHOLD_MS = 10
+    started = threading.Event()
+    release = threading.Event()
+    def other_request():
+        with weave() as w:
+            @w.do
+            def unrelated_task():
+                started.set()
+                deadline = time.monotonic() + 5
+                while not release.is_set() and time.monotonic() < deadline:
+                    pass
+    other = threading.Thread(target=other_request)
+    other.start()
+    started.wait(5)
+    api = Api()
+    @api.route("/woven", api=True)
+    def woven(request, w):
+        @w.do
+        def own_task():
+            time.sleep(0.05)
+            return {"ok": True}
+    try:
+        response = api.router.get_view("/api/woven")(rf.get("/api/woven"))
+    finally:
+        release.set()
+        other.join()
+    stacks = collapsed(profile_store.load(response['X-Byrdie-Profile']))
+    assert "own_task (test_profiling.py" in stacks
+    assert "unrelated_task" not in stacks
@@ -0,0 +1,40 @@
+import os
+import pytest
+
+pytest_plugins = ["pytester"]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+N_PLUS_ONE = """
+import pytest
+from byrdie.api import Api
+from tests.models import Note
+
+@pytest.mark.django_db
+def test_notes(rf):
+    notes = [Note.objects.create(content=str(i)) for i in range(5)]
+    api = Api()
+    @api.route("/notes", api=True, wove=False, query_budget=3)
+    def each_note(request):
+        return [Note.objects.get(pk=note.pk).content for note in notes]
+    api.router.get_view("/api/notes")(rf.get("/api/notes"))
+"""
+
+@pytest.fixture
+def run(pytester, monkeypatch):
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join([os.path.join(ROOT, "src"), ROOT]))
+    pytester.makepyfile(test_notes=N_PLUS_ONE)
+    def run(*args):
+        return pytester.runpytest_subprocess("-p", "byrdie.pytest_plugin", "--ds", "byrdie.tests.settings", *args)
+    return run
+
+def test_route_over_its_query_budget_fails_the_test(run):
+    result = run()
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*ran 5 queries, over its budget of 3*"])
+
+def test_n_plus_one_fails_only_when_asked(run):
+    run("--byrdie-ignore-query-budgets").assert_outcomes(passed=1)
+    result = run("--byrdie-fail-on-n-plus-one")
+    result.assert_outcomes(failed=1)
+    result.stdout.fnmatch_lines(["*possible N+1*"])
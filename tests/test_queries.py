@@ -0,0 +1,59 @@
+import pytest
+from byrdie import queries
+from byrdie.api import Api
+from byrdie.queries import query_shape
+from tests.models import Note
+
+
+@pytest.fixture
+def tracking(settings):
+    settings.BYRDIE_QUERY_TRACKING = True
+    with queries.collect_violations() as violations:
+        yield violations
+
+def test_query_shape_ignores_parameters():
+    first = query_shape('SELECT * FROM note WHERE id IN (%s, %s) LIMIT 21')
+    second = query_shape('SELECT *  FROM note\n WHERE id IN (%s) LIMIT 5')
+    assert first == second
+
+@pytest.mark.django_db
+def test_query_count_header(rf, tracking, settings):
+    settings.BYRDIE_SERVER_TIMING = True
+    api = Api()
+    @api.route("/notes", api=True, wove=False)
+    def notes(request):
+        return [note.content for note in Note.objects.all()]
+    response = api.router.get_view("/api/notes")(rf.get("/api/notes"))
+    assert response['X-Byrdie-Queries'] == "1"
+    assert "db;dur=" in response['Server-Timing']
+    assert tracking == []
+
+@pytest.mark.django_db
+def test_query_budget_violation_is_reported(rf, tracking, caplog):
+    api = Api()
+    @api.route("/notes", api=True, wove=False, query_budget=1)
+    def notes(request):
+        return {"first": Note.objects.count(), "second": Note.objects.count()}
+    api.router.get_view("/api/notes")(rf.get("/api/notes"))
+    assert [v.kind for v in tracking] == ["budget"]
+    assert "over its budget of 1" in caplog.text
+
+@pytest.mark.django_db
+def test_repeated_query_shapes_are_flagged(rf, tracking):
+    api = Api()
+    notes = [Note.objects.create(content=str(i)) for i in range(5)]
+    @api.route("/notes", api=True, wove=False)
+    def each_note(request):
+        return [Note.objects.get(pk=note.pk).content for note in notes]
+    api.router.get_view("/api/notes")(rf.get("/api/notes"))
+    assert [v.kind for v in tracking] == ["n+1"]
+
+@pytest.mark.django_db
+def test_tracking_disabled(rf, settings):
+    settings.BYRDIE_QUERY_TRACKING = False
+    api = Api()
+    @api.route("/notes", api=True, wove=False, query_budget=0)
+    def notes(request):
+        return {"count": Note.objects.count()}
+    response = api.router.get_view("/api/notes")(rf.get("/api/notes"))
+    assert not response.has_header('X-Byrdie-Queries')
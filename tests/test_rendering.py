@@ -2,7 +2,7 @@ from django.test import TestCase
 from django.db import models
 from django.template import Template, Context
 from byrdie.rendering import render_component
-from .models import Note, ExposedModel
+from .models import Counter, Note, ExposedModel
 import os
 import json
 
@@ -78,3 +78,21 @@ class RenderingTest(TestCase):
         instance = AnotherModel()
         rendered_html = render_component(instance)
         self.assertEqual(rendered_html.strip(), '<!-- Component template not found: components/anothermodel.html -->')
+
+    def test_render_exposed_method_returns_fragment_and_state_diff(self):
+        from django.test import RequestFactory
+        from byrdie.views import call_exposed_method
+        counter_template_path = os.path.join(self.components_dir, 'counter.html')
+        with open(counter_template_path, 'w') as f:
+            f.write('<div>{{ object.label }}: {{ object.value }}</div>')
+        try:
+            instance = Counter.objects.create(label='Clicks', value=1)
+            request = RequestFactory().post('/', data='{"by": 2}', content_type='application/json')
+            response = call_exposed_method(request, 'tests', 'counter', instance.pk, 'increment')
+        finally:
+            os.remove(counter_template_path)
+        payload = json.loads(response.content)
+        self.assertEqual(payload['result'], 3)
+        self.assertEqual(payload['state'], {'value': 3})
+        self.assertIn('>Clicks: 3</div>', payload['html'])
+        self.assertIn('"value": 3', payload['html'])
@@ -0,0 +1,84 @@
+import pytest
+from byrdie.api import Api
+from byrdie.replicas import PIN_COOKIE
+from tests.models import Note
+
+pytestmark = pytest.mark.django_db(transaction=True, databases=["default", "replica"])
+
+
+@pytest.fixture
+def notes(settings):
+    settings.BYRDIE_READ_REPLICA = "replica"
+    Note.objects.using("default").create(content="primary 1")
+    Note.objects.using("default").create(content="primary 2")
+    Note.objects.using("replica").create(content="replica 1")
+
+def _api():
+    api = Api()
+    @api.route("/notes/count", api=True, wove=False)
+    def count_notes(request):
+        return {"count": Note.objects.count()}
+    @api.route("/notes/count-in-wove", api=True)
+    def count_notes_in_wove(request, w):
+        @w.do
+        def count():
+            return {"count": Note.objects.count()}
+    @api.route("/notes/touch", api=True, wove=False)
+    def touch(request):
+        Note.objects.create(content="written during a GET")
+        return {"count": Note.objects.count()}
+    return api
+
+def _count(api, path, request):
+    import json
+    response = api.router.get_view(path)(request)
+    return json.loads(response.content)["count"], response
+
+def test_get_reads_go_to_replica(rf, notes):
+    api = _api()
+    assert _count(api, "/api/notes/count", rf.get("/"))[0] == 1
+
+def test_wove_tasks_read_from_replica(rf, notes):
+    api = _api()
+    assert _count(api, "/api/notes/count-in-wove", rf.get("/"))[0] == 1
+
+def test_writes_pin_the_client_to_primary(rf, notes):
+    api = _api()
+    _, response = _count(api, "/api/notes/count", rf.post("/"))
+    assert PIN_COOKIE in response.cookies
+    pinned = rf.get("/")
+    pinned.COOKIES[PIN_COOKIE] = response.cookies[PIN_COOKIE].value
+    assert _count(api, "/api/notes/count", pinned)[0] == 2
+
+def test_reads_after_a_write_in_the_same_request_use_primary(rf, notes):
+    api = _api()
+    count, response = _count(api, "/api/notes/touch", rf.get("/"))
+    assert count == 3
+    assert PIN_COOKIE in response.cookies
+
+def test_replica_is_off_by_default(rf, notes, settings):
+    settings.BYRDIE_READ_REPLICA = None
+    api = _api()
+    assert _count(api, "/api/notes/count", rf.get("/"))[0] == 2
+
+def test_auth_models_are_read_from_primary(settings):
+    from django.contrib.auth.models import Group, Permission, User
+    from byrdie.replicas import ReplicaRouter, use_replica
+    router = ReplicaRouter()
+    with use_replica("replica"):
+        assert router.db_for_read(Note) == "replica"
+        for model in (User, Group, Permission):
+            assert router.db_for_read(model) is None
+
+def test_session_changes_pin_the_client_to_primary(rf, settings):
+    from django.contrib.sessions.middleware import SessionMiddleware
+    from django.http import HttpResponse
+    from byrdie.replicas import route_reads
+    settings.BYRDIE_READ_REPLICA = "replica"
+    settings.SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+    def remember(request):
+        request.session["seen"] = True
+        return HttpResponse("ok")
+    request = rf.get("/")
+    SessionMiddleware(lambda r: None).process_request(request)
+    assert PIN_COOKIE in route_reads(remember)(request).cookies
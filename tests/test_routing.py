@@ -2,7 +2,7 @@ import pytest
 import json
 from byrdie.api import Api, action
 from byrdie.schemas import Schema, ModelSchema
-from django.http import JsonResponse, HttpResponse
+from django.http import JsonResponse, HttpResponse, HttpResponseForbidden
 from tests.models import TestModel
 
 
@@ -157,3 +157,148 @@ def test_model_schema_instance_method_route_custom_path(rf):
     assert response.status_code == 200
     assert response.content == b"Action on Test Instance"
 
+
+def test_urls_are_cached_and_updated_incrementally():
+    api = Api()
+    @api.route("/first")
+    def first(request):
+        pass
+    urls = api.urls
+    version = api.router.version
+    assert api.urls is urls
+    assert [str(p.pattern) for p in urls] == ["first"]
+    @api.route("/second")
+    def second(request):
+        pass
+    assert api.urls is urls
+    assert [str(p.pattern) for p in urls] == ["first", "second"]
+    assert api.router.version == version + 1
+
+def test_hot_registered_route_resolves():
+    from django.urls import URLResolver
+    from django.urls.resolvers import RegexPattern
+    api = Api()
+    resolver = URLResolver(RegexPattern(r'^/'), api.urls)
+    @api.route("/hot/route")
+    def hot_route(request):
+        pass
+    assert resolver.resolve("/hot/route").func is hot_route
+
+def test_provisional_registration_replaces_pattern():
+    api = Api()
+    def view1(request):
+        pass
+    def view2(request):
+        pass
+    api.router.register("/replace", view1)
+    api.router.register("/replace", view2, is_provisional=True)
+    assert len(api.urls) == 1
+    assert api.urls[0].callback is view2
+    assert view1 not in api.router.views
+
+def test_route_manifest_is_rebuilt_only_when_routes_change():
+    api = Api()
+    @api.route("/api/notes")
+    def list_notes(request):
+        pass
+    script, digest = api.router.manifest()
+    assert script == 'window.byrdie_routes = {"list_notes": "/api/notes"};\n'
+    assert api.router.manifest() == (script, digest)
+    @api.route("/api/tags")
+    def list_tags(request):
+        pass
+    new_script, new_digest = api.router.manifest()
+    assert '"list_tags": "/api/tags"' in new_script
+    assert new_digest != digest
+
+def test_route_manifest_view_cache_headers(rf):
+    from byrdie.api import api as global_api, route_manifest
+    script, digest = global_api.router.manifest()
+    response = route_manifest(rf.get("/"), digest)
+    assert response.content.decode() == script
+    assert response["Content-Type"].startswith("text/javascript")
+    assert "immutable" in response["Cache-Control"]
+    stale = route_manifest(rf.get("/"), "000000000000")
+    assert stale.content.decode() == script
+    assert stale["Cache-Control"] == "no-cache"
+
+@pytest.mark.django_db
+def test_model_schema_batch_route(rf):
+    api = Api()
+    class TestModelSchema(ModelSchema):
+        class Meta:
+            model = TestModel
+            fields = ['id', 'name']
+        @action(wove=False)
+        def retrieve(self, request, pk: int):
+            return {"name": self.name.upper(), "pk": pk}
+    api.add_schema(TestModelSchema)
+    first = TestModel.objects.create(name="first")
+    second = TestModel.objects.create(name="second")
+    view = api.router.get_view("/testmodel/batch/retrieve")
+    assert view is not None
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(rf.get(f"/testmodel/batch/retrieve?pk={first.pk},{second.pk},999"))
+    assert len(ctx.captured_queries) == 1
+    data = json.loads(response.content)
+    assert data["results"] == {
+        str(first.pk): {"name": "FIRST", "pk": first.pk},
+        str(second.pk): {"name": "SECOND", "pk": second.pk},
+    }
+    assert data["missing"] == [999]
+
+@pytest.mark.django_db
+def test_model_schema_batch_route_parallel(rf):
+    api = Api()
+    class TestModelSchema(ModelSchema):
+        class Meta:
+            model = TestModel
+            fields = ['id', 'name']
+        @action("/shout", wove=False, parallel=True)
+        def shout(self, request, pk: int):
+            return HttpResponse(self.name + "!")
+    api.add_schema(TestModelSchema)
+    instances = [TestModel.objects.create(name=f"n{i}") for i in range(3)]
+    view = api.router.get_view("/testmodel/batch/shout")
+    pks = ",".join(str(i.pk) for i in instances)
+    data = json.loads(view(rf.get(f"/testmodel/batch/shout?pk={pks}")).content)
+    assert data["results"] == {str(i.pk): f"{i.name}!" for i in instances}
+
+@pytest.mark.django_db
+def test_model_schema_batch_route_keeps_item_error_statuses(rf):
+    api = Api()
+    class TestModelSchema(ModelSchema):
+        class Meta:
+            model = TestModel
+            fields = ['id', 'name']
+        @action("/publish", wove=False)
+        def publish(self, request, pk: int):
+            if self.name == "locked":
+                return HttpResponseForbidden("locked")
+            return {"published": pk}
+    api.add_schema(TestModelSchema)
+    ok = TestModel.objects.create(name="ok")
+    locked = TestModel.objects.create(name="locked")
+    view = api.router.get_view("/testmodel/batch/publish")
+    response = view(rf.get(f"/testmodel/batch/publish?pk={ok.pk},{locked.pk}"))
+    data = json.loads(response.content)
+    assert response.status_code == 200
+    assert data["results"] == {str(ok.pk): {"published": ok.pk}}
+    assert data["errors"] == {str(locked.pk): {"status": 403, "body": "locked"}}
+
+@pytest.mark.django_db
+def test_model_schema_batch_route_rejects_bad_pks(rf):
+    api = Api()
+    class TestModelSchema(ModelSchema):
+        class Meta:
+            model = TestModel
+            fields = ['id', 'name']
+        @action(wove=False)
+        def retrieve(self, request, pk: int):
+            return {}
+    api.add_schema(TestModelSchema)
+    view = api.router.get_view("/testmodel/batch/retrieve")
+    assert view(rf.get("/testmodel/batch/retrieve?pk=a,b")).status_code == 400
+    assert view(rf.get("/testmodel/batch/retrieve")).status_code == 400
@@ -1,8 +1,8 @@
 import pytest
 import json
 from django.http import HttpRequest, HttpResponse, JsonResponse
-from byrdie.schemas import Schema, ModelSchema
-from typing import List
+from byrdie.schemas import INPUT_CONTEXT, Schema, ModelSchema
+from typing import List, get_args
 from tests.models import SerializedModel, UnserializedModel
 from byrdie.api import Api
 
@@ -117,3 +117,260 @@ def test_simple_registration_in_serialization_file():
     view = api.router.get_view("/test")
     assert view is not None
 
+
+@pytest.mark.django_db
+def test_field_projection_narrows_payload_and_columns(rf):
+    api = Api()
+    class ItemSchema(Schema):
+        name: str
+        value: int
+    @api.route("/items", api=True, wove=False)
+    def items(request) -> List[ItemSchema]:
+        return SerializedModel.objects.all()
+    SerializedModel.objects.create(name="Test", value=1, secret="s")
+    view = api.router.get_view("/api/items")
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    with CaptureQueriesContext(connection) as ctx:
+        response = view(rf.get("/api/items?fields=name"))
+    assert json.loads(response.content) == [{"name": "Test"}]
+    assert '"value"' not in ctx.captured_queries[0]['sql']
+
+def test_field_projection_rejects_unknown_fields(rf):
+    api = Api()
+    class ItemSchema(Schema):
+        name: str
+    @api.route("/item", api=True, wove=False)
+    def item(request) -> ItemSchema:
+        return {"name": "Test"}
+    view = api.router.get_view("/api/item")
+    response = view(rf.get("/api/item?fields=name,secret"))
+    assert response.status_code == 400
+
+def test_projected_schemas_are_cached():
+    from byrdie.schemas import project_schema
+    class ItemSchema(Schema):
+        name: str
+        value: int
+    first = project_schema(ItemSchema, ["name"])
+    assert project_schema(ItemSchema, ["name"]) is first
+    assert list(first.model_fields) == ["name"]
+    assert get_args(project_schema(List[ItemSchema], ["name"]))[0] is first
+
+def test_projections_keep_config_and_skip_decorated_schemas():
+    from pydantic import ConfigDict, field_serializer
+    from byrdie.schemas import project_schema
+    class StrictSchema(Schema):
+        model_config = ConfigDict(from_attributes=True, str_strip_whitespace=True)
+        name: str
+        value: int
+    assert project_schema(StrictSchema, ["name"]).model_validate({"name": " a "}).name == "a"
+    class SerializedSchema(Schema):
+        name: str
+        value: int
+        @field_serializer("name")
+        def shout(self, name):
+            return name.upper()
+    assert project_schema(SerializedSchema, ["name"]) is SerializedSchema
+
+def test_projection_cache_is_bounded(settings):
+    from byrdie import schemas
+    settings.BYRDIE_MAX_PROJECTIONS = 2
+    class WideSchema(Schema):
+        a: int
+        b: int
+        c: int
+    for fields in (["a"], ["b"], ["c"]):
+        schemas.project_schema(WideSchema, fields)
+    assert [key[1] for key in schemas._projections if key[0] is WideSchema] == [frozenset("b"), frozenset("c")]
+
+@pytest.mark.django_db
+def test_bulk_create_and_update_endpoints(rf):
+    from byrdie.schemas import ModelSchema
+    api = Api()
+    class BulkSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name', 'value', 'secret']
+    api.add_schema(BulkSchema, bulk=True, batch_size=2)
+    create = api.router.get_view("/bulk/bulk/create")
+    rows = [
+        {"name": "a", "value": 1, "secret": "s"},
+        {"name": "b", "value": "not a number", "secret": "s"},
+        {"name": "c", "value": 3, "secret": "s"},
+    ]
+    response = create(rf.post("/bulk/bulk/create", data=json.dumps(rows), content_type="application/json"))
+    data = json.loads(response.content)
+    assert len(data["created"]) == 2
+    assert list(data["errors"]) == ["1"]
+    assert SerializedModel.objects.count() == 2
+
+    update = api.router.get_view("/bulk/bulk/update")
+    first, second = data["created"]
+    rows = [
+        {"id": first, "name": "a2", "value": 10, "secret": "s"},
+        {"id": 999, "name": "x", "value": 0, "secret": "s"},
+    ]
+    response = update(rf.post("/bulk/bulk/update", data=json.dumps(rows), content_type="application/json"))
+    data = json.loads(response.content)
+    assert data["updated"] == [first]
+    assert list(data["errors"]) == ["1"]
+    assert SerializedModel.objects.get(pk=first).value == 10
+
+def test_bulk_endpoint_requires_json_array(rf):
+    from byrdie.schemas import ModelSchema
+    api = Api()
+    class BulkSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name']
+    api.add_schema(BulkSchema, bulk=True)
+    create = api.router.get_view("/bulk/bulk/create")
+    assert create(rf.get("/bulk/bulk/create")).status_code == 405
+    response = create(rf.post("/bulk/bulk/create", data='{"name": "a"}', content_type="application/json"))
+    assert response.status_code == 400
+
+def test_bulk_registration_requires_the_primary_key():
+    from byrdie.schemas import ModelSchema
+    api = Api()
+    class NamesSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['name']
+    with pytest.raises(TypeError, match="must include 'id'"):
+        api.add_schema(NamesSchema, bulk=True)
+    assert "/names/bulk/update" not in api.router.routes
+
+@pytest.mark.django_db
+def test_model_schema_batch_is_columnar():
+    from array import array
+    class BatchSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name', 'value']
+    SerializedModel.objects.create(name="a", value=1, secret="s")
+    SerializedModel.objects.create(name="b", value=2, secret="s")
+    batch = BatchSchema.batch(SerializedModel.objects.order_by('id')[:2])
+    assert len(batch) == 2
+    assert isinstance(batch.column('value'), array)
+    assert batch.to_columns()['name'] == ["a", "b"]
+    assert batch[1].name == "b"
+    expected = [BatchSchema.model_validate(m).model_dump() for m in SerializedModel.objects.order_by('id')]
+    assert batch.to_dicts() == expected
+    assert [row.value for row in BatchSchema.batch([{"id": 1, "name": "x", "value": "7"}])] == [7]
+
+def test_model_schema_batch_requires_plain_schema():
+    from pydantic import field_validator
+    class ValidatedSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name']
+        @field_validator('name')
+        @classmethod
+        def upper(cls, value):
+            return value.upper()
+    assert not ValidatedSchema.supports_batch()
+    with pytest.raises(TypeError):
+        ValidatedSchema.batch([])
+
+@pytest.mark.django_db
+def test_list_model_schema_responses_use_the_columnar_path(rf, monkeypatch):
+    api = Api()
+    class ListSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name', 'value']
+    @api.route("/rows", api=True, wove=False)
+    def rows(request) -> List[ListSchema]:
+        return SerializedModel.objects.order_by('id')
+    SerializedModel.objects.create(name="a", value=1, secret="s")
+    monkeypatch.setattr(ListSchema, "model_validate", None)
+    response = api.router.get_view("/api/rows")(rf.get("/api/rows"))
+    assert json.loads(response.content) == [{"id": 1, "name": "a", "value": 1}]
+
+def test_model_schema_maps_field_types_and_constraints():
+    import datetime
+    import uuid
+    from decimal import Decimal
+    from pydantic import ValidationError
+    from byrdie.models import Job
+    from tests.models import LineItem
+    class LineItemSchema(ModelSchema):
+        class Meta:
+            model = LineItem
+            fields = ['id', 'counter', 'price', 'quantity', 'unit', 'note', 'ships_in', 'label_image']
+    class JobSchema(ModelSchema):
+        class Meta:
+            model = Job
+            fields = ['id', 'status', 'result', 'finished_at']
+    assert LineItemSchema.__pydantic_complete__
+    item = LineItemSchema.model_validate({"id": 1, "counter_id": 3, "price": "9.50", "ships_in": 60})
+    assert item.model_dump() == {
+        "id": 1, "counter": 3, "price": Decimal("9.50"), "quantity": 1,
+        "unit": "", "note": "", "ships_in": datetime.timedelta(seconds=60), "label_image": None,
+    }
+    assert LineItemSchema.model_validate(LineItem(id=2, counter_id=4, price=Decimal("1"))).counter == 4
+    for invalid in ({"price": "12345.6"}, {"quantity": -1}):
+        with pytest.raises(ValidationError):
+            LineItemSchema.model_validate({"id": 1, "counter": 3, "price": "1", **invalid})
+    # Choices and max_length are enforced on request payloads only, so legacy rows still serialize
+    for invalid in ({"unit": "lb"}, {"note": "x" * 11}):
+        with pytest.raises(ValidationError):
+            LineItemSchema.model_validate({"id": 1, "counter": 3, "price": "1", **invalid}, context=INPUT_CONTEXT)
+    legacy = LineItemSchema.model_validate(LineItem(id=3, counter_id=4, price=Decimal("1"), unit="lb", note="x" * 11))
+    assert (legacy.unit, legacy.note) == ("lb", "x" * 11)
+    binary = LineItemSchema.model_validate(LineItem(id=4, counter_id=4, price=Decimal("1"), label_image=memoryview(b"\x00\xff")))
+    assert binary.label_image == b"\x00\xff"
+    assert json.loads(json.dumps(binary.model_dump(), default=str))["label_image"] == "AP8="
+    assert LineItemSchema.model_validate({"id": 1, "counter": 3, "price": "1", "label_image": "AP8="}).label_image == b"\x00\xff"
+    job_id = uuid.uuid4()
+    job = JobSchema.model_validate({"id": str(job_id), "status": "done", "result": {"a": [1]}})
+    assert (job.id, job.result, job.finished_at) == (job_id, {"a": [1]}, None)
+    with pytest.raises(ValidationError):
+        JobSchema.model_validate({"id": str(job_id), "status": "lost"}, context=INPUT_CONTEXT)
+
+@pytest.mark.django_db
+def test_bulk_create_checks_choices_and_decodes_binary(rf):
+    from tests.models import Counter, LineItem
+    api = Api()
+    class LineSchema(ModelSchema):
+        class Meta:
+            model = LineItem
+            fields = ['id', 'counter', 'price', 'unit', 'label_image']
+    api.add_schema(LineSchema, bulk=True)
+    counter = Counter.objects.create(label="c")
+    rows = [
+        {"counter": counter.pk, "price": "1.50", "unit": "kg", "label_image": "AP8="},
+        {"counter": counter.pk, "price": "2", "unit": "lb"},
+    ]
+    create = api.router.get_view("/line/bulk/create")
+    response = create(rf.post("/line/bulk/create", data=json.dumps(rows), content_type="application/json"))
+    data = json.loads(response.content)
+    assert list(data["errors"]) == ["1"]
+    assert bytes(LineItem.objects.get(pk=data["created"][0]).label_image) == b"\x00\xff"
+
+def test_bulk_database_errors_do_not_leak_details(rf, monkeypatch):
+    import inspect
+    from django.db import IntegrityError, OperationalError
+    from byrdie import api as api_module
+    def conflict(schema_cls, rows, batch_size):
+        raise IntegrityError("UNIQUE constraint failed: tests_serializedmodel.name")
+    monkeypatch.setattr(api_module, "bulk_create_rows", conflict)
+    api = Api()
+    class BulkSchema(ModelSchema):
+        class Meta:
+            model = SerializedModel
+            fields = ['id', 'name']
+    api.add_schema(BulkSchema, bulk=True)
+    create = api.router.get_view("/bulk/bulk/create")
+    assert inspect.unwrap(create) is conflict
+    response = create(rf.post("/bulk/bulk/create", data='[{"name": "a"}]', content_type="application/json"))
+    assert response.status_code == 409
+    assert b"tests_serializedmodel" not in response.content
+    def broken(schema_cls, rows, batch_size):
+        raise OperationalError("no such table")
+    monkeypatch.setattr(api_module, "bulk_create_rows", broken)
+    api = Api()
+    api.add_schema(BulkSchema, bulk=True)
+    with pytest.raises(OperationalError):
+        api.router.get_view("/bulk/bulk/create")(rf.post("/bulk/bulk/create", data='[{"name": "a"}]', content_type="application/json"))
@@ -0,0 +1,100 @@
+import json
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from byrdie.models import VersionConflict
+from byrdie.views import call_exposed_method
+from tests.models import Ticket
+
+
+def _vote(rf, ticket, version=None):
+    headers = {} if version is None else {"HTTP_X_BYRDIE_VERSION": str(version)}
+    request = rf.post("/", data="{}", content_type="application/json", **headers)
+    return call_exposed_method(request, "tests", "ticket", ticket.pk, "vote")
+
+@pytest.mark.django_db
+def test_save_is_a_single_conditional_update_that_bumps_the_version():
+    ticket = Ticket.objects.create(title="Bug")
+    ticket.votes = 1
+    with CaptureQueriesContext(connection) as queries:
+        ticket.save()
+    assert len(queries) == 1
+    assert queries[0]["sql"].startswith("UPDATE")
+    assert '"version" = 0' in queries[0]["sql"].split("WHERE")[1]
+    assert ticket.version == 1
+    ticket.title = "Renamed"
+    ticket.save(update_fields=["title"])
+    assert Ticket.objects.get(pk=ticket.pk).version == 2
+
+@pytest.mark.django_db
+def test_stale_save_raises_conflict_without_writing():
+    ticket = Ticket.objects.create(title="Bug")
+    stale = Ticket.objects.get(pk=ticket.pk)
+    ticket.votes = 5
+    ticket.save()
+    stale.votes = 1
+    with pytest.raises(VersionConflict), transaction.atomic():
+        stale.save()
+    fresh = Ticket.objects.get(pk=ticket.pk)
+    assert (fresh.votes, fresh.version) == (5, 1)
+
+@pytest.mark.django_db
+def test_saving_a_new_row_with_explicit_pk_inserts():
+    Ticket(pk=99, title="New").save()
+    assert Ticket.objects.get(pk=99).version == 0
+
+@pytest.mark.django_db
+def test_exposed_call_returns_new_version(rf):
+    ticket = Ticket.objects.create(title="Bug")
+    response = _vote(rf, ticket, version=0)
+    assert response.status_code == 200
+    assert response["X-Byrdie-Version"] == "1"
+    assert json.loads(response.content) == {"votes": 1}
+
+@pytest.mark.django_db
+def test_exposed_call_with_stale_version_is_409_with_fresh_state(rf):
+    ticket = Ticket.objects.create(title="Bug")
+    _vote(rf, ticket, version=0)
+    response = _vote(rf, ticket, version=0)
+    assert response.status_code == 409
+    assert json.loads(response.content) == {"error": "conflict", "state": {"votes": 1, "version": 1}}
+    assert Ticket.objects.get(pk=ticket.pk).votes == 1
+
+@pytest.mark.django_db
+def test_bulk_update_checks_and_bumps_versions(rf):
+    from byrdie.api import Api
+    from byrdie.schemas import ModelSchema
+    api = Api()
+    class TicketSchema(ModelSchema):
+        class Meta:
+            model = Ticket
+            fields = ['id', 'title', 'version']
+    api.add_schema(TicketSchema, bulk=True)
+    first, second = Ticket.objects.create(title="A"), Ticket.objects.create(title="B")
+    stale = Ticket.objects.get(pk=first.pk)
+    rows = [
+        {"id": first.pk, "title": "A2", "version": 0},
+        {"id": second.pk, "title": "B2", "version": 3},
+        {"id": second.pk, "title": "B3"},
+    ]
+    update = api.router.get_view("/ticket/bulk/update")
+    data = json.loads(update(rf.post("/", data=json.dumps(rows), content_type="application/json")).content)
+    assert data["updated"] == [first.pk]
+    assert list(data["errors"]) == ["1", "2"]
+    assert Ticket.objects.get(pk=first.pk).version == 1
+    assert Ticket.objects.get(pk=second.pk).title == "B"
+    # A stale instance loaded before the bulk write must not overwrite it
+    stale.title = "Stale"
+    with pytest.raises(VersionConflict), transaction.atomic():
+        stale.save()
+    assert Ticket.objects.get(pk=first.pk).title == "A2"
+
+def test_bulk_registration_requires_the_version_field():
+    from byrdie.api import Api
+    from byrdie.schemas import ModelSchema
+    class TicketSchema(ModelSchema):
+        class Meta:
+            model = Ticket
+            fields = ['id', 'title']
+    with pytest.raises(TypeError, match="must include 'version'"):
+        Api().add_schema(TicketSchema, bulk=True)
@@ -0,0 +1,49 @@
+from typing import List
+from byrdie.api import Api
+from byrdie.schemas import Schema
+from byrdie.warmup import warm_up
+
+
+def _templates(tmp_path):
+    return [{
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "DIRS": [str(tmp_path)],
+        "APP_DIRS": True,
+    }]
+
+def test_warm_up_preloads_routes_schemas_and_templates(settings, tmp_path):
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "widget.html").write_text("<b>{{ widget }}</b>")
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "dashboard.html").write_text("<p>{{ title }}</p>")
+    settings.TEMPLATES = _templates(tmp_path)
+    api = Api()
+    class Row(Schema):
+        name: "Label"
+    class Label(Schema):
+        text: str
+    Row.__pydantic_parent_namespace__ = {"Label": Label}
+    @api.route("/rows", api=True)
+    def rows(request) -> List[Row]:
+        return []
+    @api.route("/dashboard")
+    def dashboard(request):
+        return {"title": "Hi"}
+    assert not Row.__pydantic_complete__
+    report = warm_up(api.router)
+    assert Row.__pydantic_complete__
+    stages = {name: count for name, count, _ in report.stages}
+    assert stages["routes"] == 2
+    assert stages["urls"] == 1
+    # The widget component and the dashboard page; there is no base.html here
+    assert stages["templates"] == 2
+    assert report.errors == []
+    assert str(report).startswith("Warmed up in")
+
+def test_warm_up_reports_broken_templates(settings, tmp_path):
+    (tmp_path / "components").mkdir()
+    (tmp_path / "components" / "broken.html").write_text("{% if %}")
+    settings.TEMPLATES = _templates(tmp_path)
+    report = warm_up(Api().router)
+    assert len(report.errors) == 1
+    assert report.errors[0].startswith("components/broken.html")